@@ -5,15 +5,27 @@ import os
 
 
 # Import tool modullses
-from utils.utils.username_checker import check_username
+from utils.utils.username_checker import check_username, check_usernames_bulk, read_usernames
+from utils.utils.username_variants import check_username_variants
+from utils.utils.email_validation import check_emails_bulk, read_emails
+from utils.utils.platform_registry import get_registry
 from utils.utils.dns_enum import dns_enumeration
+from utils.utils.dns_cache import dns_cache
+from utils.utils.resolver_pool import configure_resolver_pool, get_resolver_pool
+from utils.utils.dns_history import get_dns_history
+from utils.utils.ct_index import get_ct_index
+from utils.utils.dns_bulk import completed_domains, dns_enumeration_bulk, read_domains
+from utils.utils.subdomain_bruteforce import bruteforce_subdomains
+from utils.utils.typosquat import TECHNIQUES, find_typosquats
 from utils.utils.dark_web_search import search_dark_web
-from utils.utils.ip_geolocation import get_ip_geolocation
+from utils.utils.ip_geolocation import get_ip_geolocation, get_ip_geolocation_batch
+from utils.utils.geo_database import configure_geo_database, get_geo_database
+from utils.utils.ip_cache import DEFAULT_IP_CACHE_PATH, ip_cache
 from utils.utils.metadata_extractor import extract_metadata
 from utils.utils.social_media_analyzer import analyze_social_media
 from utils.utils.whois_lookup import whois_lookup
 from utils.utils.logger import log_activity
-from utils.utils.export import export_to_csv, export_to_json
+from utils.utils.export import export_to_csv, export_to_json, stream_to_csv, stream_to_jsonl
 
 # Set page configuration
 st.set_page_config(
@@ -77,11 +89,18 @@ with tab1:
     query_type = st.radio("Select type:", ["Username", "Email"], horizontal=True)
     query = st.text_input(f"Enter {query_type.lower()} to search:")
     
+    platform_registry = get_registry()
     platforms = st.multiselect(
         "Select platforms to check (or leave empty for all):",
-        ["Twitter", "Instagram", "GitHub", "Reddit", "LinkedIn", "TikTok", "Pinterest", "Telegram", "Medium", "DeviantArt"],
+        platform_registry.names,
         default=["Twitter", "Instagram", "GitHub", "Reddit"]
     )
+    col1, col2 = st.columns(2)
+    with col1:
+        platform_categories = st.multiselect("Add platforms by category:", platform_registry.categories())
+    with col2:
+        platform_tags = st.multiselect("Add platforms by tag:", platform_registry.tags())
+    force_refresh = st.checkbox("Ignore cached results (force refresh)", value=False, key="username_force_refresh")
     
     if st.button("Search", key="username_search"):
         if query:
@@ -90,7 +109,10 @@ with tab1:
                 log_activity(tool="Username/Email Checker", query=query, st_session=st.session_state)
                 
                 # Perform the search
-                results = check_username(query, query_type, platforms)
+                results = check_username(
+                    query, query_type, platforms, force_refresh=force_refresh,
+                    tags=platform_tags, categories=platform_categories
+                )
                 
                 # Display results
                 if results:
@@ -125,6 +147,135 @@ with tab1:
         else:
             st.warning(f"Please enter a {query_type.lower()} to search.")
 
+    # Bulk username checks from an uploaded list
+    with st.expander("Bulk Username Check", expanded=False):
+        st.markdown("Upload a text or CSV file with one username per line (first column is used).")
+        usernames_file = st.file_uploader("Upload username list", type=["txt", "csv"], key="bulk_usernames")
+        bulk_format = st.radio("Output format:", ["CSV", "JSONL"], horizontal=True, key="bulk_username_format")
+
+        if st.button("Run Bulk Check", key="bulk_username_search"):
+            if usernames_file is not None:
+                log_activity(tool="Username/Email Checker (Bulk)", query=usernames_file.name, st_session=st.session_state)
+
+                extension = bulk_format.lower()
+                output_path = os.path.join(
+                    "temp_uploads",
+                    f"bulk_username_search_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+                )
+                found = []
+
+                def track_results(rows):
+                    # Keep only hits in memory; everything else goes straight to disk
+                    for count, row in enumerate(rows, 1):
+                        if row["exists"]:
+                            found.append(row)
+                        if count % 50 == 0:
+                            progress.text(f"Checked {count} username/platform pairs, {len(found)} accounts found...")
+                        yield row
+
+                with st.spinner("Running bulk username check..."):
+                    progress = st.empty()
+                    usernames = read_usernames(usernames_file)
+                    with open(output_path, "w", newline="", encoding="utf-8") as output:
+                        rows = track_results(check_usernames_bulk(
+                            usernames, platforms, tags=platform_tags, categories=platform_categories,
+                            force_refresh=force_refresh
+                        ))
+                        if extension == "csv":
+                            total = stream_to_csv(rows, output)
+                        else:
+                            total = stream_to_jsonl(rows, output)
+                    progress.empty()
+
+                st.success(f"Checked {total} username/platform pairs, {len(found)} accounts found.")
+                if found:
+                    st.dataframe(pd.DataFrame(found), use_container_width=True)
+
+                with open(output_path, "rb") as output:
+                    st.download_button(
+                        label=f"Download {bulk_format}",
+                        data=output,
+                        file_name=os.path.basename(output_path),
+                        mime="text/csv" if extension == "csv" else "application/x-ndjson"
+                    )
+            else:
+                st.warning("Please upload a file with usernames.")
+
+    # Permutations of a handle or real name, checked as one batch
+    with st.expander("Username Variants", expanded=False):
+        variant_seed = st.text_input("Enter a handle or full name:", key="variant_seed")
+        variant_col1, variant_col2, variant_col3 = st.columns(3)
+        with variant_col1:
+            variant_limit = st.number_input("Max variants:", min_value=1, max_value=5000, value=100, key="variant_limit")
+        with variant_col2:
+            variant_leet = st.checkbox("Leetspeak", value=True, key="variant_leet")
+        with variant_col3:
+            variant_numbers = st.checkbox("Numeric suffixes", value=True, key="variant_numbers")
+
+        if st.button("Check Variants", key="variant_search"):
+            if variant_seed:
+                log_activity(tool="Username/Email Checker (Variants)", query=variant_seed, st_session=st.session_state)
+
+                with st.spinner("Checking username variants..."):
+                    found = [
+                        row for row in check_username_variants(
+                            variant_seed, platforms, tags=platform_tags, categories=platform_categories,
+                            limit=int(variant_limit), leetspeak=variant_leet, numeric_suffixes=variant_numbers
+                        )
+                        if row["exists"]
+                    ]
+
+                if found:
+                    st.success(f"Found {len(found)} accounts across the variants.")
+                    st.dataframe(pd.DataFrame(found), use_container_width=True)
+                else:
+                    st.info("No accounts found for any variant.")
+            else:
+                st.warning("Please enter a handle or name.")
+
+    # Bulk email validation from an uploaded list
+    with st.expander("Bulk Email Validation", expanded=False):
+        st.markdown("Upload a text or CSV file with one email address per line (first column is used).")
+        emails_file = st.file_uploader("Upload email list", type=["txt", "csv"], key="bulk_emails")
+        email_format = st.radio("Output format:", ["CSV", "JSONL"], horizontal=True, key="bulk_email_format")
+
+        if st.button("Validate Emails", key="bulk_email_search"):
+            if emails_file is not None:
+                log_activity(tool="Username/Email Checker (Bulk Email)", query=emails_file.name, st_session=st.session_state)
+
+                extension = email_format.lower()
+                output_path = os.path.join(
+                    "temp_uploads",
+                    f"bulk_email_validation_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+                )
+                counts = {"deliverable": 0}
+
+                def count_deliverable(rows):
+                    for row in rows:
+                        if row["deliverable"]:
+                            counts["deliverable"] += 1
+                        yield row
+
+                with st.spinner("Validating email addresses..."):
+                    with open(output_path, "w", newline="", encoding="utf-8") as output:
+                        rows = count_deliverable(check_emails_bulk(read_emails(emails_file)))
+                        if extension == "csv":
+                            total = stream_to_csv(rows, output)
+                        else:
+                            total = stream_to_jsonl(rows, output)
+
+                st.success(f"Validated {total} addresses, {counts['deliverable']} deliverable.")
+
+                with open(output_path, "rb") as output:
+                    st.download_button(
+                        label=f"Download {email_format}",
+                        data=output,
+                        file_name=os.path.basename(output_path),
+                        mime="text/csv" if extension == "csv" else "application/x-ndjson"
+                    )
+            else:
+                st.warning("Please upload a file with email addresses.")
+
 # DNS Enumeration
 with tab2:
     st.header("DNS Enumeration")
@@ -152,6 +303,20 @@ with tab2:
                 # Display results
                 if results:
                     st.success(f"DNS enumeration completed for: {domain}")
+                    cache_stats = dns_cache.stats()
+                    st.caption(f"DNS cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['entries']} cached answers")
+                    
+                    # Keep the run and show what changed since the previous one
+                    changes = get_dns_history().save_snapshot(domain, results, resolve=dns_cache.resolve)
+                    if changes["previous"] is not None:
+                        with st.expander(f"Changes since last snapshot ({len(changes['added'])} added, {len(changes['removed'])} removed)", expanded=True):
+                            if changes["added"] or changes["removed"]:
+                                st.dataframe(pd.DataFrame(
+                                    [{"change": "added", **row} for row in changes["added"]] +
+                                    [{"change": "removed", **row} for row in changes["removed"]]
+                                ), use_container_width=True)
+                            else:
+                                st.info("No records changed.")
                     
                     # Display each record type in an expander
                     for record_type, records in results.items():
@@ -195,6 +360,186 @@ with tab2:
         else:
             st.warning("Please enter a domain name.")
 
+    # Large wordlist brute force with streamed results
+    with st.expander("Subdomain Brute Force", expanded=False):
+        wordlist_file = st.file_uploader("Upload wordlist (one label per line)", type=["txt"], key="subdomain_wordlist")
+        brute_col1, brute_col2 = st.columns(2)
+        with brute_col1:
+            brute_concurrency = st.number_input("Concurrent queries:", min_value=1, max_value=5000, value=500, key="subdomain_concurrency")
+        with brute_col2:
+            brute_nameservers = st.text_input("Upstream resolvers (comma-separated, empty for system default):", key="subdomain_nameservers")
+
+        if st.button("Brute Force", key="subdomain_bruteforce"):
+            if domain and wordlist_file is not None:
+                log_activity(tool="DNS Enumeration (Subdomain Brute Force)", query=domain, st_session=st.session_state)
+
+                # Saved to disk so the wordlist is streamed rather than loaded
+                wordlist_path = os.path.join("temp_uploads", wordlist_file.name)
+                with open(wordlist_path, "wb") as f:
+                    f.write(wordlist_file.getbuffer())
+
+                # Custom upstreams replace the shared pool, so every DNS tool uses them
+                nameservers = [ns.strip() for ns in brute_nameservers.split(",") if ns.strip()]
+                if nameservers and nameservers != get_resolver_pool().nameservers:
+                    configure_resolver_pool(nameservers)
+
+                found = []
+                with st.spinner(f"Brute-forcing subdomains of {domain}..."):
+                    table = st.empty()
+                    for row in bruteforce_subdomains(domain, wordlist_path, concurrency=int(brute_concurrency)):
+                        found.append({"subdomain": row["subdomain"], "ips": ", ".join(row["ips"]), "ttl": row["ttl"]})
+                        if len(found) % 25 == 1:
+                            table.dataframe(pd.DataFrame(found), use_container_width=True)
+                    table.empty()
+
+                if found:
+                    st.success(f"Found {len(found)} subdomains of {domain}.")
+                    st.dataframe(pd.DataFrame(found), use_container_width=True)
+                else:
+                    st.info("No subdomains found.")
+
+                st.caption("Upstream resolver health")
+                st.dataframe(pd.DataFrame(get_resolver_pool().stats()), use_container_width=True)
+            else:
+                st.warning("Please enter a domain name and upload a wordlist.")
+
+    # Offline CT log exports seed the subdomain brute force
+    with st.expander("Certificate Transparency Index", expanded=False):
+        st.markdown("Upload CT log exports (crt.sh JSON, certstream JSON Lines or CSV). "
+                    "Names under a domain are tried first by every enumeration.")
+        ct_files = st.file_uploader("Upload CT dumps", type=["json", "jsonl", "csv"],
+                                    accept_multiple_files=True, key="ct_dumps")
+
+        if st.button("Ingest", key="ct_ingest"):
+            if ct_files:
+                log_activity(tool="DNS Enumeration (CT Ingest)", query=", ".join(f.name for f in ct_files), st_session=st.session_state)
+
+                ct_index = get_ct_index()
+                added = 0
+                with st.spinner("Indexing certificate names..."):
+                    for ct_file in ct_files:
+                        # Saved to disk so the dump is streamed rather than loaded
+                        dump_path = os.path.join("temp_uploads", ct_file.name)
+                        with open(dump_path, "wb") as f:
+                            f.write(ct_file.getbuffer())
+                        try:
+                            added += ct_index.ingest(dump_path)
+                        except ValueError as e:
+                            st.error(f"{ct_file.name}: {e}")
+                        finally:
+                            os.remove(dump_path)
+
+                st.success(f"Indexed {added} new names ({ct_index.count()} in total).")
+                if domain:
+                    st.caption(f"{len(ct_index.names_under(domain))} known names under {domain}.")
+            else:
+                st.warning("Please upload at least one CT dump.")
+
+    # Registered look-alikes of the domain, for brand protection
+    with st.expander("Typosquat Detection", expanded=False):
+        typo_techniques = st.multiselect("Permutation techniques:", TECHNIQUES, default=TECHNIQUES, key="typo_techniques")
+
+        if st.button("Find Look-alikes", key="typo_search"):
+            if domain:
+                log_activity(tool="DNS Enumeration (Typosquat)", query=domain, st_session=st.session_state)
+
+                registered = []
+                with st.spinner(f"Resolving look-alikes of {domain}..."):
+                    table = st.empty()
+                    for row in find_typosquats(domain, typo_techniques or None):
+                        registered.append(row)
+                        if len(registered) % 10 == 1:
+                            table.dataframe(pd.DataFrame(registered), use_container_width=True)
+                    table.empty()
+
+                if registered:
+                    st.warning(f"Found {len(registered)} registered look-alikes of {domain}.")
+                    st.dataframe(pd.DataFrame(registered), use_container_width=True)
+                else:
+                    st.success("No registered look-alikes found.")
+            else:
+                st.warning("Please enter a domain name.")
+
+    # Many domains at once, streamed to a resumable JSONL file
+    with st.expander("Bulk Domain Enumeration", expanded=False):
+        st.markdown("Upload a text or CSV file with one domain per line (first column is used). "
+                    "The record types selected above are queried for every domain.")
+        domains_file = st.file_uploader("Upload domain list", type=["txt", "csv"], key="bulk_domains")
+        bulk_col1, bulk_col2 = st.columns(2)
+        with bulk_col1:
+            bulk_domain_concurrency = st.number_input("Domains at once:", min_value=1, max_value=64, value=8, key="bulk_domain_concurrency")
+        with bulk_col2:
+            bulk_nameserver_rate = st.number_input("Max queries/second per nameserver:", min_value=1, max_value=5000, value=200, key="bulk_nameserver_rate")
+        resume_bulk = st.checkbox("Resume the previous run for this file", value=True, key="bulk_dns_resume")
+
+        if st.button("Run Bulk Enumeration", key="bulk_dns_enum"):
+            if domains_file is not None:
+                log_activity(tool="DNS Enumeration (Bulk)", query=domains_file.name, st_session=st.session_state)
+
+                # Named after the upload so a re-run of the same file can resume
+                output_path = os.path.join(
+                    "temp_uploads", f"bulk_dns_{os.path.splitext(domains_file.name)[0]}.jsonl"
+                )
+                completed = completed_domains(output_path) if resume_bulk else set()
+                summary = []
+
+                history = get_dns_history()
+
+                def summarize(rows):
+                    for row in rows:
+                        changed = None
+                        if not row["error"]:
+                            changes = history.save_snapshot(row["domain"], row["results"], resolve=dns_cache.resolve)
+                            if changes["previous"] is not None:
+                                changed = len(changes["added"]) + len(changes["removed"])
+                        counts = {record_type: len(records) for record_type, records in row["results"].items()}
+                        summary.append({"domain": row["domain"], "error": row["error"], "changes": changed, **counts})
+                        progress.text(f"Enumerated {len(summary)} domains...")
+                        yield row
+
+                with st.spinner("Running bulk DNS enumeration..."):
+                    progress = st.empty()
+                    with open(output_path, "a" if completed else "w", encoding="utf-8") as output:
+                        stream_to_jsonl(summarize(dns_enumeration_bulk(
+                            read_domains(domains_file), record_types,
+                            domain_concurrency=int(bulk_domain_concurrency),
+                            nameserver_rate=float(bulk_nameserver_rate),
+                            completed=completed
+                        )), output)
+                    progress.empty()
+
+                if completed:
+                    st.info(f"Skipped {len(completed)} domains finished in the previous run.")
+                st.success(f"Enumerated {len(summary)} domains.")
+                if summary:
+                    st.dataframe(pd.DataFrame(summary), use_container_width=True)
+
+                with open(output_path, "rb") as output:
+                    st.download_button(
+                        label="Download JSONL",
+                        data=output,
+                        file_name=os.path.basename(output_path),
+                        mime="application/x-ndjson"
+                    )
+            else:
+                st.warning("Please upload a file with domains.")
+
+    # Look up past snapshots
+    with st.expander("DNS History", expanded=False):
+        history_ip = st.text_input("Find every domain that pointed at an IP:", key="dns_history_ip")
+        if st.button("Search History", key="dns_history_search"):
+            if history_ip:
+                matches = get_dns_history().domains_for_ip(history_ip)
+                if matches:
+                    for match in matches:
+                        match["first_seen"] = datetime.datetime.fromtimestamp(match["first_seen"]).strftime("%Y-%m-%d %H:%M")
+                        match["last_seen"] = datetime.datetime.fromtimestamp(match["last_seen"]).strftime("%Y-%m-%d %H:%M")
+                    st.dataframe(pd.DataFrame(matches), use_container_width=True)
+                else:
+                    st.info(f"No stored snapshot points at {history_ip}.")
+            else:
+                st.warning("Please enter an IP address.")
+
 # Dark Web Search
 with tab3:
     st.header("Dark Web Search")
@@ -270,6 +615,7 @@ with tab4:
     st.markdown("Track and analyze IP addresses to get geolocation information.")
     
     ip_address = st.text_input("Enter IP address:")
+    offline_geo = st.checkbox("Offline mode (local database only, IP addresses only, nothing leaves this host)", key="ip_offline")
     
     if st.button("Locate", key="ip_locate"):
         if ip_address:
@@ -278,7 +624,7 @@ with tab4:
                 log_activity(tool="IP Geolocation", query=ip_address, st_session=st.session_state)
                 
                 # Get IP geolocation data
-                result = get_ip_geolocation(ip_address)
+                result = get_ip_geolocation(ip_address, offline=offline_geo)
                 
                 # Display results
                 if result and "error" not in result:
@@ -336,6 +682,89 @@ with tab4:
         else:
             st.warning("Please enter an IP address.")
 
+    # Many addresses at once through the provider's batch endpoint
+    with st.expander("Bulk IP Geolocation", expanded=False):
+        st.markdown("Upload a text or CSV file with one IP address or hostname per line (first column is used).")
+        ips_file = st.file_uploader("Upload address list", type=["txt", "csv"], key="bulk_ips")
+        bulk_ip_hostnames = st.checkbox("Include reverse DNS", value=False, key="bulk_ip_hostnames")
+        bulk_ip_aggregate = st.checkbox("Geolocate one address per /24 (/48 for IPv6)", value=False, key="bulk_ip_aggregate")
+
+        if st.button("Locate All", key="bulk_ip_locate"):
+            if ips_file is not None:
+                log_activity(tool="IP Geolocation (Bulk)", query=ips_file.name, st_session=st.session_state)
+
+                targets = [
+                    line.decode("utf-8", errors="replace").split(",", 1)[0].strip().strip('"')
+                    for line in ips_file
+                ]
+                targets = [target for target in targets if target and not target.startswith("#")]
+
+                with st.spinner(f"Geolocating {len(targets)} addresses..."):
+                    results = get_ip_geolocation_batch(targets, include_hostnames=bulk_ip_hostnames,
+                                                       offline=offline_geo, aggregate=bulk_ip_aggregate)
+
+                located = [result for result in results if "error" not in result]
+                st.success(f"Geolocated {len(located)} of {len(results)} addresses.")
+                df_results = pd.DataFrame(results)
+                st.dataframe(df_results, use_container_width=True)
+                if located:
+                    # Offline databases without coordinates (e.g. country-only) have no map
+                    df_located = pd.DataFrame(located)
+                    if {"lat", "lon"} <= set(df_located.columns):
+                        coordinates = df_located[["lat", "lon"]].dropna()
+                        if not coordinates.empty:
+                            st.map(coordinates)
+
+                st.download_button(
+                    label="Download CSV",
+                    data=export_to_csv(df_results),
+                    file_name=f"ip_geolocation_bulk_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                    mime="text/csv"
+                )
+            else:
+                st.warning("Please upload a file with IP addresses.")
+
+    # Local range database for offline mode
+    with st.expander("Offline Geolocation Database", expanded=False):
+        st.markdown("Load an MMDB file (requires the maxminddb package) or a CSV range file "
+                    "(start/end or network columns, or DB-IP lite layout). "
+                    "The file is compiled once and reloaded automatically when it changes.")
+        geodb_path = st.text_input("Database file path:", key="geodb_path")
+
+        if st.button("Load Database", key="geodb_load"):
+            if geodb_path:
+                try:
+                    with st.spinner("Loading geolocation database..."):
+                        configure_geo_database(geodb_path)
+                    st.success("Offline geolocation database loaded.")
+                except ImportError:
+                    st.error("The maxminddb library is required for MMDB files.")
+                except (OSError, ValueError) as e:
+                    st.error(f"Failed to load database: {str(e)}")
+            else:
+                st.warning("Please enter the path of a database file.")
+
+        geo_database = get_geo_database()
+        if geo_database is not None:
+            geodb_stats = geo_database.stats()
+            st.caption(f"{geodb_stats['path']}: {geodb_stats['ipv4_ranges']} IPv4 and "
+                       f"{geodb_stats['ipv6_ranges']} IPv6 ranges, {geodb_stats['records']} distinct records")
+
+    # Geolocation and reverse DNS answers shared by every session
+    with st.expander("Lookup Cache", expanded=False):
+        persist_ip_cache = st.checkbox("Keep cached lookups on disk", value=ip_cache.path is not None, key="ip_cache_persist")
+        if persist_ip_cache != (ip_cache.path is not None):
+            ip_cache.configure_persistence(DEFAULT_IP_CACHE_PATH if persist_ip_cache else None)
+
+        if st.button("Clear Cache", key="ip_cache_clear"):
+            ip_cache.clear()
+            st.success("Lookup cache cleared.")
+
+        ip_cache_stats = ip_cache.stats()
+        st.caption(f"{ip_cache_stats['hits']} hits ({ip_cache_stats['memory_hits']} from memory, "
+                   f"{ip_cache_stats['disk_hits']} from disk), {ip_cache_stats['misses']} misses, "
+                   f"{ip_cache_stats['entries']} lookups in memory")
+
 # Metadata Extractor
 with tab5:
     st.header("Metadata Extractor")
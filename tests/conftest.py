@@ -0,0 +1,119 @@
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+import dns.message
+import dns.name
+import dns.rdata
+import dns.rdataclass
+import dns.rdatatype
+import dns.resolver
+import pytest
+
+# Runtime stores are created at import time, so point them at a scratch directory first
+os.environ.setdefault("OSINT_CACHE_DIR", tempfile.mkdtemp(prefix="osint-tests-"))
+
+# Import the package the same way app.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class FakeClock:
+    """Stand-in for time.monotonic that only moves when a test advances it"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze time.monotonic; advance it with clock.now += seconds."""
+    fake = FakeClock()
+    monkeypatch.setattr(time, "monotonic", fake)
+    return fake
+
+@pytest.fixture
+def no_dns(monkeypatch):
+    """
+    Answer every lookup through the shared DNS cache as "not found" without
+    touching the network. Returns the list of names that were asked for.
+    """
+    from utils.utils.dns_cache import dns_cache
+
+    asked = []
+
+    def not_found(error):
+        def lookup(name, *args, **kwargs):
+            asked.append(str(name))
+            raise error
+        return lookup
+
+    monkeypatch.setattr(dns_cache, "resolve", not_found(dns.resolver.NXDOMAIN()))
+    monkeypatch.setattr(dns_cache, "gethostbyname", not_found(socket.gaierror(socket.EAI_NONAME, "Name not known")))
+    monkeypatch.setattr(dns_cache, "gethostbyaddr", not_found(socket.herror(1, "Unknown host")))
+    return asked
+
+class FakeZone:
+    """
+    Canned DNS data served as real dnspython answers.
+
+    Names with records but none of the asked type get NoAnswer; unknown
+    names get NXDOMAIN. Every query is logged in asked as (name, type).
+    """
+
+    def __init__(self, records=None, delay: float = 0.0):
+        self.records = {}
+        self.delay = delay
+        self.asked = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        for (name, rdtype), values in (records or {}).items():
+            self.add(name, rdtype, *values)
+
+    @staticmethod
+    def _key(name) -> str:
+        return str(name).lower().rstrip(".")
+
+    def add(self, name, rdtype: str, *values: str) -> None:
+        self.records.setdefault((self._key(name), rdtype), []).extend(values)
+
+    def answer(self, name, rdtype: str, ttl: int = 300) -> dns.resolver.Answer:
+        key = self._key(name)
+        qname = dns.name.from_text(key)
+        if (key, rdtype) not in self.records:
+            if any(known == key for known, _ in self.records):
+                raise dns.resolver.NoAnswer()
+            raise dns.resolver.NXDOMAIN(qnames=[qname])
+
+        response = dns.message.make_response(dns.message.make_query(qname, rdtype))
+        rrset = response.find_rrset(response.answer, qname, dns.rdataclass.IN,
+                                    dns.rdatatype.from_text(rdtype), create=True)
+        for value in self.records[key, rdtype]:
+            rrset.add(dns.rdata.from_text(dns.rdataclass.IN, rdtype, value), ttl)
+        return dns.resolver.Answer(qname, dns.rdatatype.from_text(rdtype), dns.rdataclass.IN, response)
+
+    def resolve(self, name, rdtype="A", *args, **kwargs) -> dns.resolver.Answer:
+        with self._lock:
+            self.asked.append((self._key(name), rdtype))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            return self.answer(name, rdtype)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+@pytest.fixture
+def zone(monkeypatch):
+    """Serve a FakeZone through the shared DNS cache; fill it with zone.add(name, type, *values)."""
+    from utils.utils.dns_cache import dns_cache
+
+    fake = FakeZone()
+    monkeypatch.setattr(dns_cache, "resolve", fake.resolve)
+    return fake
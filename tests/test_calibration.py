@@ -0,0 +1,40 @@
+from utils.utils.calibration import buckets_compatible, classify, fingerprint, length_bucket, prefix_matches
+
+NOT_FOUND = fingerprint(200, "https://example.com/users/zq8xk2v", "zq8xk2v", 5000, b"<html>app shell</html>")
+
+def test_fingerprint_ignores_the_username_and_digits():
+    other = fingerprint(200, "https://Example.com/users/qq7rr1m", "qq7rr1m", 5100,
+                        b"<html>app   shell</html> 12345")
+    assert other["final_url"] == NOT_FOUND["final_url"] == "example.com/users/{username}"
+    assert other["prefix_hash"] == NOT_FOUND["prefix_hash"]
+
+def test_different_status_decides():
+    assert classify(NOT_FOUND, dict(NOT_FOUND, status=301)) is False
+    assert classify(dict(NOT_FOUND, status=404), dict(NOT_FOUND, status=200)) is True
+
+def test_same_error_status_means_missing():
+    missing = dict(NOT_FOUND, status=404)
+    assert classify(missing, dict(missing)) is False
+
+def test_different_final_url_means_the_account_exists():
+    probe = dict(NOT_FOUND, final_url="example.com/404")
+    assert classify(dict(NOT_FOUND, final_url="example.com/signup"), probe) is True
+
+def test_matching_prefix_is_left_to_the_detector():
+    # App-shell sites serve identical first bytes for real and missing profiles
+    probe = fingerprint(200, "https://example.com/users/alice", "alice", 5000, b"<html>app shell</html>")
+    assert prefix_matches(NOT_FOUND, probe)
+    assert classify(NOT_FOUND, probe) is None
+
+def test_prefix_matches_needs_a_compatible_length():
+    probe = fingerprint(200, "https://example.com/users/alice", "alice", 500000, b"<html>app shell</html>")
+    assert not prefix_matches(NOT_FOUND, probe)
+    assert not prefix_matches(NOT_FOUND, dict(probe, prefix_hash=None, length_bucket=NOT_FOUND["length_bucket"]))
+
+def test_length_buckets():
+    assert length_bucket(None) is None
+    assert length_bucket(0) == 0
+    assert length_bucket(1023) == 10
+    assert buckets_compatible(10, 11)
+    assert not buckets_compatible(10, 12)
+    assert buckets_compatible(None, 3)
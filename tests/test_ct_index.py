@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from utils.utils import ct_index
+from utils.utils.ct_index import CTIndex, normalize_hostname, read_ct_hostnames
+
+@pytest.fixture
+def index(tmp_path):
+    index = CTIndex(str(tmp_path / "ct.sqlite"))
+    yield index
+    index.close()
+
+def test_names_under_is_an_exact_range(index):
+    index.add([
+        "example.com", "www.example.com", "a.b.example.com", "mail.example.com",
+        "notexample.com", "www.example.community", "example.co", "www.other.com",
+    ])
+    assert sorted(index.names_under("example.com")) == ["a.b.example.com", "mail.example.com", "www.example.com"]
+    assert index.names_under("EXAMPLE.com.") == index.names_under("example.com")
+    assert index.names_under("b.example.com") == ["a.b.example.com"]
+    assert index.names_under("missing.com") == []
+
+def test_subdomain_labels_strip_the_domain(index):
+    index.add(["www.example.com", "a.b.example.com"])
+    assert sorted(index.subdomain_labels("example.com")) == ["a.b", "www"]
+
+def test_repeats_are_indexed_once(index):
+    assert index.add(["www.example.com", "www.example.com"]) == 1
+    assert index.add(["www.example.com"]) == 0
+    assert index.count() == 1
+
+def test_normalize_hostname():
+    assert normalize_hostname("*.Example.COM.") == "example.com"
+    assert normalize_hostname("not a host") is None
+    assert normalize_hostname("-bad.example.com") is None
+
+def test_ingest_json_lines_and_csv(index, tmp_path):
+    jsonl = tmp_path / "dump.jsonl"
+    jsonl.write_text("\n".join(json.dumps(record) for record in [
+        {"name_value": "*.example.com\nwww.example.com"},
+        {"cert": {"dns_names": ["api.example.com", "bad host"]}},
+    ]))
+    csv_dump = tmp_path / "dump.csv"
+    csv_dump.write_text("id,common_name\n1,shop.example.com\n")
+    assert sorted(read_ct_hostnames(str(jsonl))) == ["api.example.com", "example.com", "www.example.com"]
+
+    index.ingest(str(jsonl))
+    index.ingest(str(csv_dump))
+    assert sorted(index.subdomain_labels("example.com")) == ["api", "shop", "www"]
+
+def test_truncated_json_dump_raises(tmp_path):
+    dump = tmp_path / "dump.json"
+    dump.write_text('[{"name_value": "www.example.com"}, {"name_value": "api.exa')
+    with pytest.raises(ValueError):
+        list(read_ct_hostnames(str(dump)))
+
+def test_oversized_json_record_raises(tmp_path, monkeypatch):
+    monkeypatch.setattr(ct_index, "MAX_JSON_RECORD_SIZE", 64)
+    monkeypatch.setattr(ct_index, "JSON_CHUNK_SIZE", 16)
+    dump = tmp_path / "dump.json"
+    dump.write_text('{"name_value": "' + "a" * 200)
+    with pytest.raises(ValueError, match="MiB"):
+        list(read_ct_hostnames(str(dump)))
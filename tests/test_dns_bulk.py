@@ -0,0 +1,34 @@
+import json
+
+from utils.utils.dns_bulk import completed_domains, read_domains
+
+def _write(path, rows):
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write((row if isinstance(row, str) else json.dumps(row)) + "\n")
+
+def test_missing_file_has_no_completed_domains(tmp_path):
+    assert completed_domains(str(tmp_path / "missing.jsonl")) == set()
+
+def test_completed_domains_skips_failures_and_partial_lines(tmp_path):
+    path = tmp_path / "run.jsonl"
+    _write(path, [
+        {"domain": "ok.com", "results": {"A": [{"value": "1.2.3.4", "ttl": 60}], "MX": []}, "error": None},
+        {"domain": "empty.com", "results": {"A": []}, "error": None},
+        {"domain": "broken.com", "results": {}, "error": "The DNS operation timed out"},
+        {"domain": "servfail.com", "results": {"A": [{"error": "Query timed out"}]}, "error": None},
+        '{"domain": "cut.com", "results": {"A": [',
+    ])
+    assert completed_domains(str(path)) == {"ok.com", "empty.com"}
+
+def test_a_later_success_completes_a_failed_domain(tmp_path):
+    path = tmp_path / "run.jsonl"
+    _write(path, [
+        {"domain": "retry.com", "results": {}, "error": "Query timed out"},
+        {"domain": "retry.com", "results": {"A": []}, "error": None},
+    ])
+    assert completed_domains(str(path)) == {"retry.com"}
+
+def test_read_domains_normalizes_and_deduplicates():
+    lines = [b"Example.com.\n", "# comment\n", "\n", '"example.com",extra\n', "other.org,1\n"]
+    assert list(read_domains(lines)) == ["example.com", "other.org"]
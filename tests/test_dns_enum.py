@@ -0,0 +1,106 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+from utils.utils import dns_enum
+
+@pytest.fixture
+def enum(monkeypatch, zone):
+    """
+    Run dns_enumeration against the fake zone, with canned brute-force
+    results and no zone transfer attempts.
+    """
+    found = []
+
+    def collect_subdomains(domain, wordlist=None, **options):
+        future = Future()
+        future.set_result(list(found))
+        return future
+
+    monkeypatch.setattr(dns_enum, "collect_subdomains", collect_subdomains)
+    monkeypatch.setattr(dns_enum, "transfer_zone", lambda domain, nameservers: None)
+
+    def run(domain="example.com", **kwargs):
+        return dns_enum.dns_enumeration(domain, ct_seeds=False, **kwargs)
+
+    run.subdomains = found
+    return run
+
+def _example(zone):
+    zone.add("example.com", "A", "93.184.216.34")
+    zone.add("example.com", "MX", "10 mail.example.com.", "20 mail.example.com.")
+    zone.add("example.com", "NS", "mail.example.com.", "ns2.example.com.")
+    zone.add("example.com", "TXT", '"v=spf1 -all"')
+    zone.add("mail.example.com", "A", "93.184.216.35")
+
+def test_record_types_are_collected(enum, zone):
+    _example(zone)
+    results = enum()
+
+    assert results["A"] == [{"value": "93.184.216.34", "ttl": 300, "reverse_dns": "Not available"}]
+    assert [record["ip"] for record in results["MX"]] == ["93.184.216.35"] * 2
+    assert {record["nameserver"]: record["ip"] for record in results["NS"]} == {
+        "mail.example.com": "93.184.216.35", "ns2.example.com": "Not available"
+    }
+    assert results["TXT"][0]["value"] == "v=spf1 -all"
+    # Missing record types are empty, not errors
+    assert results["AAAA"] == [] and results["CNAME"] == [] and results["SOA"] == []
+
+def test_each_distinct_query_is_sent_once(enum, zone):
+    _example(zone)
+    enum()
+
+    # mail.example.com is both an MX and an NS host, and appears twice in MX
+    assert zone.asked.count(("mail.example.com", "A")) == 1
+    assert len(zone.asked) == len(set(zone.asked))
+
+def test_record_types_are_queried_concurrently(enum, zone):
+    _example(zone)
+    zone.delay = 0.05
+    enum(max_workers=8)
+    assert zone.max_in_flight > 1
+
+def test_shared_executor_bounds_the_queries(enum, zone):
+    _example(zone)
+    zone.delay = 0.02
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        enum(executor=executor)
+    assert zone.max_in_flight <= 2
+
+def test_timeouts_are_reported_as_errors(enum, zone, monkeypatch):
+    import dns.exception
+
+    def resolve(name, rdtype="A", *args, **kwargs):
+        if rdtype == "TXT":
+            raise dns.exception.Timeout()
+        return zone.answer(name, rdtype)
+
+    _example(zone)
+    monkeypatch.setattr(dns_enum.dns_cache, "resolve", resolve)
+    assert enum()["TXT"] == [{"error": "Query timed out"}]
+
+def test_reverse_lookups_run_once_per_public_ip(enum, zone):
+    _example(zone)
+    zone.add("34.216.184.93.in-addr.arpa", "PTR", "web.example.net.")
+    zone.add("35.216.184.93.in-addr.arpa", "PTR", "mx.example.net.")
+    enum.subdomains.extend([
+        {"subdomain": "www.example.com", "ips": ["93.184.216.34"], "ttl": 60},
+        {"subdomain": "intranet.example.com", "ips": ["10.0.0.5"], "ttl": 60},
+    ])
+    results = enum()
+
+    assert results["A"][0]["reverse_dns"] == "web.example.net"
+    assert {record["reverse_dns"] for record in results["MX"]} == {"mx.example.net"}
+    assert [record["reverse_dns"] for record in results["Subdomains"]] == ["web.example.net", "Not available"]
+    assert results["Additional"] == [{"ip": "93.184.216.34", "hostname": "web.example.net"}]
+
+    ptr_queries = [name for name, rdtype in zone.asked if rdtype == "PTR"]
+    assert sorted(ptr_queries) == ["34.216.184.93.in-addr.arpa", "35.216.184.93.in-addr.arpa"]
+
+def test_private_addresses_are_not_sent_to_resolvers(enum, zone):
+    zone.add("internal.example", "A", "192.168.1.10")
+    results = enum("internal.example", record_types=["A"])
+
+    assert results["A"][0]["reverse_dns"] == "Not available"
+    assert results["Additional"] == [{"ip": "192.168.1.10", "info": "Private IP address range"}]
+    assert all(rdtype != "PTR" for _, rdtype in zone.asked)
@@ -0,0 +1,82 @@
+import pytest
+
+from utils.utils.dns_history import DNSHistory, answered_keys, snapshot_records
+
+def _results(a=(), mx=(), subdomains=(), **sections):
+    results = {
+        "A": [{"value": ip, "ttl": 300, "reverse_dns": "Not available"} for ip in a],
+        "MX": [{"preference": 10, "exchange": host, "ip": "Not available", "ttl": 300} for host in mx],
+        "Subdomains": [{"subdomain": name, "ip": ip, "ttl": 60} for name, ip in subdomains],
+    }
+    results.update(sections)
+    return results
+
+@pytest.fixture
+def history(tmp_path):
+    history = DNSHistory(str(tmp_path / "history.sqlite"))
+    yield history
+    history.close()
+
+def _values(rows):
+    return [(row["type"], row["name"], row["value"]) for row in rows]
+
+def test_snapshot_records_ignore_ttls_and_errors():
+    results = _results(a=["192.0.2.1"], mx=["mx.example.com"], subdomains=[("www.example.com", "192.0.2.2")],
+                       TXT=[{"error": "Query timed out"}], Additional=[{"ip": "192.0.2.1", "hostname": "x"}])
+    assert snapshot_records("Example.com.", results) == {
+        ("A", "example.com", "192.0.2.1"),
+        ("MX", "example.com", "10 mx.example.com"),
+        ("A", "www.example.com", "192.0.2.2"),
+    }
+    # The timed-out TXT query settles nothing
+    assert ("TXT", "example.com") not in answered_keys("example.com", results)
+    assert ("A", "www.example.com") in answered_keys("example.com", results)
+
+def test_snapshots_are_diffed_against_the_previous_one(history):
+    first = history.save_snapshot("example.com", _results(a=["192.0.2.1"], mx=["mx.example.com"]), taken_at=1)
+    assert first["previous"] is None and len(first["added"]) == 2
+
+    second = history.save_snapshot("example.com", _results(a=["192.0.2.9"], mx=["mx.example.com"]), taken_at=2)
+    assert second["previous"] == first["snapshot"]
+    assert _values(second["added"]) == [("A", "example.com", "192.0.2.9")]
+    assert _values(second["removed"]) == [("A", "example.com", "192.0.2.1")]
+    assert history.diff("example.com") == second
+    assert history.diff("example.com", first["snapshot"])["added"] == first["added"]
+
+def test_unchanged_records_are_not_copied(history):
+    results = _results(a=["192.0.2.1"], mx=["mx.example.com"])
+    for taken_at in range(5):
+        diff = history.save_snapshot("example.com", results, taken_at=taken_at)
+    assert diff["added"] == [] and diff["removed"] == []
+    assert history._conn.execute("SELECT COUNT(*) FROM records").fetchone()[0] == 2
+    assert len(history.snapshots("example.com")) == 5
+
+def test_old_snapshots_keep_their_records(history):
+    first = history.save_snapshot("example.com", _results(a=["192.0.2.1"]), taken_at=1)
+    history.save_snapshot("example.com", _results(a=["192.0.2.2"]), taken_at=2)
+    assert _values(history.records("example.com", first["snapshot"])) == [("A", "example.com", "192.0.2.1")]
+    assert _values(history.records("example.com")) == [("A", "example.com", "192.0.2.2")]
+
+def test_records_without_a_clean_answer_are_carried_forward(history):
+    history.save_snapshot("example.com", _results(a=["192.0.2.1"], subdomains=[("www.example.com", "192.0.2.2")]))
+    diff = history.save_snapshot("example.com", _results(A=[{"error": "Query timed out"}]))
+    assert diff["removed"] == []
+    assert len(history.records("example.com")) == 2
+
+def test_missing_subdomains_are_rechecked(history, zone):
+    history.save_snapshot("example.com", _results(subdomains=[("www.example.com", "192.0.2.2"),
+                                                               ("old.example.com", "192.0.2.3")]))
+    zone.add("www.example.com", "A", "192.0.2.2")
+
+    diff = history.save_snapshot("example.com", _results(), resolve=zone.resolve)
+    assert _values(diff["removed"]) == [("A", "old.example.com", "192.0.2.3")]
+    assert sorted(zone.asked) == [("old.example.com", "A"), ("www.example.com", "A")]
+
+def test_domains_for_ip_uses_every_snapshot(history):
+    history.save_snapshot("a.example", _results(a=["192.0.2.1"]), taken_at=10)
+    history.save_snapshot("a.example", _results(a=["192.0.2.5"]), taken_at=20)
+    history.save_snapshot("b.example", _results(subdomains=[("www.b.example", "192.0.2.1")]), taken_at=30)
+
+    rows = history.domains_for_ip("192.0.2.1")
+    assert [(row["domain"], row["name"]) for row in rows] == [("b.example", "www.b.example"), ("a.example", "a.example")]
+    assert (rows[1]["first_seen"], rows[1]["last_seen"]) == (10, 10)
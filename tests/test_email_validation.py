@@ -0,0 +1,65 @@
+import dns.resolver
+import pytest
+
+from utils.utils import email_validation
+from utils.utils.dns_cache import dns_cache
+
+# Stub answers by (domain, record type); missing pairs are NXDOMAIN
+ZONE = {
+    ("mail.example", "A"): ["192.0.2.1"],
+    ("mail.example", "MX"): ["10 mx.mail.example."],
+    ("web.example", "A"): ["192.0.2.2"],
+}
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """Serve ZONE through the shared DNS cache and record every query."""
+    asked = []
+
+    def resolve(name, rdtype="A", *args, **kwargs):
+        asked.append((name, rdtype))
+        if (name, rdtype) in ZONE:
+            return ZONE[name, rdtype]
+        if any(domain == name for domain, _ in ZONE):
+            raise dns.resolver.NoAnswer()
+        raise dns.resolver.NXDOMAIN()
+
+    monkeypatch.setattr(dns_cache, "resolve", resolve)
+    return asked
+
+def test_email_domain_checks_syntax():
+    assert email_validation.email_domain("  Alice@Mail.Example ") == "mail.example"
+    assert email_validation.email_domain("alice@mail.example.") == "mail.example"
+    assert email_validation.email_domain("alice@localhost") is None
+    assert email_validation.email_domain("not an address") is None
+
+def test_bulk_results_come_out_in_input_order(lookups):
+    emails = ["a@mail.example", "bad", "b@web.example", "c@gone.example", "d@MAIL.example"]
+    results = list(email_validation.check_emails_bulk(emails, chunk_size=2))
+
+    assert [row["email"] for row in results] == emails
+    assert [row["deliverable"] for row in results] == [True, False, False, False, True]
+    assert results[1]["result"] == "Invalid email format"
+    assert results[2]["result"] == "Domain exists but has no mail exchanger"
+    assert results[3]["result"] == "Domain does not exist"
+    assert all(list(row) == email_validation.RESULT_FIELDS for row in results)
+
+def test_each_domain_is_looked_up_once_per_chunk(lookups):
+    emails = [f"user{i}@mail.example" for i in range(50)] + ["x@gone.example"] * 5
+    results = list(email_validation.check_emails_bulk(emails, chunk_size=100, max_workers=4))
+
+    assert len(results) == 55
+    assert sorted(lookups) == [("gone.example", "A"), ("mail.example", "A"), ("mail.example", "MX")]
+
+def test_lookup_errors_are_reported_per_address(monkeypatch):
+    def fail(name, rdtype="A", *args, **kwargs):
+        raise dns.resolver.LifetimeTimeout(timeout=1.0, errors=[])
+
+    monkeypatch.setattr(dns_cache, "resolve", fail)
+    row = next(email_validation.check_emails_bulk(["a@slow.example"]))
+    assert row["valid_format"] and row["result"] == "Verification error"
+    assert row["deliverable"] is None and row["error"]
+
+def test_read_emails_skips_comments_and_extra_columns():
+    lines = [b"a@mail.example,Alice\n", "# header\n", "\n", ' "b@web.example" \n']
+    assert list(email_validation.read_emails(lines)) == ["a@mail.example", "b@web.example"]
@@ -0,0 +1,71 @@
+import os
+import time
+
+import pytest
+
+from utils.utils.geo_database import GeoDatabase
+
+def _database(tmp_path, text: str, **kwargs) -> GeoDatabase:
+    source = tmp_path / "ranges.csv"
+    source.write_text(text)
+    return GeoDatabase(str(source), cache_dir=str(tmp_path / "compiled"), **kwargs)
+
+def test_lookup_with_header_aliases(tmp_path):
+    database = _database(tmp_path, (
+        "ip_from,ip_to,country_code,city,latitude,longitude\n"
+        "1.0.0.0,1.0.0.255,AU,Brisbane,-27.5,153.0\n"
+        "8.8.8.0,8.8.8.255,US,Mountain View,37.4,-122.1\n"
+        "2001:4860::,2001:4860:ffff:ffff:ffff:ffff:ffff:ffff,US,,,\n"
+    ))
+    assert database.lookup("1.0.0.7") == {
+        "ip": "1.0.0.7", "country_code": "AU", "city": "Brisbane", "lat": -27.5, "lon": 153.0
+    }
+    assert database.lookup("2001:4860::8888")["country_code"] == "US"
+    assert database.lookup("1.0.1.0") is None
+    assert database.lookup("not an ip") is None
+    assert database.stats()["ipv4_ranges"] == 2
+
+def test_headerless_db_ip_layout(tmp_path):
+    database = _database(tmp_path, "1.0.0.0,1.0.0.255,AU\n16777472,16777727,CN\n")
+    assert database.lookup("1.0.0.1")["country_code"] == "AU"
+    assert database.lookup("1.0.1.1")["country_code"] == "CN"
+
+def test_nested_ranges_let_the_most_specific_win(tmp_path):
+    database = _database(tmp_path, (
+        "network,country_code\n"
+        "1.0.0.0/8,AU\n"
+        "1.2.3.0/24,CN\n"
+        "1.2.3.128/25,JP\n"
+        "2001:db8::/32,DE\n"
+        "2001:db8:1::/48,FR\n"
+    ))
+    ips = ["1.1.1.1", "1.2.3.4", "1.2.3.200", "1.2.4.1", "2001:db8:1::5", "2001:db8:2::5", "9.9.9.9"]
+    assert [record and record["country_code"] for record in database.lookup_many(ips)] == [
+        "AU", "CN", "JP", "AU", "FR", "DE", None
+    ]
+
+def test_lookup_many_matches_lookup(tmp_path):
+    database = _database(tmp_path, "network,country_code\n10.0.0.0/8,AA\n10.1.0.0/16,BB\n2001:db8::/32,CC\n")
+    ips = ["10.0.0.1", "10.1.2.3", "11.0.0.1", "2001:db8::1", "bogus", ""]
+    assert database.lookup_many(ips) == [database.lookup(ip) for ip in ips]
+
+def test_changed_source_is_reloaded_in_the_background(tmp_path):
+    database = _database(tmp_path, "network,country_code\n1.0.0.0/8,AA\n", reload_interval=0.0)
+    assert database.lookup("1.2.3.4")["country_code"] == "AA"
+
+    source = tmp_path / "ranges.csv"
+    source.write_text("network,country_code\n1.0.0.0/8,BB\n")
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    # The previous version keeps answering until the new one is swapped in
+    assert database.lookup("1.2.3.4")["country_code"] in ("AA", "BB")
+    deadline = time.monotonic() + 10
+    while database.lookup("1.2.3.4")["country_code"] != "BB":
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert len(os.listdir(tmp_path / "compiled")) == 1
+
+def test_unreadable_source_raises_on_load(tmp_path):
+    with pytest.raises(OSError):
+        GeoDatabase(str(tmp_path / "missing.csv"), cache_dir=str(tmp_path / "compiled"))
@@ -0,0 +1,55 @@
+import ipaddress
+import random
+
+import pytest
+
+from utils.utils.ip_arrays import parse_ipv4, reserved_kinds
+
+def _expected_kind(ip: str):
+    """The kind reserved_kinds should report, according to ipaddress."""
+    address = ipaddress.ip_address(ip)
+    if address.version == 6 and address.ipv4_mapped:
+        address = address.ipv4_mapped
+    if address.is_loopback:
+        return "loopback"
+    if address.is_link_local:
+        return "link_local"
+    if address.is_private:
+        return "private"
+    return None
+
+SAMPLES = [
+    "10.0.0.1", "172.16.5.4", "172.32.0.1", "192.168.1.1", "127.0.0.1", "169.254.10.10",
+    "8.8.8.8", "1.1.1.1", "100.64.0.1", "::1", "fe80::1", "fd00::1", "2001:db8::1",
+    "2606:4700::1111", "::ffff:10.0.0.1", "::ffff:127.0.0.1", "::ffff:169.254.1.1",
+    "::ffff:192.168.0.1", "::ffff:8.8.8.8",
+]
+
+@pytest.mark.parametrize("ip", SAMPLES)
+def test_reserved_kinds_matches_ipaddress(ip):
+    assert reserved_kinds([ip]) == [_expected_kind(ip)]
+
+def test_ipv4_mapped_private_address_is_private():
+    assert reserved_kinds(["::ffff:10.0.0.1", "::ffff:8.8.8.8"]) == ["private", None]
+
+def test_reserved_kinds_random_addresses():
+    rng = random.Random(0)
+    ips = [str(ipaddress.IPv4Address(rng.getrandbits(32))) for _ in range(2000)]
+    ips += [str(ipaddress.IPv6Address((0xFFFF << 32) | rng.getrandbits(32))) for _ in range(500)]
+    assert reserved_kinds(ips) == [_expected_kind(ip) for ip in ips]
+
+def test_reserved_kinds_invalid_input():
+    assert reserved_kinds(["", "not an ip", "256.1.1.1", "1.2.3"]) == [None] * 4
+
+def test_parse_ipv4_agrees_with_ipaddress():
+    ips = ["0.0.0.0", "255.255.255.255", "1.2.3.4", "01.2.3.4", "1.2.3.4.5", "1..2.3", "1.2.3.256", ""]
+    values, valid = parse_ipv4(ips)
+    for ip, value, ok in zip(ips, values.tolist(), valid.tolist()):
+        try:
+            expected = int(ipaddress.IPv4Address(ip))
+        except ValueError:
+            expected = None
+        if expected is None:
+            assert not ok, ip
+        else:
+            assert ok and value == expected, ip
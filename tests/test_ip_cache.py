@@ -0,0 +1,30 @@
+from utils.utils.ip_cache import MISSING, IPCache
+
+def test_misses_are_counted_once_both_tiers_miss(tmp_path):
+    path = str(tmp_path / "ip_cache.sqlite")
+    IPCache(path=path).put("geo", "8.8.8.8", {"city": "Mountain View"}, ttl=3600)
+
+    # A fresh process: memory is empty, the lookup is on disk
+    cache = IPCache(path=path)
+    assert cache.get("geo", "8.8.8.8") == {"city": "Mountain View"}
+    assert cache.get("geo", "8.8.8.8") == {"city": "Mountain View"}
+    assert cache.get("geo", "1.1.1.1") is MISSING
+
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["disk_hits"], stats["hits"], stats["misses"]) == (1, 1, 2, 1)
+
+def test_memory_only_cache_counts_misses():
+    cache = IPCache()
+    cache.put("hostname", "8.8.8.8", None, ttl=60)
+    assert cache.get("hostname", "8.8.8.8") is None
+    assert cache.get("hostname", "1.1.1.1") is MISSING
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["disk_hits"]) == (1, 1, 0)
+    assert stats["persisted_to"] is None
+
+def test_lookups_without_a_lifetime_are_not_kept(tmp_path):
+    path = str(tmp_path / "ip_cache.sqlite")
+    cache = IPCache(path=path)
+    cache.put("geo", "8.8.8.8", {"city": "Mountain View"}, ttl=0)
+    assert cache.get("geo", "8.8.8.8") is MISSING
+    assert IPCache(path=path).get("geo", "8.8.8.8") is MISSING
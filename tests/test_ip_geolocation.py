@@ -0,0 +1,93 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils.utils import ip_geolocation
+from utils.utils.ip_cache import ip_cache
+from utils.utils.rate_limiter import TokenBucket
+
+class _Provider(BaseHTTPRequestHandler):
+    """Local stand-in for ip-api.com's batch endpoint."""
+
+    batches = []
+    dropped = set()
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        ips = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.batches.append(ips)
+        body = json.dumps([
+            {"status": "success", "query": ip, "country": "Testland", "countryCode": "TL",
+             "city": f"City {ip.split('.')[-1]}", "lat": 1.0, "lon": 2.0}
+            for ip in reversed(ips) if ip not in self.dropped
+        ]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+@pytest.fixture
+def provider(monkeypatch, no_dns):
+    _Provider.batches, _Provider.dropped = [], set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Provider)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    monkeypatch.setattr(ip_geolocation, "batch_limiter", TokenBucket(rate=1000, burst=1000))
+    ip_cache.clear()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+    ip_cache.clear()
+
+def test_batch_results_follow_input_order(provider, no_dns):
+    targets = ["8.8.8.8", "1.1.1.1", "8.8.8.8", "10.0.0.1", "::ffff:192.168.0.1", " 9.9.9.9 ", "not a host!"]
+    results = ip_geolocation.get_ip_geolocation_batch(targets, base_url=provider)
+
+    assert [result["query"] for result in results] == [target.strip() for target in targets]
+    assert results[0]["city"] == "City 8" and results[0]["country"] == "Testland"
+    assert results[2] == results[0]
+    assert results[3]["is_private"] and results[4]["is_private"]
+    assert "error" in results[6]
+    assert no_dns == ["not a host!"]
+    # Duplicates and reserved addresses never reach the provider
+    assert sorted(ip for batch in _Provider.batches for ip in batch) == ["1.1.1.1", "8.8.8.8", "9.9.9.9"]
+
+def test_batch_is_split_into_provider_sized_chunks(provider):
+    targets = [f"8.8.{i // 256}.{i % 256}" for i in range(ip_geolocation.BATCH_SIZE * 2 + 5)]
+    results = ip_geolocation.get_ip_geolocation_batch(targets, base_url=provider)
+    assert all("error" not in result for result in results)
+    assert sorted(len(batch) for batch in _Provider.batches) == [5, ip_geolocation.BATCH_SIZE, ip_geolocation.BATCH_SIZE]
+
+def test_repeat_lookups_are_served_from_the_cache(provider):
+    ip_geolocation.get_ip_geolocation_batch(["8.8.8.8", "1.1.1.1"], base_url=provider)
+    ip_geolocation.get_ip_geolocation_batch(["8.8.8.8", "1.1.1.1", "4.4.4.4"], base_url=provider)
+    assert _Provider.batches == [["8.8.8.8", "1.1.1.1"], ["4.4.4.4"]]
+
+def test_aggregate_sends_one_address_per_prefix(provider):
+    results = ip_geolocation.get_ip_geolocation_batch(
+        ["8.8.8.8", "8.8.8.4", "8.8.4.4"], base_url=provider, aggregate=True
+    )
+    assert sum(len(batch) for batch in _Provider.batches) == 2
+    assert [result["prefix"] for result in results] == ["8.8.8.0/24", "8.8.8.0/24", "8.8.4.0/24"]
+    assert [result["ip"] for result in results] == ["8.8.8.8", "8.8.8.4", "8.8.4.4"]
+
+def test_offline_mode_never_resolves_hostnames(no_dns):
+    results = ip_geolocation.get_ip_geolocation_batch(["example.com"], offline=True)
+    assert results[0]["error"] == ip_geolocation.OFFLINE_HOSTNAME_ERROR
+    assert ip_geolocation.get_ip_geolocation("example.com", offline=True)["error"] == ip_geolocation.OFFLINE_HOSTNAME_ERROR
+    assert no_dns == []
+
+def test_short_answers_are_matched_by_query(provider):
+    _Provider.dropped = {"1.1.1.1"}
+    results = ip_geolocation.get_ip_geolocation_batch(["8.8.8.8", "1.1.1.1", "9.9.9.9"], base_url=provider)
+
+    assert [result.get("city") for result in results] == ["City 8", None, "City 9"]
+    assert results[1]["error"] == "No geolocation data returned for this IP"
+    # The missing answer isn't cached, so it is asked for again
+    _Provider.dropped = set()
+    assert ip_geolocation.get_ip_geolocation_batch(["1.1.1.1"], base_url=provider)[0]["city"] == "City 1"
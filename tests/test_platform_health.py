@@ -0,0 +1,88 @@
+import pytest
+
+from utils.utils.platform_health import CONSECUTIVE_FAILURES, MIN_SAMPLES, PlatformHealth
+
+def _trip(health: PlatformHealth, platform: str = "site") -> None:
+    for _ in range(CONSECUTIVE_FAILURES):
+        health.record(platform, None)
+
+def test_consecutive_failures_open_the_circuit(clock):
+    health = PlatformHealth(cooldown=60)
+    for _ in range(CONSECUTIVE_FAILURES - 1):
+        health.record("site", None)
+    assert health.allow("site")
+    health.record("site", 0.1, 503)
+    assert not health.allow("site")
+    assert health.snapshot()["site"]["open"]
+
+def test_success_resets_the_failure_streak(clock):
+    health = PlatformHealth(cooldown=60)
+    for _ in range(CONSECUTIVE_FAILURES - 1):
+        health.record("site", None)
+    health.record("site", 0.1, 200)
+    health.record("site", None)
+    assert health.allow("site")
+
+def test_error_rate_opens_the_circuit(clock):
+    health = PlatformHealth(cooldown=60)
+    for _ in range(MIN_SAMPLES // 2):
+        health.record("site", 0.1, 200)
+        health.record("site", None)
+    assert not health.allow("site")
+
+def test_one_trial_probe_after_the_cooldown(clock):
+    health = PlatformHealth(cooldown=60)
+    _trip(health)
+    clock.now += 59
+    assert not health.allow("site")
+    clock.now += 1
+    assert health.allow("site")
+    # Only one trial at a time
+    assert not health.allow("site")
+
+def test_successful_trial_closes_the_circuit(clock):
+    health = PlatformHealth(cooldown=60)
+    _trip(health)
+    clock.now += 60
+    assert health.allow("site")
+    health.record("site", 0.2, 200)
+    assert health.allow("site")
+    snapshot = health.snapshot()["site"]
+    assert not snapshot["open"]
+    assert snapshot["error_rate"] == 0.0
+
+def test_failed_trial_reopens_for_another_cooldown(clock):
+    health = PlatformHealth(cooldown=60)
+    _trip(health)
+    clock.now += 60
+    assert health.allow("site")
+    health.record("site", None)
+    assert not health.allow("site")
+    clock.now += 60
+    assert health.allow("site")
+
+def test_lost_trial_does_not_block_forever(clock):
+    health = PlatformHealth(cooldown=60, default_timeout=5)
+    _trip(health)
+    clock.now += 60
+    assert health.allow("site")
+    clock.now += 10
+    assert health.allow("site")
+
+def test_timeout_follows_observed_p99(clock):
+    health = PlatformHealth(default_timeout=5.0, min_timeout=1.5, timeout_factor=2.0)
+    assert health.timeout("site") == 5.0
+    for _ in range(MIN_SAMPLES):
+        health.record("site", 1.0, 200)
+    assert health.timeout("site") == 2.0
+    for _ in range(MIN_SAMPLES * 5):
+        health.record("fast", 0.01, 200)
+    assert health.timeout("fast") == 1.5
+
+def test_platforms_are_independent(clock):
+    health = PlatformHealth(cooldown=60)
+    _trip(health, "bad")
+    assert not health.allow("bad")
+    assert health.allow("good")
+    health.reset("bad")
+    assert health.allow("bad")
@@ -0,0 +1,98 @@
+import pytest
+
+from utils.utils.platform_registry import Detector, PlatformRegistry
+
+def _reader(messages, max_bytes=1024, encoding=None):
+    detector = Detector("Site", {"url": "https://example.com/{username}", "error_msg": messages}, None)
+    return detector, detector.body_reader(200, max_bytes, encoding)
+
+def _feed(reader, chunks):
+    for chunk in chunks:
+        if reader.feed(chunk):
+            return True
+    return False
+
+def test_ascii_messages_match_case_insensitively_across_chunks():
+    detector, reader = _reader(["page not found", "no such user"])
+    assert _feed(reader, [b"<html>...No Su", b"CH uSeR...</html>"])
+    assert reader.matched
+    assert not detector.exists(200, "https://example.com/alice", reader)
+
+def test_body_without_a_message_means_the_account_exists():
+    detector, reader = _reader(["no such user"])
+    assert not _feed(reader, [b"<html>alice's profile", b"</html>"])
+    assert detector.exists(200, "https://example.com/alice", reader)
+
+def test_reading_stops_at_the_byte_cap():
+    _, reader = _reader(["no such user"], max_bytes=16)
+    assert _feed(reader, [b"x" * 10, b"y" * 10, b"no such user"])
+    assert not reader.matched
+    assert reader.bytes_read == 16
+
+@pytest.mark.parametrize("encoding", ["utf-8", "windows-1251"])
+def test_non_ascii_messages_fold_case(encoding):
+    _, reader = _reader(["Пользователь не найден"], encoding=encoding)
+    body = "<html>ПОЛЬЗОВАТЕЛЬ НЕ НАЙДЕН</html>".encode(encoding)
+    # In UTF-8 the split falls inside the first Cyrillic character
+    assert _feed(reader, [body[:7], body[7:]])
+    assert reader.matched
+
+def test_non_ascii_message_is_not_found_in_other_text():
+    _, reader = _reader(["Пользователь не найден"], encoding="utf-8")
+    assert not _feed(reader, ["<html>Профиль пользователя</html>".encode("utf-8")])
+
+def test_other_statuses_need_no_body():
+    detector, _ = _reader(["no such user"])
+    assert detector.body_reader(404, 1024) is None
+    assert not detector.exists(404, "https://example.com/alice")
+
+def _registry():
+    return PlatformRegistry({
+        "version": 2,
+        "defaults": {"regex": "^[a-z]+$"},
+        "platforms": {
+            "Code": {"url": "https://code.example/{username}", "tags": ["coding"], "category": "Tech"},
+            "Toot": {"url": "https://toot.example/@{username}", "tags": ["Fediverse", "social"], "category": "Social"},
+            "Chat": {"url": "https://chat.example/{username}", "tags": ["social"], "category": "Social"},
+            "Mail": {"url": "https://mail.example/{username}", "username_only": False, "tags": ["coding"]},
+        }
+    })
+
+def test_bundled_registry_loads_with_compilable_detectors():
+    registry = PlatformRegistry.load()
+    assert registry.version == 2
+    assert registry.names
+    for name in registry.names:
+        assert "{username}" in registry.detector(name).request_url("{username}")
+
+def test_select_combines_names_tags_and_categories():
+    registry = _registry()
+    assert registry.select() == ["Code", "Toot", "Chat"]
+    assert registry.select(tags=["fediverse"]) == ["Toot"]
+    assert registry.select(names=["Code"], categories=["social"]) == ["Code", "Toot", "Chat"]
+    # Platforms that can't be probed by username are never selected
+    assert registry.select(names=["Mail"], tags=["coding"]) == ["Code"]
+    assert registry.tags() == ["coding", "fediverse", "social"]
+    assert registry.categories() == ["Social", "Tech"]
+
+def test_detectors_use_the_registry_defaults():
+    registry = _registry()
+    detector = registry.detector("Code")
+    assert detector.method == "status_code"
+    assert detector.accepts("alice") and not detector.accepts("Alice1")
+    assert registry.detector("Code") is detector
+
+def test_unknown_detection_method_is_rejected():
+    with pytest.raises(ValueError):
+        Detector("Site", {"url": "https://example.com/{username}", "detection": "telepathy"}, None)
+
+def test_json_field_detection_follows_the_path():
+    detector = Detector("Api", {"url": "https://api.example/{username}", "detection": "json_field",
+                                "json_field": "data.0.id"}, None)
+    reader = detector.body_reader(200, 1024)
+    reader.feed(b'{"data": [{"id": 7}]}')
+    assert detector.exists(200, "https://api.example/alice", reader)
+
+    reader = detector.body_reader(200, 1024)
+    reader.feed(b'{"data": []}')
+    assert not detector.exists(200, "https://api.example/alice", reader)
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from utils.utils import rate_limiter
+from utils.utils.rate_limiter import HostRateLimiter, TokenBucket
+
+def test_burst_is_free_then_requests_are_spaced(clock):
+    bucket = TokenBucket(rate=2.0, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5)
+    # Each further caller queues behind the previous one's debt
+    assert bucket.reserve() == pytest.approx(1.0)
+
+def test_tokens_refill_over_time_up_to_burst(clock):
+    bucket = TokenBucket(rate=1.0, burst=2)
+    bucket.reserve()
+    bucket.reserve()
+    clock.now += 1.0
+    assert bucket.reserve() == 0.0
+    clock.now += 100.0
+    assert [bucket.reserve() for _ in range(2)] == [0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(1.0)
+
+def test_rate_and_burst_are_clamped():
+    bucket = TokenBucket(rate=0, burst=0)
+    assert bucket.rate > 0
+    assert bucket.burst == 1
+
+def test_acquire_sleeps_for_the_reserved_delay(clock, monkeypatch):
+    slept = []
+    monkeypatch.setattr(rate_limiter.time, "sleep", slept.append)
+    bucket = TokenBucket(rate=4.0, burst=1)
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(0.25)
+    assert slept == [pytest.approx(0.25)]
+
+def test_acquire_async_waits_on_the_loop(clock, monkeypatch):
+    waits = []
+
+    async def fake_sleep(delay):
+        waits.append(delay)
+
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", fake_sleep)
+    bucket = TokenBucket(rate=2.0, burst=1)
+
+    async def main():
+        return [await bucket.acquire_async(), await bucket.acquire_async()]
+
+    assert asyncio.run(main()) == [0.0, pytest.approx(0.5)]
+    assert waits == [pytest.approx(0.5)]
+
+def test_host_limiter_keeps_one_bucket_per_host():
+    limiter = HostRateLimiter(rate=1.0, burst=2, overrides={"Fast.example": (50.0, 10)})
+    assert limiter.bucket("a.example") is limiter.bucket("A.EXAMPLE")
+    assert limiter.bucket("a.example") is not limiter.bucket("b.example")
+    assert (limiter.bucket("fast.example").rate, limiter.bucket("fast.example").burst) == (50.0, 10)
+
+def test_host_limiter_configure_replaces_buckets():
+    limiter = HostRateLimiter(rate=1.0, burst=2)
+    old = limiter.bucket("a.example")
+    limiter.configure("a.example", rate=5.0)
+    new = limiter.bucket("a.example")
+    assert new is not old
+    assert (new.rate, new.burst) == (5.0, 2)
+
+    limiter.configure(rate=3.0, burst=4)
+    assert (limiter.bucket("b.example").rate, limiter.bucket("b.example").burst) == (3.0, 4)
+    # Per-host overrides survive a change of the defaults
+    assert limiter.bucket("a.example").rate == 5.0
@@ -0,0 +1,130 @@
+import asyncio
+
+import dns.exception
+import dns.resolver
+import pytest
+
+from utils.utils import resolver_pool
+from utils.utils.resolver_pool import FAILURE_COOLDOWN, FAILURE_LIMIT, LIAR_COOLDOWN, ResolverPool
+
+NAMESERVERS = ["192.0.2.1", "192.0.2.2", "192.0.2.3"]
+
+@pytest.fixture
+def pool(monkeypatch, zone):
+    """
+    A pool of three upstreams answered by the fake zone. Set
+    pool.behaviour[ip] to an exception class for upstreams that fail.
+    """
+    pool = ResolverPool(NAMESERVERS, attempts=3)
+    pool.behaviour = {}
+    pool.asked = []
+
+    def answer(key, name, rdtype):
+        pool.asked.append(key)
+        error = pool.behaviour.get(key)
+        if error is not None:
+            raise error()
+        return zone.resolve(name, rdtype)
+
+    for upstream in pool.upstreams:
+        def resolve(name, rdtype="A", *args, key=upstream.key, **kwargs):
+            return answer(key, name, rdtype)
+
+        async def resolve_async(name, rdtype="A", *args, key=upstream.key, **kwargs):
+            return answer(key, name, rdtype)
+
+        monkeypatch.setattr(upstream.resolver, "resolve", resolve)
+        monkeypatch.setattr(upstream.async_resolver, "resolve", resolve_async)
+    return pool
+
+def _upstream(pool, key):
+    return next(upstream for upstream in pool.upstreams if upstream.key == key)
+
+def _resolve(pool, name, use_async):
+    if use_async:
+        return asyncio.run(pool.resolve_async(name))
+    return pool.resolve(name)
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_timeouts_are_retried_on_another_upstream(pool, zone, use_async):
+    zone.add("example.com", "A", "192.0.2.80")
+    pool.behaviour = {"192.0.2.1": dns.exception.Timeout, "192.0.2.2": dns.exception.Timeout}
+
+    for _ in range(5):
+        assert _resolve(pool, "example.com", use_async)[0].address == "192.0.2.80"
+    stats = {row["nameserver"]: row for row in pool.stats()}
+    assert stats["192.0.2.3"]["error_rate"] == 0.0
+    assert all(stats[key]["error_rate"] == 1.0 for key in ("192.0.2.1", "192.0.2.2") if stats[key]["queries"])
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_servfail_is_raised_at_once_without_scoring(pool, use_async):
+    pool.behaviour = {key: dns.resolver.NoNameservers for key in NAMESERVERS}
+
+    with pytest.raises(dns.resolver.NoNameservers):
+        _resolve(pool, "broken.example", use_async)
+    assert len(pool.asked) == 1
+    assert all(row["queries"] == 0 for row in pool.stats())
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_negative_answers_are_not_failures(pool, use_async):
+    with pytest.raises(dns.resolver.NXDOMAIN):
+        _resolve(pool, "missing.example", use_async)
+    assert len(pool.asked) == 1
+    assert sum(row["queries"] for row in pool.stats()) == 1
+    assert all(row["error_rate"] == 0.0 for row in pool.stats())
+
+def test_every_upstream_timing_out_raises_the_timeout(pool):
+    pool.behaviour = {key: dns.exception.Timeout for key in NAMESERVERS}
+    with pytest.raises(dns.exception.Timeout):
+        pool.resolve("example.com")
+    assert sorted(pool.asked) == NAMESERVERS
+
+def test_repeated_failures_demote_an_upstream(pool, clock):
+    upstream = _upstream(pool, "192.0.2.1")
+    for _ in range(FAILURE_LIMIT):
+        upstream.record(False)
+    assert upstream.demoted
+    for _ in range(50):
+        assert pool.choose(set()).key != "192.0.2.1"
+
+    clock.now += FAILURE_COOLDOWN
+    assert not upstream.demoted
+
+def test_demoted_upstreams_are_used_when_nothing_else_is_left(pool, clock):
+    for upstream in pool.upstreams:
+        upstream.demoted_until = clock.now + 10
+    _upstream(pool, "192.0.2.2").demoted_until = clock.now + 5
+    assert pool.choose(set()).key == "192.0.2.2"
+    assert pool.choose(set(NAMESERVERS)) is None
+
+def test_faster_upstreams_weigh_more(pool):
+    fast, slow = _upstream(pool, "192.0.2.1"), _upstream(pool, "192.0.2.2")
+    for _ in range(10):
+        fast.record(True, 0.01)
+        slow.record(True, 0.2)
+    assert fast.weight > slow.weight
+
+def test_upstreams_answering_for_nonexistent_names_are_shunned(pool, zone, clock, monkeypatch):
+    liar = _upstream(pool, "192.0.2.3")
+
+    async def hijack(name, rdtype="A", *args, **kwargs):
+        zone.add(name, "A", "198.51.100.1")
+        return zone.answer(name, rdtype)
+
+    monkeypatch.setattr(liar.async_resolver, "resolve", hijack)
+    asyncio.run(pool.verify_async())
+
+    stats = {row["nameserver"]: row for row in pool.stats()}
+    assert stats["192.0.2.3"]["lied"] and stats["192.0.2.3"]["demoted"]
+    assert not stats["192.0.2.1"]["lied"] and not stats["192.0.2.1"]["demoted"]
+    assert liar.demoted_until == clock.now + LIAR_COOLDOWN
+
+def test_verification_runs_at_most_once_per_interval(pool, clock):
+    asyncio.run(pool.verify_async())
+    asked = len(pool.asked)
+    asyncio.run(pool.verify_async())
+    assert len(pool.asked) == asked
+
+    clock.now += resolver_pool.VERIFY_INTERVAL
+    asyncio.run(pool.verify_async())
+    assert len(pool.asked) == 2 * asked
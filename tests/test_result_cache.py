@@ -0,0 +1,76 @@
+import pytest
+
+from utils.utils import result_cache
+from utils.utils.result_cache import ResultCache, cacheable, normalize_username
+
+class WallClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def wall_clock(monkeypatch):
+    fake = WallClock()
+    monkeypatch.setattr(result_cache.time, "time", fake)
+    return fake
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(str(tmp_path / "results.sqlite"), ttl=100, negative_ttl=10,
+                       platform_ttls={"Slow": {"negative_ttl": 1000}})
+
+def _result(platform="GitHub", exists=True, status_code=200, error=None):
+    return {"platform": platform, "url": f"https://example.com/{platform}", "exists": exists,
+            "status_code": status_code, "error": error}
+
+def test_found_and_missing_results_have_their_own_ttl(cache, wall_clock):
+    cache.put(_result(exists=True), "alice")
+    cache.put(_result(exists=False, status_code=404), "bob")
+
+    wall_clock.now += 10
+    assert cache.get("GitHub", "alice")["exists"]
+    assert cache.get("GitHub", "bob")["exists"] is False
+
+    wall_clock.now += 1
+    assert cache.get("GitHub", "bob") is None
+    assert cache.get("GitHub", "alice") is not None
+
+    wall_clock.now += 90
+    assert cache.get("GitHub", "alice") is None
+
+def test_platform_ttl_overrides(cache, wall_clock):
+    cache.put(_result(platform="Slow", exists=False, status_code=404), "bob")
+    wall_clock.now += 500
+    assert cache.get("Slow", "bob") is not None
+
+def test_usernames_are_normalized(cache, wall_clock):
+    cache.put(_result(), " @Alice ")
+    assert cache.get("GitHub", "alice") is not None
+    assert normalize_username(" @Alice ") == "alice"
+
+@pytest.mark.parametrize("result, expected", [
+    (_result(), True),
+    (_result(exists=False, status_code=404), True),
+    (_result(exists=False, status_code=None, error="timed out"), False),
+    (_result(exists=False, status_code=429), False),
+    (_result(exists=False, status_code=502), False),
+])
+def test_only_clean_answers_are_cacheable(cache, wall_clock, result, expected):
+    assert cacheable(result) is expected
+    cache.put(result, "alice")
+    assert (cache.get("GitHub", "alice") is not None) is expected
+
+def test_put_many_and_invalidate(cache, wall_clock):
+    cache.put_many([(_result(platform=name), user) for name in ("A", "B") for user in ("alice", "bob")])
+    assert cache.stats()["entries"] == 4
+    assert cache.invalidate(username="alice") == 2
+    assert cache.invalidate(platform="B") == 1
+    assert cache.stats()["entries"] == 1
+
+def test_hits_and_misses_are_counted(cache, wall_clock):
+    cache.put(_result(), "alice")
+    cache.get("GitHub", "alice")
+    cache.get("GitHub", "nobody")
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
@@ -0,0 +1,65 @@
+import asyncio
+
+import dns.resolver
+import pytest
+
+from utils.utils import subdomain_bruteforce
+from utils.utils.resolver_pool import ResolverPool
+
+def test_wordlist_file_is_streamed_without_repeats(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_bytes(b"www\n# comment\n\nMail.\nwww\r\napi")
+    assert list(subdomain_bruteforce.read_wordlist(str(path))) == ["www", "mail", "api"]
+
+def test_empty_wordlist_file_yields_nothing(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    assert list(subdomain_bruteforce.read_wordlist(str(path))) == []
+
+@pytest.fixture
+def pool(monkeypatch, zone):
+    """A one-upstream pool whose queries are answered by the fake zone."""
+    pool = ResolverPool(["192.0.2.53"])
+
+    async def resolve(name, rdtype="A", *args, **kwargs):
+        return zone.resolve(name, rdtype)
+
+    monkeypatch.setattr(pool.upstreams[0].async_resolver, "resolve", resolve)
+    monkeypatch.setattr(subdomain_bruteforce, "get_resolver_pool", lambda: pool)
+    return pool
+
+def _bruteforce(domain, wordlist, **kwargs):
+    async def main():
+        return [found async for found in subdomain_bruteforce.bruteforce_subdomains_async(domain, wordlist, **kwargs)]
+    return sorted(asyncio.run(main()), key=lambda found: found["subdomain"])
+
+def test_bruteforce_yields_names_that_resolve(pool, zone):
+    zone.add("www.example.com", "A", "192.0.2.10", "192.0.2.9")
+    zone.add("api.example.com", "A", "192.0.2.11")
+
+    found = _bruteforce("Example.com.", ["www", "api", "nope", "www"], concurrency=2)
+    assert found == [
+        {"subdomain": "api.example.com", "ips": ["192.0.2.11"], "ttl": 300},
+        {"subdomain": "www.example.com", "ips": ["192.0.2.10", "192.0.2.9"], "ttl": 300},
+    ]
+    assert zone.asked.count(("www.example.com", "A")) == 1
+
+def test_wildcard_answers_are_filtered(pool, zone, monkeypatch):
+    zone.add("www.example.com", "A", "192.0.2.10")
+    zone.add("shop.example.com", "A", "192.0.2.99")
+
+    def resolve(name, rdtype="A", *args, **kwargs):
+        # Everything else under the domain answers with the wildcard address
+        try:
+            return zone.answer(name, rdtype)
+        except dns.resolver.NXDOMAIN:
+            if str(name).rstrip(".").endswith(".example.com"):
+                zone.add(name, "A", "192.0.2.99")
+                return zone.answer(name, rdtype)
+            raise
+
+    monkeypatch.setattr(zone, "resolve", resolve)
+    assert asyncio.run(subdomain_bruteforce.detect_wildcard(pool, "example.com")) == {"192.0.2.99"}
+
+    found = _bruteforce("example.com", ["www", "shop", "anything"])
+    assert [entry["subdomain"] for entry in found] == ["www.example.com"]
@@ -0,0 +1,99 @@
+import dns.exception
+import dns.message
+import dns.name
+import dns.rcode
+import dns.rdata
+import dns.rdataclass
+import dns.rdatatype
+import dns.resolver
+import pytest
+
+from utils.utils.dns_cache import DEFAULT_NEGATIVE_TTL, MAX_NEGATIVE_TTL, CachingResolver
+from utils.utils.ttl_cache import TTLCache
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = TTLCache()
+    cache.put("a", 1, ttl=10)
+    assert cache.get("a") == 1
+    clock.now += 10
+    assert cache.get("a", "gone") == "gone"
+    assert len(cache) == 0
+
+def test_non_positive_ttl_is_not_stored(clock):
+    cache = TTLCache()
+    cache.put("a", 1, ttl=0)
+    cache.put("b", 1, ttl=-5)
+    assert len(cache) == 0
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TTLCache(max_entries=2)
+    cache.put("a", 1, ttl=60)
+    cache.put("b", 2, ttl=60)
+    cache.get("a")
+    cache.put("c", 3, ttl=60)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+def _negative_response(name: str, soa_ttl: int = None, minimum: int = None) -> dns.message.Message:
+    query = dns.message.make_query(name, "A")
+    response = dns.message.make_response(query)
+    response.set_rcode(dns.rcode.NXDOMAIN)
+    if soa_ttl is not None:
+        rrset = response.find_rrset(response.authority, dns.name.from_text("example.com."),
+                                    dns.rdataclass.IN, dns.rdatatype.SOA, create=True)
+        rrset.add(dns.rdata.from_text(
+            dns.rdataclass.IN, dns.rdatatype.SOA,
+            f"ns.example.com. hostmaster.example.com. 1 7200 900 1209600 {minimum}"
+        ), soa_ttl)
+    return response
+
+class FakePool:
+    """Upstream stand-in that always answers NXDOMAIN with the given response."""
+
+    def __init__(self, response: dns.message.Message):
+        self.response = response
+        self.queries = 0
+
+    def resolve(self, name, rdtype, limiter=None):
+        self.queries += 1
+        qname = dns.name.from_text(str(name))
+        raise dns.resolver.NXDOMAIN(qnames=[qname], responses={qname: self.response})
+
+def _ttl_of_cached_error(resolver: CachingResolver, clock, name: str) -> float:
+    """Advance the clock until the cached NXDOMAIN expires and report when it did."""
+    pool = resolver._resolver
+    with pytest.raises(dns.resolver.NXDOMAIN):
+        resolver.resolve(name)
+    assert pool.queries == 1
+    start = clock.now
+    while pool.queries == 1:
+        clock.now += 1
+        with pytest.raises(dns.resolver.NXDOMAIN):
+            resolver.resolve(name)
+    return clock.now - start
+
+@pytest.mark.parametrize("soa_ttl, minimum, expected", [
+    (60, 300, 60),
+    (3600, 30, 30),
+    (86400, 86400, MAX_NEGATIVE_TTL),
+    (None, None, DEFAULT_NEGATIVE_TTL),
+])
+def test_nxdomain_is_cached_for_the_soa_negative_ttl(clock, soa_ttl, minimum, expected):
+    resolver = CachingResolver(resolver=FakePool(_negative_response("missing.example.com.", soa_ttl, minimum)))
+    assert _ttl_of_cached_error(resolver, clock, "missing.example.com") == expected
+
+def test_timeouts_are_not_cached(clock):
+    class TimingOut:
+        queries = 0
+
+        def resolve(self, name, rdtype, limiter=None):
+            self.queries += 1
+            raise dns.exception.Timeout()
+
+    pool = TimingOut()
+    resolver = CachingResolver(resolver=pool)
+    for _ in range(2):
+        with pytest.raises(dns.exception.Timeout):
+            resolver.resolve("slow.example.com")
+    assert pool.queries == 2
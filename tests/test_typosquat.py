@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from utils.utils import typosquat
+from utils.utils.resolver_pool import ResolverPool
+
+def _domains(domain, techniques=None, tlds=None):
+    return [candidate["domain"] for candidate in typosquat.generate_typosquats(domain, techniques, tlds)]
+
+def test_every_tld_swap_is_generated():
+    swaps = _domains("example.com", ["tld_swap"])
+    assert swaps == [f"example.{tld}" for tld in typosquat.TLD_SWAPS if tld != "com"]
+    assert "example.online" in swaps and "example.store" in swaps
+
+def test_label_techniques_keep_the_suffix():
+    assert _domains("abc.co.uk", ["omission"]) == ["bc.co.uk", "ac.co.uk", "ab.co.uk"]
+    assert _domains("abc.com", ["transposition"]) == ["bac.com", "acb.com"]
+    assert _domains("abc.com", ["hyphenation"]) == ["a-bc.com", "ab-c.com"]
+    assert "examp1e.com" in _domains("example.com", ["homoglyph"])
+    assert "rnail.com" in _domains("mail.com", ["homoglyph"])
+    assert "mail.com" in _domains("rnail.com", ["homoglyph"])
+
+def test_unicode_homoglyphs_come_out_as_punycode():
+    candidates = _domains("apple.com", ["homoglyph"])
+    assert "xn--pple-43d.com" in candidates  # Cyrillic "а"
+    assert all(candidate.isascii() for candidate in candidates)
+
+def test_candidates_are_unique_valid_hostnames():
+    candidates = list(typosquat.generate_typosquats("example.com"))
+    domains = [candidate["domain"] for candidate in candidates]
+    assert len(domains) == len(set(domains)) and "example.com" not in domains
+    assert all(typosquat._is_hostname(domain) for domain in domains)
+    assert {candidate["technique"] for candidate in candidates} == set(typosquat.TECHNIQUES)
+
+def test_bitflips_only_produce_hostname_characters():
+    assert all(typosquat._is_hostname(domain) for domain in _domains("a.com", ["bitflip"]))
+    assert "c.com" in _domains("a.com", ["bitflip"])
+
+def test_invalid_seeds_and_techniques():
+    assert _domains("not a domain") == []
+    assert _domains("192.0.2.1") == []
+    with pytest.raises(ValueError):
+        _domains("example.com", ["teleport"])
+
+def test_only_registered_candidates_are_reported(monkeypatch, zone):
+    pool = ResolverPool(["192.0.2.53"])
+
+    async def resolve(name, rdtype="A", *args, **kwargs):
+        return zone.resolve(name, rdtype)
+
+    monkeypatch.setattr(pool.upstreams[0].async_resolver, "resolve", resolve)
+    monkeypatch.setattr(typosquat, "get_resolver_pool", lambda: pool)
+    zone.add("example.online", "A", "192.0.2.7")
+    zone.add("example.online", "NS", "ns1.parking.example.")
+    zone.add("example.store", "TXT", '"parked"')
+
+    async def main():
+        candidates = typosquat.generate_typosquats("example.com", ["tld_swap"])
+        return [found async for found in typosquat.find_registered_async(candidates, concurrency=4)]
+
+    found = sorted(asyncio.run(main()), key=lambda row: row["domain"])
+    assert found == [
+        {"domain": "example.online", "technique": "tld_swap", "A": "192.0.2.7", "MX": "", "NS": "ns1.parking.example"},
+        {"domain": "example.store", "technique": "tld_swap", "A": "", "MX": "", "NS": ""},
+    ]
@@ -0,0 +1,273 @@
+import asyncio
+import io
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import aiohttp
+import pytest
+
+from utils.utils import username_checker
+from utils.utils.calibration import Calibrator
+from utils.utils.export import stream_to_jsonl
+from utils.utils.platform_health import CONSECUTIVE_FAILURES, PlatformHealth
+from utils.utils.platform_registry import PlatformRegistry
+from utils.utils.rate_limiter import HostRateLimiter
+from utils.utils.result_cache import ResultCache
+
+class _Site(BaseHTTPRequestHandler):
+    """Local stand-in for the platforms: fixed pages by path, the fallback page for anything else."""
+
+    protocol_version = "HTTP/1.1"
+    pages = {}
+    fallback = (404, b"<html>Not Found</html>", {})
+    requests = []
+    connections = 0
+    delay = 0.0
+    in_flight = 0
+    max_in_flight = 0
+    counter_lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with _Site.counter_lock:
+            _Site.connections += 1
+
+    def do_GET(self):
+        with _Site.counter_lock:
+            _Site.requests.append((self.path, dict(self.headers)))
+            _Site.in_flight += 1
+            _Site.max_in_flight = max(_Site.max_in_flight, _Site.in_flight)
+        try:
+            if _Site.delay:
+                time.sleep(_Site.delay)
+            status, body, headers = _Site.pages.get(self.path, _Site.fallback)
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            if "Content-Length" not in headers:
+                self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client stopped reading and closed the connection
+            pass
+        finally:
+            with _Site.counter_lock:
+                _Site.in_flight -= 1
+
+@pytest.fixture
+def site():
+    _Site.pages, _Site.requests = {}, []
+    _Site.fallback = (404, b"<html>Not Found</html>", {})
+    _Site.connections = _Site.in_flight = _Site.max_in_flight = 0
+    _Site.delay = 0.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Site)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def platforms(monkeypatch, site, tmp_path):
+    """
+    Install a registry of platforms served by the local site, with
+    unthrottled pacing and fresh health, calibration and result stores.
+    """
+    monkeypatch.setattr(username_checker, "platform_limiter", HostRateLimiter(rate=1000, burst=1000))
+    monkeypatch.setattr(username_checker, "platform_health", PlatformHealth())
+    calibrator = Calibrator(str(tmp_path / "calibrations.sqlite"))
+    monkeypatch.setattr(username_checker, "get_calibrator", lambda: calibrator)
+    cache = ResultCache(str(tmp_path / "results.sqlite"))
+    monkeypatch.setattr(username_checker, "get_result_cache", lambda: cache)
+
+    def install(definitions):
+        registry = PlatformRegistry({
+            "version": 2,
+            "defaults": {"regex": "^[^\\s/?#&%]{1,64}$"},
+            "platforms": {name: dict(definition, url=site + definition["url"])
+                          for name, definition in definitions.items()}
+        })
+        monkeypatch.setattr(username_checker, "get_registry", lambda *args, **kwargs: registry)
+        return registry
+
+    install.cache = cache
+    return install
+
+def _check(username, **kwargs):
+    async def main():
+        async with aiohttp.ClientSession() as session:
+            return await username_checker.check_username_async(username, session=session, **kwargs)
+    return asyncio.run(main())
+
+def _by_platform(results):
+    return {result["platform"]: result for result in results}
+
+def test_async_engine_reports_found_and_missing(platforms):
+    platforms({
+        "Status": {"url": "/status/{username}", "detection": "status_code"},
+        "Message": {"url": "/message/{username}", "error_msg": ["no such user"]},
+        "Strict": {"url": "/strict/{username}", "regex": "^[a-z]{1,3}$"},
+    })
+    _Site.pages = {
+        "/status/alice": (200, b"<html>alice</html>", {}),
+        "/message/alice": (200, b"<html>alice's profile</html>", {}),
+    }
+
+    results = _check("alice", use_cache=False)
+    found = _by_platform(results)
+    assert found["Status"]["exists"] and found["Message"]["exists"]
+    assert found["Strict"]["error"] == "Username not valid on this platform"
+    # Found accounts sort first
+    assert [result["exists"] for result in results] == [True, True, False]
+
+    missing = _by_platform(_check("bob", use_cache=False))
+    assert not missing["Status"]["exists"] and missing["Status"]["status_code"] == 404
+    assert not missing["Message"]["exists"] and missing["Message"]["error"] is None
+
+def test_soft_404_message_is_matched_in_the_body(platforms):
+    platforms({"Soft": {"url": "/soft/{username}", "error_msg": ["no such user"], "regex": "^[a-z]+$"}})
+    # Missing users get the same 200 page, so calibration can't settle it
+    _Site.fallback = (200, b"<html>Sorry, No Such User here</html>", {})
+    _Site.pages = {"/soft/alice": (200, b"<html>alice</html>", {})}
+
+    assert not _check("bob", use_cache=False)[0]["exists"]
+    assert _check("alice", use_cache=False)[0]["exists"]
+
+def test_probes_stay_under_the_per_host_limit(platforms):
+    platforms({f"P{i}": {"url": f"/p{i}/{{username}}", "detection": "status_code"} for i in range(12)})
+    _Site.delay = 0.05
+
+    results = _check("alice", use_cache=False, per_host_limit=3)
+    assert len(results) == 12
+    assert 1 < _Site.max_in_flight <= 3
+
+def test_probes_do_not_offer_brotli(platforms):
+    platforms({"Status": {"url": "/status/{username}", "detection": "status_code"}})
+    _check("alice", use_cache=False)
+    encodings = {headers.get("Accept-Encoding") for _, headers in _Site.requests}
+    assert encodings == {"gzip, deflate"}
+
+def test_failing_platform_is_skipped_once_its_circuit_opens(platforms):
+    platforms({"Down": {"url": "/down/{username}", "detection": "status_code"}})
+    _Site.pages = {f"/down/user{i}": (503, b"unavailable", {}) for i in range(10)}
+
+    for i in range(CONSECUTIVE_FAILURES):
+        _check(f"user{i}", use_cache=False)
+    assert _check("user9", use_cache=False)[0]["error"] == username_checker.SKIPPED_UNHEALTHY
+
+def _bulk(usernames, **kwargs):
+    async def main():
+        async with aiohttp.ClientSession() as session:
+            return [result async for result in username_checker.check_usernames_bulk_async(
+                usernames, session=session, **kwargs
+            )]
+    return asyncio.run(main())
+
+def test_read_usernames_parses_text_and_csv():
+    lines = [b"@alice,extra\n", "# comment\n", "\n", '"bob"\n', "  carol  \n"]
+    assert list(username_checker.read_usernames(lines)) == ["alice", "bob", "carol"]
+
+def test_interleaved_jobs_rotate_the_platform_order(platforms):
+    registry = platforms({
+        "A": {"url": "/a/{username}"},
+        "B": {"url": "/b/{username}"},
+        "C": {"url": "/c/{username}", "regex": "^[a-z]+$"},
+    })
+    jobs = list(username_checker._interleave_jobs(["u1", "u2", "x"], ["A", "B", "C"]))
+    assert [platform for _, platform in jobs[:3]] == ["A", "B", "C"]
+    assert [platform for _, platform in jobs[3:6]] == ["B", "C", "A"]
+
+    # With the registry, pairs breaking a platform's username rules are dropped
+    jobs = list(username_checker._interleave_jobs(["u1", "x"], ["A", "B", "C"], registry))
+    assert ("u1", "C") not in jobs and ("x", "C") in jobs
+
+def test_bulk_checks_every_username_on_every_platform(platforms):
+    platforms({
+        "A": {"url": "/a/{username}", "detection": "status_code"},
+        "B": {"url": "/b/{username}", "detection": "status_code"},
+    })
+    _Site.pages = {"/a/alice": (200, b"alice", {}), "/b/bob": (200, b"bob", {})}
+
+    results = _bulk(["alice", "bob", "carol"], use_cache=False, max_concurrency=2)
+    found = {(result["username"], result["platform"]): result["exists"] for result in results}
+    assert len(results) == 6
+    assert {pair for pair, exists in found.items() if exists} == {("alice", "A"), ("bob", "B")}
+
+def test_bulk_consumes_usernames_lazily(platforms):
+    platforms({"A": {"url": "/a/{username}", "detection": "status_code"}})
+    consumed = []
+
+    def usernames():
+        for i in range(1000):
+            consumed.append(i)
+            yield f"user{i}"
+
+    async def main():
+        async with aiohttp.ClientSession() as session:
+            stream = username_checker.check_usernames_bulk_async(
+                usernames(), session=session, use_cache=False, max_concurrency=2
+            )
+            first = await stream.__anext__()
+            await stream.aclose()
+            return first
+
+    assert asyncio.run(main())["username"].startswith("user")
+    # Only the scheduling window is read ahead, not the whole input
+    assert len(consumed) <= 2 * username_checker.BULK_WINDOW_FACTOR + 1
+
+def test_bulk_results_stream_to_jsonl(platforms):
+    platforms({"A": {"url": "/a/{username}", "detection": "status_code"}})
+    output = io.StringIO()
+    written = stream_to_jsonl(iter(_bulk(["alice", "bob"], use_cache=False)), output)
+    rows = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert written == 2
+    assert sorted(row["username"] for row in rows) == ["alice", "bob"]
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_throttled_answers_are_not_served_from_the_cache(platforms, status):
+    platforms({"A": {"url": "/a/{username}", "detection": "status_code"}})
+    _Site.pages = {"/a/alice": (status, b"slow down", {})}
+    first = _check("alice")[0]
+    assert not first["exists"] and first["status_code"] == status
+
+    _Site.pages = {"/a/alice": (200, b"alice", {})}
+    second = _check("alice")[0]
+    assert second["exists"] and not second["cached"]
+    assert _check("alice")[0]["cached"]
+
+def _profiles(size):
+    """Pages for user0..user3 whose body is the given size."""
+    body = b"<html>profile" + b" " * (size - 20) + b"</html>"
+    return {f"/a/user{i}": (200, body, {}) for i in range(4)}
+
+@pytest.mark.parametrize("size, reused", [(2 * 1024, True), (1024 * 1024, False)])
+def test_async_probes_drain_small_bodies_and_close_large_ones(platforms, size, reused):
+    platforms({"A": {"url": "/a/{username}", "detection": "status_code"}})
+    _Site.pages = _profiles(size)
+
+    async def main():
+        async with aiohttp.ClientSession() as session:
+            for i in range(4):
+                result = await username_checker.check_username_async(f"user{i}", session=session, use_cache=False)
+                assert result[0]["exists"]
+
+    asyncio.run(main())
+    # The small 404 from calibration is drained either way, so its connection
+    # carries the first probe; after that a large body costs a connection each
+    assert _Site.connections == (1 if reused else 4)
+
+@pytest.mark.parametrize("size, reused", [(2 * 1024, True), (1024 * 1024, False)])
+def test_sync_probes_drain_small_bodies_and_close_large_ones(platforms, size, reused):
+    registry = platforms({"A": {"url": "/a/{username}", "detection": "status_code"}})
+    _Site.pages = _profiles(size)
+    checker = username_checker.UsernameChecker(registry=registry, use_calibration=False)
+
+    assert all(checker.check_platform("A", f"user{i}")["exists"] for i in range(4))
+    assert _Site.connections == (1 if reused else 4)
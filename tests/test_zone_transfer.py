@@ -0,0 +1,114 @@
+import time
+from concurrent.futures import Future
+
+import dns.exception
+import dns.message
+import dns.name
+import dns.query
+import dns.rdata
+import dns.rdataclass
+import dns.rdatatype
+import pytest
+
+from utils.utils import dns_enum, zone_transfer
+
+SOA = "ns1.example.com. hostmaster.example.com. 1 7200 900 1209600 300"
+
+def _message(*records):
+    """An AXFR response message carrying (name, type, value) records."""
+    message = dns.message.make_response(dns.message.make_query("example.com", "AXFR"))
+    for name, rdtype, value in records:
+        rrset = message.find_rrset(message.answer, dns.name.from_text(name), dns.rdataclass.IN,
+                                   dns.rdatatype.from_text(rdtype), create=True)
+        rrset.add(dns.rdata.from_text(dns.rdataclass.IN, rdtype, value), 300)
+    return message
+
+ZONE = [
+    _message(("example.com.", "SOA", SOA), ("example.com.", "NS", "ns1.example.com.")),
+    _message(*[(f"host{i}.example.com.", "A", f"192.0.2.{i}") for i in range(1, 6)]),
+    _message(("example.com.", "SOA", SOA)),
+]
+
+@pytest.fixture
+def servers(monkeypatch):
+    """
+    Install a fake dns.query.xfr. Map nameserver IPs to the messages they
+    send, an exception they raise, or a delay before they refuse.
+    """
+    behaviour = {}
+
+    def xfr(ip, domain, timeout=None, lifetime=None):
+        action = behaviour[ip]
+        if isinstance(action, (int, float)):
+            time.sleep(action)
+            raise dns.exception.Timeout()
+        if isinstance(action, Exception):
+            raise action
+        yield from action
+
+    monkeypatch.setattr(dns.query, "xfr", xfr)
+    return behaviour
+
+def test_first_successful_transfer_is_streamed_into_the_store(servers, tmp_path):
+    servers["192.0.2.53"] = dns.query.TransferError(5)
+    servers["192.0.2.54"] = ZONE
+    transfer = zone_transfer.transfer_zone("example.com", [("ns1.example.com", "192.0.2.53"),
+                                                           ("ns2.example.com", "192.0.2.54")],
+                                           directory=str(tmp_path))
+
+    assert transfer["nameserver"] == "ns2.example.com" and transfer["ip"] == "192.0.2.54"
+    # The closing SOA is not stored twice
+    assert transfer["records"] == 7
+    records = list(zone_transfer.read_zone_records(transfer["store"]))
+    assert [record["type"] for record in records] == ["SOA", "NS"] + ["A"] * 5
+    assert records[2] == {"name": "host1.example.com.", "type": "A", "ttl": 300, "value": "192.0.2.1"}
+    assert len(list(zone_transfer.read_zone_records(transfer["store"], limit=3))) == 3
+
+def test_refused_everywhere_returns_none(servers, tmp_path):
+    servers["192.0.2.53"] = dns.query.TransferError(5)
+    servers["192.0.2.54"] = ConnectionRefusedError()
+    assert zone_transfer.transfer_zone("example.com", [("a", "192.0.2.53"), ("b", "192.0.2.54")],
+                                       directory=str(tmp_path)) is None
+    assert zone_transfer.transfer_zone("example.com", [], directory=str(tmp_path)) is None
+
+def test_slow_nameservers_are_abandoned_at_the_deadline(servers, tmp_path):
+    servers["192.0.2.53"] = 2.0
+    started = time.monotonic()
+    assert zone_transfer.transfer_zone("example.com", [("slow", "192.0.2.53")],
+                                       deadline=0.2, directory=str(tmp_path)) is None
+    assert time.monotonic() - started < 1.0
+
+def test_a_transfer_cut_off_midway_keeps_its_records(servers, tmp_path):
+    def cut_off():
+        yield ZONE[0]
+        raise EOFError()
+
+    servers["192.0.2.53"] = cut_off()
+    transfer = zone_transfer.transfer_zone("example.com", [("ns1", "192.0.2.53")], directory=str(tmp_path))
+    assert transfer["records"] == 2
+
+def test_records_are_written_in_batches(servers, tmp_path, monkeypatch):
+    monkeypatch.setattr(zone_transfer, "STORE_BATCH_SIZE", 2)
+    servers["192.0.2.53"] = ZONE
+    transfer = zone_transfer.transfer_zone("example.com", [("ns1", "192.0.2.53")], directory=str(tmp_path))
+    assert len(list(zone_transfer.read_zone_records(transfer["store"]))) == transfer["records"] == 7
+
+def test_zone_store_path_is_a_safe_file_name(tmp_path):
+    path = zone_transfer.zone_store_path("Ex/ample.COM", str(tmp_path))
+    assert path == str(tmp_path / "ex_ample.com.sqlite")
+
+def test_enumeration_returns_a_preview_of_the_stored_zone(servers, tmp_path, monkeypatch, zone):
+    done = Future()
+    done.set_result([])
+    monkeypatch.setattr(dns_enum, "collect_subdomains", lambda domain, wordlist=None, **options: done)
+    monkeypatch.setattr(dns_enum, "AXFR_PREVIEW_LIMIT", 3)
+    monkeypatch.setattr(dns_enum, "transfer_zone",
+                        lambda domain, nameservers: zone_transfer.transfer_zone(domain, nameservers,
+                                                                                directory=str(tmp_path)))
+    zone.add("example.com", "NS", "ns1.example.com.")
+    zone.add("ns1.example.com", "A", "192.0.2.53")
+    servers["192.0.2.53"] = ZONE
+
+    results = dns_enum.dns_enumeration("example.com", record_types=["NS"], ct_seeds=False)
+    assert [record["type"] for record in results["AXFR"]] == ["SOA", "NS", "A"]
+    assert results["AXFR Store"][0]["records"] == 7
@@ -0,0 +1,80 @@
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Awaitable, Iterator, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the shared background event loop, starting it on first use.
+
+    The loop runs in a daemon thread so synchronous callers (including
+    Streamlit script threads) can submit coroutines to it, and long-lived
+    resources such as HTTP sessions stay bound to a single loop.
+
+    Returns:
+        The running background event loop
+    """
+    global _loop, _thread
+
+    if _loop is not None and _thread is not None and _thread.is_alive():
+        return _loop
+
+    with _lock:
+        if _loop is None or _thread is None or not _thread.is_alive():
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def run_loop():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(started.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=run_loop, name="osint-async-loop", daemon=True)
+            thread.start()
+            started.wait()
+
+            _loop = loop
+            _thread = thread
+
+    return _loop
+
+def run_coroutine(coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    """
+    Run a coroutine on the background loop and wait for its result.
+
+    Args:
+        coro: Coroutine to execute
+        timeout: Maximum number of seconds to wait, or None to wait forever
+
+    Returns:
+        The value returned by the coroutine
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_loop())
+    return future.result(timeout)
+
+def iterate_async(agen: AsyncIterator[Any]) -> Iterator[Any]:
+    """
+    Iterate an async generator from synchronous code.
+
+    Items are pulled one at a time from the background loop, so a slow
+    consumer applies backpressure instead of letting results pile up.
+    Closing the returned generator early also closes the async generator.
+
+    Args:
+        agen: Async generator to drain
+
+    Returns:
+        Iterator over the items produced by agen
+    """
+    loop = get_loop()
+    try:
+        while True:
+            try:
+                yield asyncio.run_coroutine_threadsafe(agen.__anext__(), loop).result()
+            except StopAsyncIteration:
+                break
+    finally:
+        asyncio.run_coroutine_threadsafe(agen.aclose(), loop).result()
@@ -0,0 +1,29 @@
+import os
+
+# Environment variable that overrides where runtime stores are kept
+CACHE_DIR_ENV = "OSINT_CACHE_DIR"
+
+# Directory name under the platform's per-user cache location
+APP_CACHE_NAME = "osint-dashboard"
+
+def user_cache_dir() -> str:
+    """
+    Directory for runtime stores (result caches, indexes, compiled databases).
+
+    Uses $OSINT_CACHE_DIR when set, otherwise the per-user cache location
+    ($XDG_CACHE_HOME or ~/.cache, %LOCALAPPDATA% on Windows), so stores
+    never land in the working directory or the source tree.
+    """
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return os.path.expanduser(override)
+
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, APP_CACHE_NAME)
+
+def cache_path(*parts: str) -> str:
+    """Path of a store inside user_cache_dir() (the directory is created by the store itself)."""
+    return os.path.join(user_cache_dir(), *parts)
@@ -0,0 +1,204 @@
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import sqlite3
+import string
+import threading
+import time
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+
+from .cache_dir import cache_path
+
+# Where calibrations are persisted between runs
+DEFAULT_CALIBRATION_PATH = cache_path("calibrations.sqlite")
+
+# How long a calibration is trusted before it is re-run
+DEFAULT_CALIBRATION_TTL = 6 * 60 * 60
+
+# Number of body bytes hashed into a fingerprint
+PREFIX_BYTES = 16 * 1024
+
+# Detection methods that benefit from soft-404 calibration
+CALIBRATED_METHODS = ("status_code", "message")
+
+_DIGITS = re.compile(rb"\d+")
+_WHITESPACE = re.compile(rb"\s+")
+# Long opaque tokens (nonces, CSRF tokens, build hashes) change on every request
+_TOKENS = re.compile(rb"[a-z0-9_\-+/=]{24,}")
+
+def random_username(detector, attempts: int = 20) -> Optional[str]:
+    """
+    Generate a random username that certainly does not exist on a platform
+    but still passes the platform's username rules.
+
+    Args:
+        detector: Compiled platform detector
+        attempts: Number of candidates to try
+
+    Returns:
+        A valid random username, or None if none of the candidates are valid
+    """
+    shapes = [
+        (string.ascii_lowercase, 14),
+        (string.ascii_lowercase + string.digits, 12),
+        (string.ascii_lowercase, 8),
+        (string.ascii_lowercase, 5)
+    ]
+    for attempt in range(attempts):
+        alphabet, length = shapes[attempt % len(shapes)]
+        candidate = random.choice(string.ascii_lowercase) + "".join(random.choices(alphabet, k=length - 1))
+        if detector.accepts(candidate):
+            return candidate
+    return None
+
+def length_bucket(content_length: Optional[int]) -> Optional[int]:
+    """Bucket a body length on a log2 scale (None when the length is unknown)."""
+    if content_length is None:
+        return None
+    return int(math.log2(content_length + 1))
+
+def buckets_compatible(first: Optional[int], second: Optional[int]) -> bool:
+    """Check whether two length buckets could belong to the same page (neighbours count)."""
+    if first is None or second is None:
+        return True
+    return abs(first - second) <= 1
+
+def fingerprint(status_code: int, final_url: str, username: str,
+                content_length: Optional[int] = None, prefix: bytes = b"") -> Dict[str, Any]:
+    """
+    Build a cheap fingerprint of a probe response.
+
+    The username is removed from the final URL and body prefix, and digits,
+    whitespace and long tokens are stripped from the prefix, so responses
+    for different missing users produce the same fingerprint.
+
+    Args:
+        status_code: HTTP status of the final response
+        final_url: URL after following redirects
+        username: Username that was probed
+        content_length: Declared body length, if known
+        prefix: First bytes of the body
+
+    Returns:
+        Fingerprint dictionary
+    """
+    parts = urlsplit(final_url)
+    path = parts.path.replace(username, "{username}").replace(username.lower(), "{username}")
+
+    normalized = prefix[:PREFIX_BYTES].lower().replace(username.lower().encode("utf-8"), b"")
+    normalized = _WHITESPACE.sub(b"", _DIGITS.sub(b"", _TOKENS.sub(b"", normalized)))
+
+    return {
+        "status": status_code,
+        "final_url": f"{parts.netloc.lower()}{path}",
+        "length_bucket": length_bucket(content_length),
+        "prefix_hash": hashlib.sha1(normalized).hexdigest()[:16] if prefix else None
+    }
+
+def classify(calibrated: Dict[str, Any], probe: Dict[str, Any]) -> Optional[bool]:
+    """
+    Compare a probe fingerprint with the platform's not-found fingerprint.
+
+    Only the status and final URL are decisive. Body prefixes are never
+    compared here: app-shell sites serve the same first bytes for real and
+    missing profiles, so a matching prefix is left to prefix_matches as a
+    tie-breaker once the detector has run.
+
+    Args:
+        calibrated: Fingerprint recorded for a nonexistent username
+        probe: Fingerprint of the probe response
+
+    Returns:
+        True if the account exists, False if it doesn't, None if the
+        fingerprints can't tell (the detector must decide)
+    """
+    if probe["status"] != calibrated["status"]:
+        # A different status than the not-found page is a strong signal
+        return 200 <= probe["status"] < 300
+
+    if probe["status"] != 200:
+        # Same error status as a missing user
+        return False
+
+    if probe["final_url"] != calibrated["final_url"]:
+        # Missing users redirect somewhere this probe did not go (or vice versa)
+        return True
+
+    return None
+
+def prefix_matches(calibrated: Dict[str, Any], probe: Dict[str, Any]) -> bool:
+    """Check whether a probe's body prefix hashes the same as the not-found page's."""
+    return (
+        probe["prefix_hash"] is not None and probe["prefix_hash"] == calibrated["prefix_hash"]
+        and buckets_compatible(probe["length_bucket"], calibrated["length_bucket"])
+    )
+
+class Calibrator:
+    """Per-platform soft-404 fingerprints with expiry, persisted in SQLite"""
+
+    def __init__(self, path: str = DEFAULT_CALIBRATION_PATH, ttl: int = DEFAULT_CALIBRATION_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS calibrations (
+                platform TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                calibrated_at REAL NOT NULL
+            )
+        """)
+
+        # Load every stored calibration once; the table holds one row per platform
+        for platform, data, calibrated_at in self._conn.execute("SELECT * FROM calibrations"):
+            entry = json.loads(data)
+            entry["calibrated_at"] = calibrated_at
+            self._memory[platform] = entry
+
+    def get(self, platform: str) -> Optional[Dict[str, Any]]:
+        """Get the platform's not-found fingerprint, or None if missing or expired."""
+        entry = self._memory.get(platform)
+        if entry is None or time.time() - entry["calibrated_at"] > self.ttl:
+            return None
+        return entry
+
+    def record(self, platform: str, fp: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a fresh not-found fingerprint for a platform."""
+        entry = dict(fp, calibrated_at=time.time())
+        with self._lock:
+            self._memory[platform] = entry
+            self._conn.execute(
+                "INSERT OR REPLACE INTO calibrations VALUES (?, ?, ?)",
+                (platform, json.dumps(fp), entry["calibrated_at"])
+            )
+        return entry
+
+    def invalidate(self, platform: str) -> None:
+        """Forget a platform's calibration (e.g. after drift) so it is re-run."""
+        with self._lock:
+            self._memory.pop(platform, None)
+            self._conn.execute("DELETE FROM calibrations WHERE platform = ?", (platform,))
+
+_default_calibrator: Optional[Calibrator] = None
+_default_lock = threading.Lock()
+
+def get_calibrator() -> Calibrator:
+    """Get the process-wide calibrator, opening its store on first use."""
+    global _default_calibrator
+
+    if _default_calibrator is None:
+        with _default_lock:
+            if _default_calibrator is None:
+                _default_calibrator = Calibrator()
+    return _default_calibrator
@@ -0,0 +1,252 @@
+import csv
+import json
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Iterable, Iterator, List, Optional, TextIO
+
+from .cache_dir import cache_path
+
+# Where the certificate-transparency name index is kept
+DEFAULT_CT_INDEX_PATH = cache_path("ct_index.sqlite")
+
+# Names buffered before each write to the index
+INGEST_BATCH_SIZE = 10000
+
+# Characters read from a JSON dump at a time
+JSON_CHUNK_SIZE = 1 << 20
+
+# Largest single JSON record buffered before a dump is rejected as corrupt
+MAX_JSON_RECORD_SIZE = 64 << 20
+
+# Record fields that carry certificate hostnames in common CT exports
+# (crt.sh, certstream, Censys/BigQuery-style dumps)
+HOSTNAME_FIELDS = {
+    "name_value", "common_name", "cn", "dns_names", "dns_name", "san", "sans",
+    "subject_alt_names", "subject_alternative_names", "all_domains", "domains"
+}
+
+_HOSTNAME = re.compile(r"^(?=.{1,253}$)([a-z0-9_]([a-z0-9_\-]{0,61}[a-z0-9_])?\.)+[a-z0-9\-]{2,63}$")
+_SEPARATORS = re.compile(r"[\s,;]+")
+
+def reverse_name(hostname: str) -> str:
+    """Index key of a hostname: its labels reversed ("www.example.com" -> "com.example.www")."""
+    return ".".join(reversed(hostname.split(".")))
+
+def normalize_hostname(value: str) -> Optional[str]:
+    """Lowercase a certificate name and strip wildcards; None if it isn't a hostname."""
+    hostname = value.strip().lower().rstrip(".")
+    while hostname.startswith("*."):
+        hostname = hostname[2:]
+    return hostname if _HOSTNAME.match(hostname) else None
+
+def _hostnames_in(value: Any) -> Iterator[str]:
+    """Hostnames in a field value: a string of names, or a list of them."""
+    if isinstance(value, str):
+        for part in _SEPARATORS.split(value):
+            hostname = normalize_hostname(part)
+            if hostname:
+                yield hostname
+    elif isinstance(value, list):
+        for item in value:
+            yield from _hostnames_in(item)
+
+def _hostnames_in_record(record: Any) -> Iterator[str]:
+    """Hostnames from the hostname fields of a (possibly nested) JSON record."""
+    if isinstance(record, list):
+        for item in record:
+            yield from _hostnames_in_record(item)
+    elif isinstance(record, dict):
+        for key, value in record.items():
+            if key.lower() in HOSTNAME_FIELDS:
+                yield from _hostnames_in(value)
+            elif isinstance(value, (dict, list)):
+                yield from _hostnames_in_record(value)
+
+def _json_values(f: TextIO) -> Iterator[Any]:
+    """
+    Stream the top-level values of a JSON dump without loading it.
+
+    Handles both JSON Lines and a single top-level array of records.
+
+    Raises:
+        ValueError: A record grew past MAX_JSON_RECORD_SIZE without parsing,
+            or the dump ends in the middle of a record (truncated or corrupt)
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    in_array = False
+
+    while True:
+        # Skip whitespace and array punctuation between values
+        while position < len(buffer) and (buffer[position].isspace() or buffer[position] in ",]"
+                                          or (buffer[position] == "[" and not in_array)):
+            if buffer[position] == "[":
+                in_array = True
+            position += 1
+
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except ValueError:
+            if len(buffer) - position > MAX_JSON_RECORD_SIZE:
+                raise ValueError(
+                    f"CT dump has a record over {MAX_JSON_RECORD_SIZE >> 20} MiB that doesn't parse; "
+                    "the file is truncated or corrupt"
+                )
+            chunk = f.read(JSON_CHUNK_SIZE)
+            if not chunk:
+                if buffer[position:].strip():
+                    raise ValueError("CT dump ends in the middle of a record; the file is truncated or corrupt")
+                return
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+
+        # A value running into the end of the buffer may be cut short (e.g. a number)
+        if end == len(buffer):
+            chunk = f.read(JSON_CHUNK_SIZE)
+            if chunk:
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+
+        position = end
+        yield value
+
+def read_ct_hostnames(path: str) -> Iterator[str]:
+    """
+    Stream hostnames out of a CT log export in one pass.
+
+    CSV dumps use the columns named like hostname fields (every column
+    if none match); JSON and JSON Lines dumps use hostname fields found
+    at any depth. Wildcards are stripped. Repeats are not removed here;
+    the index ignores them.
+
+    Args:
+        path: CSV, JSON or JSON Lines file
+
+    Returns:
+        Iterator of lowercase hostnames
+    """
+    with open(path, "r", encoding="utf-8", errors="replace", newline="") as f:
+        if path.lower().endswith(".csv"):
+            reader = csv.reader(f)
+            header = next(reader, [])
+            columns = [i for i, name in enumerate(header) if name.strip().lower() in HOSTNAME_FIELDS]
+            if not columns:
+                # Headerless dump: the first row is data too
+                columns = list(range(len(header)))
+                for cell in header:
+                    yield from _hostnames_in(cell)
+            for row in reader:
+                for i in columns:
+                    if i < len(row):
+                        yield from _hostnames_in(row[i])
+        else:
+            for record in _json_values(f):
+                yield from _hostnames_in_record(record)
+
+class CTIndex:
+    """
+    On-disk index of hostnames seen in certificate-transparency logs.
+
+    Names are keyed by their reversed labels, so every known name under
+    a domain sits in one contiguous key range and is found with a single
+    range scan.
+    """
+
+    def __init__(self, path: str = DEFAULT_CT_INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS names (key TEXT PRIMARY KEY) WITHOUT ROWID")
+
+    def add(self, hostnames: Iterable[str]) -> int:
+        """
+        Add hostnames to the index in batches.
+
+        Returns:
+            Number of names that were not indexed before
+        """
+        added = 0
+
+        def write(batch: List[tuple]) -> int:
+            with self._lock, self._conn:
+                before = self._conn.total_changes
+                self._conn.executemany("INSERT OR IGNORE INTO names VALUES (?)", batch)
+                return self._conn.total_changes - before
+
+        batch = []
+        for hostname in hostnames:
+            batch.append((reverse_name(hostname),))
+            if len(batch) >= INGEST_BATCH_SIZE:
+                added += write(batch)
+                batch = []
+        if batch:
+            added += write(batch)
+        return added
+
+    def ingest(self, path: str) -> int:
+        """
+        Index every hostname in a CT log export.
+
+        Args:
+            path: CSV, JSON or JSON Lines dump (see read_ct_hostnames)
+
+        Returns:
+            Number of new names indexed
+        """
+        return self.add(read_ct_hostnames(path))
+
+    def names_under(self, domain: str) -> List[str]:
+        """
+        Every indexed name under a domain (the domain itself excluded).
+
+        Args:
+            domain: Parent domain
+
+        Returns:
+            Sorted list of hostnames
+        """
+        prefix = reverse_name(domain.strip().lower().rstrip(".")) + "."
+        # "/" sorts right after ".", so this range holds exactly the names below the domain
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM names WHERE key >= ? AND key < ? ORDER BY key",
+                (prefix, prefix[:-1] + "/")
+            ).fetchall()
+        return [reverse_name(key) for key, in rows]
+
+    def subdomain_labels(self, domain: str) -> List[str]:
+        """Indexed names under a domain with the domain stripped ("a.b.example.com" -> "a.b")."""
+        suffix = "." + domain.strip().lower().rstrip(".")
+        return [name[:-len(suffix)] for name in self.names_under(domain)]
+
+    def count(self) -> int:
+        """Number of indexed names."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM names").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+_default_index: Optional[CTIndex] = None
+_default_lock = threading.Lock()
+
+def get_ct_index() -> CTIndex:
+    """Get the process-wide CT name index."""
+    global _default_index
+
+    if _default_index is None:
+        with _default_lock:
+            if _default_index is None:
+                _default_index = CTIndex()
+    return _default_index
@@ -0,0 +1,150 @@
+import asyncio
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Set, Union
+
+from .dns_enum import dns_enumeration
+from .rate_limiter import HostRateLimiter
+
+# Domains enumerated at the same time
+DEFAULT_DOMAIN_CONCURRENCY = 8
+
+# DNS queries in flight at once across all domains
+DEFAULT_MAX_WORKERS = 64
+
+# Subdomain probes in flight at once across all domains
+DEFAULT_SUBDOMAIN_CONCURRENCY = 500
+
+# Sustained queries per second sent to any single nameserver
+DEFAULT_NAMESERVER_RATE = 200.0
+
+def read_domains(lines: Iterable[Union[str, bytes]]) -> Iterator[str]:
+    """
+    Lazily read domains from a text or CSV source, one per line.
+
+    Blank lines, lines starting with '#' and repeated domains are skipped,
+    and only the first comma-separated column of each line is used.
+
+    Args:
+        lines: Iterable of lines (e.g. an open file or uploaded file object)
+
+    Returns:
+        Iterator of lowercase domains
+    """
+    seen: Set[str] = set()
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        domain = line.split(",", 1)[0].strip().strip('"').lower().rstrip(".")
+        if domain and not domain.startswith("#") and domain not in seen:
+            seen.add(domain)
+            yield domain
+
+def _failed(row: Dict[str, Any]) -> bool:
+    """Check whether a bulk result row, or any of its record types, carries an error."""
+    if row.get("error"):
+        return True
+    results = row.get("results") or {}
+    return any(
+        isinstance(record, dict) and record.get("error")
+        for records in results.values() if isinstance(records, list)
+        for record in records
+    )
+
+def completed_domains(path: str) -> Set[str]:
+    """
+    Get the domains already finished in a bulk run's JSONL output.
+
+    A line cut short by an interrupted run is ignored, and so is a domain
+    whose enumeration failed or has a record type that ended in an error
+    (e.g. a timeout or SERVFAIL), so those domains are enumerated again on resume.
+
+    Args:
+        path: JSONL file written from dns_enumeration_bulk results
+
+    Returns:
+        Set of finished domains (empty if the file doesn't exist)
+    """
+    done: Set[str] = set()
+    if not os.path.exists(path):
+        return done
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+                domain = row["domain"]
+            except (ValueError, KeyError, TypeError):
+                continue
+            if not _failed(row):
+                done.add(domain)
+    return done
+
+def dns_enumeration_bulk(domains: Iterable[str], record_types: Optional[List[str]] = None,
+                         subdomain_wordlist: Optional[str] = None,
+                         domain_concurrency: int = DEFAULT_DOMAIN_CONCURRENCY,
+                         max_workers: int = DEFAULT_MAX_WORKERS,
+                         subdomain_concurrency: int = DEFAULT_SUBDOMAIN_CONCURRENCY,
+                         nameserver_rate: float = DEFAULT_NAMESERVER_RATE,
+                         completed: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Enumerate many domains, streaming each domain's results as it finishes.
+
+    Several domains run at once and their record queries, follow-up
+    lookups and subdomain probes are pipelined through one shared query
+    pool, one shared subdomain concurrency limit and one per-nameserver
+    rate limiter, so a large portfolio can't flood any single resolver.
+
+    Args:
+        domains: Iterable of domains (e.g. from read_domains)
+        record_types: List of DNS record types to query for every domain
+        subdomain_wordlist: Wordlist file for the subdomain brute force
+        domain_concurrency: Number of domains enumerated at the same time
+        max_workers: DNS queries in flight at once across all domains
+        subdomain_concurrency: Subdomain probes in flight at once across all domains
+        nameserver_rate: Sustained queries per second sent to one nameserver
+        completed: Domains to skip, e.g. completed_domains() of an interrupted run
+
+    Returns:
+        Iterator of {"domain", "results", "error"} dictionaries, in completion order
+    """
+    skip = set(completed or [])
+    pending_domains = (domain for domain in domains if domain not in skip)
+
+    limiter = HostRateLimiter(rate=nameserver_rate, burst=max(1, int(nameserver_rate)))
+    semaphore = asyncio.Semaphore(max(1, subdomain_concurrency))
+    window = max(1, domain_concurrency) * 2
+
+    query_pool = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    domain_pool = ThreadPoolExecutor(max_workers=max(1, domain_concurrency))
+    pending = {}
+
+    def enumerate_domain(domain: str) -> Dict[str, Any]:
+        try:
+            results = dns_enumeration(
+                domain, record_types, subdomain_wordlist=subdomain_wordlist,
+                executor=query_pool, limiter=limiter, subdomain_semaphore=semaphore
+            )
+            return {"domain": domain, "results": results, "error": None}
+        except Exception as e:
+            return {"domain": domain, "results": {}, "error": str(e)}
+
+    try:
+        while True:
+            # Keep a few domains queued so workers never wait on the input
+            for domain in pending_domains:
+                pending[domain_pool.submit(enumerate_domain, domain)] = domain
+                if len(pending) >= window:
+                    break
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                del pending[future]
+                yield future.result()
+    finally:
+        domain_pool.shutdown(wait=False, cancel_futures=True)
+        query_pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,160 @@
+import ipaddress
+import socket
+from typing import Dict, Any, Optional, Union
+
+import dns.exception
+import dns.name
+import dns.rdatatype
+import dns.resolver
+import dns.reversename
+
+from .rate_limiter import HostRateLimiter
+from .resolver_pool import ResolverPool, get_resolver_pool
+from .ttl_cache import TTLCache
+
+# Maximum number of cached answers (positive and negative)
+DEFAULT_MAX_ENTRIES = 50000
+
+# Upper bound on how long any answer is kept, whatever its TTL
+MAX_TTL = 24 * 60 * 60
+
+# Lifetime of negative answers when the response carries no SOA, and their ceiling
+DEFAULT_NEGATIVE_TTL = 5 * 60
+MAX_NEGATIVE_TTL = 60 * 60
+
+def _negative_ttl(error: dns.exception.DNSException) -> float:
+    """Negative-caching TTL from the SOA in an NXDOMAIN/NoAnswer response (RFC 2308)."""
+    try:
+        if isinstance(error, dns.resolver.NXDOMAIN):
+            responses = list(error.responses().values())
+        else:
+            responses = [error.response()]
+    except Exception:
+        return DEFAULT_NEGATIVE_TTL
+
+    for response in responses:
+        for rrset in getattr(response, "authority", []):
+            if rrset.rdtype == dns.rdatatype.SOA:
+                return min(rrset.ttl, rrset[0].minimum, MAX_NEGATIVE_TTL)
+    return DEFAULT_NEGATIVE_TTL
+
+class CachingResolver:
+    """
+    Shared DNS resolver facade that caches answers for their TTL.
+
+    Positive answers live for their record TTL; NXDOMAIN and NoAnswer are
+    cached for the negative TTL from the zone's SOA. Timeouts and server
+    failures are never cached. Memory is bounded by LRU eviction.
+    """
+
+    def __init__(self, resolver: Optional[ResolverPool] = None,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, max_ttl: float = MAX_TTL):
+        """
+        Args:
+            resolver: Upstream pool to query, or None for the process-wide pool
+            max_entries: Maximum number of cached answers
+            max_ttl: Upper bound on how long any answer is kept
+        """
+        self._resolver = resolver
+        self.max_ttl = max_ttl
+        self.cache = TTLCache(max_entries)
+
+    @property
+    def resolver(self) -> ResolverPool:
+        """The upstream pool cache misses are sent to."""
+        return self._resolver or get_resolver_pool()
+
+    def resolve(self, name: Union[str, dns.name.Name], rdtype: Union[str, int] = "A",
+                limiter: Optional[HostRateLimiter] = None) -> dns.resolver.Answer:
+        """
+        Resolve a name, serving the answer from cache while its TTL lasts.
+
+        Args:
+            name: Name to resolve
+            rdtype: Record type (e.g. "A", "MX", "PTR")
+            limiter: Per-upstream rate limiter applied to cache misses
+
+        Returns:
+            The dnspython Answer
+
+        Raises:
+            The same dnspython exceptions as Resolver.resolve; cached
+            NXDOMAIN/NoAnswer results are raised again without a query
+        """
+        rdtype = dns.rdatatype.to_text(dns.rdatatype.from_text(rdtype) if isinstance(rdtype, str) else rdtype)
+        key = (str(name).lower().rstrip("."), rdtype)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            kind, value = cached
+            if kind == "error":
+                raise value.with_traceback(None)
+            return value
+
+        try:
+            answer = self.resolver.resolve(name, rdtype, limiter=limiter)
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer) as e:
+            self.cache.put(key, ("error", e), _negative_ttl(e))
+            raise
+
+        self.cache.put(key, ("answer", answer), min(answer.rrset.ttl, self.max_ttl))
+        return answer
+
+    def gethostbyname(self, host: str) -> str:
+        """
+        Cached replacement for socket.gethostbyname.
+
+        Names that DNS can't resolve fall back to the system resolver (hosts
+        file, search domains), whose verdict is cached for the negative TTL.
+
+        Raises:
+            socket.gaierror if the name does not resolve
+        """
+        try:
+            ipaddress.ip_address(host)
+            return host
+        except ValueError:
+            pass
+
+        try:
+            return self.resolve(host, "A")[0].address
+        except dns.exception.DNSException:
+            pass
+
+        key = (host.lower().rstrip("."), "gethostbyname")
+        cached = self.cache.get(key)
+        if cached is None:
+            try:
+                cached = ("answer", socket.gethostbyname(host))
+            except socket.gaierror as e:
+                cached = ("error", e)
+            self.cache.put(key, cached, DEFAULT_NEGATIVE_TTL)
+
+        kind, value = cached
+        if kind == "error":
+            raise value.with_traceback(None)
+        return value
+
+    def gethostbyaddr(self, ip: str) -> str:
+        """
+        Cached reverse lookup (PTR), replacing socket.gethostbyaddr(ip)[0].
+
+        Raises:
+            socket.herror if the address has no PTR record
+        """
+        try:
+            answer = self.resolve(dns.reversename.from_address(ip), "PTR")
+        except (dns.exception.DNSException, ValueError) as e:
+            raise socket.herror(str(e) or "Host not found")
+        return str(answer[0]).rstrip(".")
+
+    def clear(self) -> None:
+        """Drop every cached answer."""
+        self.cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters and the number of cached answers."""
+        return self.cache.stats()
+
+# Process-wide caching resolver shared by every tool
+dns_cache = CachingResolver()
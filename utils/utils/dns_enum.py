@@ -1,18 +1,196 @@
 import dns.resolver
 import dns.reversename
 import dns.exception
-import socket
-import time
+import asyncio
 import ipaddress
-from typing import Dict, List, Any, Optional
+import itertools
+from contextlib import nullcontext
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional, Tuple
 
-def dns_enumeration(domain: str, record_types: Optional[List[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+from .ct_index import get_ct_index
+from .dns_cache import CachingResolver, dns_cache
+from .rate_limiter import HostRateLimiter
+from .subdomain_bruteforce import COMMON_SUBDOMAINS, collect_subdomains, read_wordlist
+from .zone_transfer import read_zone_records, transfer_zone
+
+# Maximum number of DNS queries in flight during one enumeration
+DEFAULT_MAX_WORKERS = 16
+
+# Zone transfer records included in the results (the rest stay in the zone store)
+AXFR_PREVIEW_LIMIT = 1000
+
+class _QueryPool:
+    """Run DNS queries on a bounded thread pool, sending each distinct (name, type) query once"""
+    
+    def __init__(self, resolver: CachingResolver, executor: ThreadPoolExecutor,
+                 limiter: Optional[HostRateLimiter] = None):
+        self.resolver = resolver
+        self.executor = executor
+        self.limiter = limiter
+        self._futures: Dict[Tuple[str, str], Future] = {}
+    
+    def submit(self, name, record_type: str) -> Future:
+        """Start a query unless the same one is already running or done."""
+        key = (str(name).lower().rstrip("."), record_type)
+        future = self._futures.get(key)
+        if future is None:
+            future = self.executor.submit(self.resolver.resolve, name, record_type, self.limiter)
+            self._futures[key] = future
+        return future
+    
+    def answer(self, name, record_type: str):
+        """Wait for a query's answer; raises the query's exception if it failed."""
+        return self.submit(name, record_type).result()
+
+def _follow_ups(record_type: str, answers) -> List[Tuple[Any, str]]:
+    """Queries needed to annotate a record type's answers (A of MX and NS hosts)"""
+    if record_type == "MX":
+        return [(str(rdata.exchange), "A") for rdata in answers]
+    if record_type == "NS":
+        return [(str(rdata).rstrip("."), "A") for rdata in answers]
+    return []
+
+def _collect_records(record_type: str, future: Future, queries: _QueryPool) -> List[Dict[str, Any]]:
+    """Turn a record type's answer, and its follow-up answers, into result records"""
+    records = []
+    try:
+        answers = future.result()
+        for rdata in answers:
+            if record_type == "A":
+                # reverse_dns is filled in by the reverse-lookup stage
+                records.append({
+                    "value": rdata.address,
+                    "ttl": answers.ttl
+                })
+            
+            elif record_type == "AAAA":
+                records.append({
+                    "value": rdata.address,
+                    "ttl": answers.ttl
+                })
+            
+            elif record_type == "MX":
+                records.append({
+                    "preference": rdata.preference,
+                    "exchange": str(rdata.exchange).rstrip("."),
+                    "ttl": answers.ttl
+                })
+                # IP of the mail server
+                try:
+                    records[-1]["ip"] = queries.answer(str(rdata.exchange), "A")[0].address
+                except:
+                    records[-1]["ip"] = "Not available"
+            
+            elif record_type == "NS":
+                nameserver = str(rdata).rstrip(".")
+                records.append({
+                    "nameserver": nameserver,
+                    "ttl": answers.ttl
+                })
+                # IP of the nameserver
+                try:
+                    records[-1]["ip"] = queries.answer(nameserver, "A")[0].address
+                except:
+                    records[-1]["ip"] = "Not available"
+            
+            elif record_type == "TXT":
+                records.append({
+                    "value": str(rdata).strip('"'),
+                    "ttl": answers.ttl
+                })
+            
+            elif record_type == "CNAME":
+                records.append({
+                    "target": str(rdata).rstrip("."),
+                    "ttl": answers.ttl
+                })
+            
+            elif record_type == "SOA":
+                records.append({
+                    "mname": str(rdata.mname).rstrip("."),
+                    "rname": str(rdata.rname).rstrip("."),
+                    "serial": rdata.serial,
+                    "refresh": rdata.refresh,
+                    "retry": rdata.retry,
+                    "expire": rdata.expire,
+                    "minimum": rdata.minimum,
+                    "ttl": answers.ttl
+                })
+                
+    except dns.resolver.NXDOMAIN:
+        pass
+    except dns.resolver.NoAnswer:
+        pass
+    except dns.exception.Timeout:
+        # Kept as an error so a timeout isn't mistaken for a missing record
+        records.append({
+            "error": "Query timed out"
+        })
+    except Exception as e:
+        records.append({
+            "error": str(e)
+        })
+        
+    return records
+
+def _reverse_lookup(ips: List[str], queries: _QueryPool) -> Dict[str, Optional[str]]:
+    """
+    Resolve the PTR of each IP once, all concurrently.
+    
+    Returns:
+        Mapping of IP to hostname (None when there is no PTR)
+    """
+    futures = {}
+    for ip in ips:
+        try:
+            futures[ip] = queries.submit(dns.reversename.from_address(ip), "PTR")
+        except:
+            futures[ip] = None
+    
+    hostnames = {}
+    for ip, future in futures.items():
+        try:
+            hostnames[ip] = str(future.result()[0]).rstrip(".")
+        except:
+            hostnames[ip] = None
+    return hostnames
+
+def _annotate_reverse_dns(records: List[Dict[str, Any]], ip_field: str, hostnames: Dict[str, Optional[str]]) -> None:
+    """Fan reverse-lookup answers back out to the records carrying an IP."""
+    for record in records:
+        ip = record.get(ip_field)
+        if ip in hostnames:
+            record["reverse_dns"] = hostnames[ip] or "Not available"
+
+def dns_enumeration(domain: str, record_types: Optional[List[str]] = None,
+                    max_workers: int = DEFAULT_MAX_WORKERS,
+                    subdomain_wordlist: Optional[str] = None,
+                    executor: Optional[ThreadPoolExecutor] = None,
+                    limiter: Optional[HostRateLimiter] = None,
+                    subdomain_semaphore: Optional[asyncio.Semaphore] = None,
+                    ct_seeds: bool = True) -> Dict[str, List[Dict[str, Any]]]:
     """
     Perform DNS enumeration on a domain to discover various DNS records.
     
+    All record types are queried concurrently, and follow-up lookups (A of
+    MX and NS hosts) start as soon as the answer they depend on arrives.
+    The subdomain brute force runs alongside, trying names already known
+    from the certificate-transparency index before the wordlist. A single
+    reverse-lookup stage then resolves the PTR of every unique IP from the
+    A, MX, NS and subdomain results once (private addresses are skipped),
+    and fans the hostnames back out to each section.
+    
     Args:
         domain: Domain name to enumerate
         record_types: List of DNS record types to query
+        max_workers: Maximum number of DNS queries in flight at once
+        subdomain_wordlist: Wordlist file for the subdomain brute force
+            (None for the built-in list of common names)
+        executor: Query pool shared with other enumerations (max_workers is then ignored)
+        limiter: Per-nameserver rate limiter for record queries and subdomain probes
+        subdomain_semaphore: Subdomain probe concurrency shared with other enumerations
+        ct_seeds: Seed the brute force with the domain's names from the CT index
         
     Returns:
         Dictionary with record types as keys and lists of records as values
@@ -21,174 +199,105 @@ def dns_enumeration(domain: str, record_types: Optional[List[str]] = None) -> Di
         record_types = ["A", "AAAA", "MX", "NS", "TXT", "CNAME", "SOA"]
     
     results = {}
-    resolver = dns.resolver.Resolver()
-    resolver.timeout = 3
-    resolver.lifetime = 3
     
-    # Function to safely query DNS records
-    def query_records(domain, record_type):
-        records = []
-        try:
-            answers = resolver.resolve(domain, record_type)
-            for rdata in answers:
-                if record_type == "A":
-                    records.append({
-                        "value": rdata.address,
-                        "ttl": answers.ttl
-                    })
-                    # Try reverse DNS lookup
-                    try:
-                        reverse_name = dns.reversename.from_address(rdata.address)
-                        reverse_answers = resolver.resolve(reverse_name, "PTR")
-                        for reverse_data in reverse_answers:
-                            records[-1]["reverse_dns"] = str(reverse_data).rstrip(".")
-                    except:
-                        records[-1]["reverse_dns"] = "Not available"
-                
-                elif record_type == "AAAA":
-                    records.append({
-                        "value": rdata.address,
-                        "ttl": answers.ttl
-                    })
-                
-                elif record_type == "MX":
-                    records.append({
-                        "preference": rdata.preference,
-                        "exchange": str(rdata.exchange).rstrip("."),
-                        "ttl": answers.ttl
-                    })
-                    # Try to get the IP of the mail server
-                    try:
-                        mx_ip = resolver.resolve(str(rdata.exchange), "A")
-                        records[-1]["ip"] = mx_ip[0].address
-                    except:
-                        records[-1]["ip"] = "Not available"
-                
-                elif record_type == "NS":
-                    nameserver = str(rdata).rstrip(".")
-                    records.append({
-                        "nameserver": nameserver,
-                        "ttl": answers.ttl
-                    })
-                    # Try to get the IP of the nameserver
+    pool = ThreadPoolExecutor(max_workers=max(1, max_workers)) if executor is None else nullcontext(executor)
+    with pool as executor:
+        # Queries go through the shared cache, so names seen by other tools are free
+        queries = _QueryPool(dns_cache, executor, limiter)
+        futures = {record_type: queries.submit(domain, record_type) for record_type in record_types}
+        
+        # Names seen in CT logs go first; the brute force drops repeats from the wordlist
+        candidates = subdomain_wordlist
+        known = get_ct_index().subdomain_labels(domain) if ct_seeds else []
+        if known:
+            candidates = itertools.chain(
+                known, read_wordlist(subdomain_wordlist) if subdomain_wordlist else COMMON_SUBDOMAINS
+            )
+        
+        # The brute force resolves on the async loop while the record queries run
+        subdomains_future = collect_subdomains(
+            domain, candidates, limiter=limiter, semaphore=subdomain_semaphore
+        )
+        
+        # Start follow-up lookups as each record type's answer comes in
+        record_type_of = {future: record_type for record_type, future in futures.items()}
+        for future in as_completed(record_type_of):
+            try:
+                answers = future.result()
+            except:
+                continue
+            for name, follow_up_type in _follow_ups(record_type_of[future], answers):
+                queries.submit(name, follow_up_type)
+        
+        # Process each record type
+        for record_type in record_types:
+            results[record_type] = _collect_records(record_type, futures[record_type], queries)
+        
+        subdomains = []
+        for found in subdomains_future.result():
+            for ip in found["ips"]:
+                subdomains.append({
+                    "subdomain": found["subdomain"],
+                    "ip": ip,
+                    "ttl": found["ttl"]
+                })
+        
+        # Reverse-lookup stage: every unique IP is resolved once
+        sections = [
+            (results.get("A", []), "value"),
+            (results.get("MX", []), "ip"),
+            (results.get("NS", []), "ip"),
+            (subdomains, "ip")
+        ]
+        unique_ips = {}
+        for records, ip_field in sections:
+            for record in records:
+                ip = record.get(ip_field)
+                if ip and ip not in unique_ips:
                     try:
-                        ns_ip = resolver.resolve(nameserver, "A")
-                        records[-1]["ip"] = ns_ip[0].address
-                    except:
-                        records[-1]["ip"] = "Not available"
-                
-                elif record_type == "TXT":
-                    records.append({
-                        "value": str(rdata).strip('"'),
-                        "ttl": answers.ttl
-                    })
-                
-                elif record_type == "CNAME":
-                    records.append({
-                        "target": str(rdata).rstrip("."),
-                        "ttl": answers.ttl
-                    })
-                
-                elif record_type == "SOA":
-                    records.append({
-                        "mname": str(rdata.mname).rstrip("."),
-                        "rname": str(rdata.rname).rstrip("."),
-                        "serial": rdata.serial,
-                        "refresh": rdata.refresh,
-                        "retry": rdata.retry,
-                        "expire": rdata.expire,
-                        "minimum": rdata.minimum,
-                        "ttl": answers.ttl
-                    })
-                    
-        except dns.resolver.NXDOMAIN:
-            pass
-        except dns.resolver.NoAnswer:
-            pass
-        except dns.exception.Timeout:
-            pass
-        except Exception as e:
-            records.append({
-                "error": str(e)
-            })
-            
-        return records
-    
-    # Process each record type
-    for record_type in record_types:
-        results[record_type] = query_records(domain, record_type)
+                        unique_ips[ip] = ipaddress.ip_address(ip).is_private
+                    except ValueError:
+                        pass
+        
+        # Private addresses are never sent to public resolvers
+        hostnames = _reverse_lookup([ip for ip, private in unique_ips.items() if not private], queries)
+        hostnames.update({ip: None for ip, private in unique_ips.items() if private})
+        for records, ip_field in sections:
+            _annotate_reverse_dns(records, ip_field, hostnames)
     
-    # Try zone transfer (usually blocked by most servers, but worth trying)
+    # Try zone transfer on all nameservers at once (usually refused, but worth trying)
     if "NS" in results and results["NS"]:
         results["AXFR"] = []
-        for ns_record in results["NS"]:
-            nameserver = ns_record.get("nameserver")
-            if nameserver:
-                try:
-                    xfr = dns.query.xfr(nameserver, domain, timeout=5)
-                    zone = dns.zone.from_xfr(xfr)
-                    for name, node in zone.nodes.items():
-                        for rdataset in node.rdatasets:
-                            for rdata in rdataset:
-                                results["AXFR"].append({
-                                    "name": str(name),
-                                    "type": dns.rdatatype.to_text(rdataset.rdtype),
-                                    "value": str(rdata)
-                                })
-                except:
-                    # Zone transfers are almost always disabled
-                    pass
+        nameservers = [
+            (ns_record["nameserver"], ns_record["ip"])
+            for ns_record in results["NS"]
+            if ns_record.get("nameserver") and ns_record.get("ip") not in (None, "Not available")
+        ]
+        transfer = transfer_zone(domain, nameservers)
+        if transfer:
+            # The full zone stays in its on-disk store; only a preview is returned
+            results["AXFR"] = list(read_zone_records(transfer["store"], AXFR_PREVIEW_LIMIT))
+            results["AXFR Store"] = [transfer]
     
-    # If we found IP addresses, try to get additional information
+    # Additional information about the A record IPs, from the reverse-lookup stage
     if "A" in results and results["A"]:
         results["Additional"] = []
         for a_record in results["A"]:
             ip = a_record.get("value")
-            if ip:
-                # Check if the IP is in a private range
-                try:
-                    if ipaddress.ip_address(ip).is_private:
-                        results["Additional"].append({
-                            "ip": ip,
-                            "info": "Private IP address range"
-                        })
-                        continue
-                except:
-                    pass
-                
-                # Try to get hostname
-                try:
-                    hostname = socket.gethostbyaddr(ip)[0]
-                    results["Additional"].append({
-                        "ip": ip,
-                        "hostname": hostname
-                    })
-                except:
-                    pass
-    
-    # Check common subdomains
-    common_subdomains = [
-        "www", "mail", "ftp", "webmail", "admin", "blog", 
-        "dev", "test", "staging", "api", "vpn", "ns1", "ns2",
-        "smtp", "pop", "imap", "cloud", "mobile", "app",
-        "support", "shop", "portal", "cdn", "secure"
-    ]
-    
-    results["Subdomains"] = []
-    for subdomain in common_subdomains:
-        full_domain = f"{subdomain}.{domain}"
-        try:
-            answers = resolver.resolve(full_domain, "A")
-            for rdata in answers:
-                results["Subdomains"].append({
-                    "subdomain": full_domain,
-                    "ip": rdata.address,
-                    "ttl": answers.ttl
+            if ip not in unique_ips:
+                continue
+            
+            if unique_ips[ip]:
+                results["Additional"].append({
+                    "ip": ip,
+                    "info": "Private IP address range"
                 })
-        except:
-            pass
-        
-        # Don't overload the DNS server
-        time.sleep(0.1)
+            elif hostnames.get(ip):
+                results["Additional"].append({
+                    "ip": ip,
+                    "hostname": hostnames[ip]
+                })
+    
+    results["Subdomains"] = subdomains
     
     return results
@@ -0,0 +1,341 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Any, List, Optional, Set, Tuple
+
+import dns.resolver
+
+from .cache_dir import cache_path
+
+# Where DNS snapshots are persisted between runs
+DEFAULT_HISTORY_PATH = cache_path("dns_history.sqlite")
+
+# Result sections that are not records of the domain itself
+_SKIPPED_SECTIONS = ("Additional", "AXFR", "AXFR Store", "Subdomains")
+
+Record = Tuple[str, str, str]
+
+def snapshot_records(domain: str, results: Dict[str, List[Dict[str, Any]]]) -> Set[Record]:
+    """
+    Flatten dns_enumeration results into comparable (type, name, value) records.
+
+    TTLs and reverse DNS are left out so that only real record changes
+    show up in diffs. Found subdomains become A records of the subdomain.
+
+    Args:
+        domain: Enumerated domain
+        results: Output of dns_enumeration
+
+    Returns:
+        Set of (type, name, value) tuples
+    """
+    domain = domain.strip().lower().rstrip(".")
+    records: Set[Record] = set()
+
+    for record_type, section in results.items():
+        if record_type in _SKIPPED_SECTIONS:
+            continue
+        for record in section:
+            if "error" in record:
+                continue
+            if record_type == "MX":
+                value = f"{record.get('preference')} {record.get('exchange')}"
+            elif record_type == "NS":
+                value = record.get("nameserver")
+            elif record_type == "CNAME":
+                value = record.get("target")
+            elif record_type == "SOA":
+                value = f"{record.get('mname')} {record.get('rname')} {record.get('serial')}"
+            else:
+                value = record.get("value")
+            if value is not None:
+                records.add((record_type, domain, str(value)))
+
+    for found in results.get("Subdomains", []):
+        if found.get("ip"):
+            records.add(("A", found["subdomain"], found["ip"]))
+
+    return records
+
+def answered_keys(domain: str, results: Dict[str, List[Dict[str, Any]]]) -> Set[Tuple[str, str]]:
+    """
+    (type, name) pairs a dns_enumeration run got a clean answer for.
+
+    A record type counts when it was queried and came back without an error
+    entry (records, NXDOMAIN or NoAnswer); a subdomain counts when it was
+    found, since its A records are then complete. Anything else (timeouts,
+    SERVFAIL, types not queried, subdomains the brute force didn't report)
+    says nothing about whether earlier records are gone.
+    """
+    domain = domain.strip().lower().rstrip(".")
+    keys = {
+        (record_type, domain) for record_type, section in results.items()
+        if record_type not in _SKIPPED_SECTIONS and not any("error" in record for record in section)
+    }
+    keys.update(("A", found["subdomain"]) for found in results.get("Subdomains", []) if found.get("ip"))
+    return keys
+
+def _answer_values(record_type: str, answers) -> Set[str]:
+    """Format a dnspython answer like the values in snapshot_records."""
+    values = set()
+    for rdata in answers:
+        if record_type in ("A", "AAAA"):
+            values.add(rdata.address)
+        elif record_type == "MX":
+            values.add(f"{rdata.preference} {str(rdata.exchange).rstrip('.')}")
+        elif record_type == "CNAME":
+            values.add(str(rdata.target).rstrip("."))
+        elif record_type == "SOA":
+            values.add(f"{str(rdata.mname).rstrip('.')} {str(rdata.rname).rstrip('.')} {rdata.serial}")
+        else:
+            values.add(str(rdata).rstrip(".").strip('"'))
+    return values
+
+def _rows(records: Set[Record]) -> List[Dict[str, str]]:
+    return [{"type": t, "name": name, "value": value} for t, name, value in sorted(records)]
+
+class DNSHistory:
+    """
+    Indexed on-disk history of DNS enumeration snapshots.
+
+    Each record is stored once per run of snapshots it was seen in
+    (first_seen/last_seen snapshot ids), so a snapshot that matches the
+    previous one only moves last_seen forward instead of copying every
+    record. Diffs fall out of the same bookkeeping, and an index on the
+    record value answers "which domains ever pointed at this IP" without
+    a scan.
+    """
+
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                id INTEGER PRIMARY KEY,
+                domain TEXT NOT NULL,
+                taken_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS snapshots_domain ON snapshots (domain, id);
+            CREATE TABLE IF NOT EXISTS records (
+                domain TEXT NOT NULL,
+                type TEXT NOT NULL,
+                name TEXT NOT NULL,
+                value TEXT NOT NULL,
+                first_seen INTEGER NOT NULL,
+                last_seen INTEGER NOT NULL,
+                PRIMARY KEY (domain, type, name, value, first_seen)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS records_last_seen ON records (domain, last_seen);
+            CREATE INDEX IF NOT EXISTS records_value ON records (value);
+        """)
+
+    def _snapshot_ids(self, domain: str, snapshot: Optional[int]) -> Tuple[Optional[int], Optional[int]]:
+        """A snapshot of the domain (latest by default) and the one before it."""
+        if snapshot is None:
+            ids = self._conn.execute(
+                "SELECT id FROM snapshots WHERE domain = ? ORDER BY id DESC LIMIT 2", (domain,)
+            ).fetchall()
+        else:
+            ids = self._conn.execute(
+                "SELECT id FROM snapshots WHERE domain = ? AND id <= ? ORDER BY id DESC LIMIT 2",
+                (domain, snapshot)
+            ).fetchall()
+            if ids and ids[0][0] != snapshot:
+                ids = []
+        return (ids[0][0] if ids else None, ids[1][0] if len(ids) > 1 else None)
+
+    def _alive(self, domain: str, snapshot: Optional[int]) -> Set[Record]:
+        """Records present in a snapshot."""
+        if snapshot is None:
+            return set()
+        return set(self._conn.execute(
+            "SELECT type, name, value FROM records WHERE domain = ? AND first_seen <= ? AND last_seen >= ?",
+            (domain, snapshot, snapshot)
+        ))
+
+    def _latest(self, domain: str) -> Tuple[Optional[int], Set[Record]]:
+        """The domain's latest snapshot id and its records."""
+        previous_id, _ = self._snapshot_ids(domain, None)
+        if previous_id is None:
+            return None, set()
+        return previous_id, set(self._conn.execute(
+            "SELECT type, name, value FROM records WHERE domain = ? AND last_seen = ?",
+            (domain, previous_id)
+        ))
+
+    def save_snapshot(self, domain: str, results: Dict[str, List[Dict[str, Any]]],
+                      taken_at: Optional[float] = None,
+                      resolve: Optional[Callable[[str, str], Any]] = None) -> Dict[str, Any]:
+        """
+        Store a dns_enumeration run and diff it against the previous snapshot.
+
+        Only changed records are written; unchanged ones just have their
+        last_seen moved to the new snapshot. A previous record is only
+        reported removed when this run got a clean answer for its type and
+        name (see answered_keys). Others are re-checked with resolve, so
+        just the names that went missing are queried again, and records
+        that still can't be confirmed gone are carried forward.
+
+        Args:
+            domain: Enumerated domain
+            results: Output of dns_enumeration
+            taken_at: Snapshot time (defaults to now)
+            resolve: Called as resolve(name, type) to re-check missing records
+                (e.g. dns_cache.resolve); without it they are carried forward
+
+        Returns:
+            Diff in the same shape as diff()
+        """
+        domain = domain.strip().lower().rstrip(".")
+        current = snapshot_records(domain, results)
+        answered = answered_keys(domain, results)
+
+        with self._lock:
+            _, previous = self._latest(domain)
+
+        # Re-check missing records (outside the lock, this goes to the network)
+        unsettled = {(t, name) for t, name, _ in previous - current if (t, name) not in answered}
+        for record_type, name in sorted(unsettled):
+            if resolve is None:
+                continue
+            try:
+                answers = resolve(name, record_type)
+            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+                answered.add((record_type, name))
+                continue
+            except Exception:
+                continue
+            answered.add((record_type, name))
+            current.update((record_type, name, value) for value in _answer_values(record_type, answers))
+
+        with self._lock, self._conn:
+            previous_id, previous = self._latest(domain)
+            # Records with no clean answer either way are assumed unchanged
+            current |= {record for record in previous - current if (record[0], record[1]) not in answered}
+
+            snapshot_id = self._conn.execute(
+                "INSERT INTO snapshots (domain, taken_at) VALUES (?, ?)",
+                (domain, taken_at if taken_at is not None else time.time())
+            ).lastrowid
+
+            self._conn.executemany(
+                "UPDATE records SET last_seen = ? "
+                "WHERE domain = ? AND type = ? AND name = ? AND value = ? AND last_seen = ?",
+                [(snapshot_id, domain, t, name, value, previous_id) for t, name, value in current & previous]
+            )
+            self._conn.executemany(
+                "INSERT INTO records VALUES (?, ?, ?, ?, ?, ?)",
+                [(domain, t, name, value, snapshot_id, snapshot_id) for t, name, value in current - previous]
+            )
+
+        return {
+            "domain": domain,
+            "snapshot": snapshot_id,
+            "previous": previous_id,
+            "added": _rows(current - previous),
+            "removed": _rows(previous - current)
+        }
+
+    def diff(self, domain: str, snapshot: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Records added and removed in a snapshot, relative to the one before it.
+
+        Args:
+            domain: Domain to diff
+            snapshot: Snapshot id (defaults to the latest)
+
+        Returns:
+            {"domain", "snapshot", "previous", "added", "removed"}, where added
+            and removed are lists of {"type", "name", "value"} sorted by type
+            and name; snapshot is None if the domain has no such snapshot
+        """
+        domain = domain.strip().lower().rstrip(".")
+        with self._lock:
+            snapshot_id, previous_id = self._snapshot_ids(domain, snapshot)
+            if snapshot_id is None:
+                return {"domain": domain, "snapshot": None, "previous": None, "added": [], "removed": []}
+            added = set(self._conn.execute(
+                "SELECT type, name, value FROM records WHERE domain = ? AND first_seen = ?",
+                (domain, snapshot_id)
+            ))
+            removed = set(self._conn.execute(
+                "SELECT type, name, value FROM records WHERE domain = ? AND last_seen = ?",
+                (domain, previous_id)
+            )) if previous_id is not None else set()
+
+        return {
+            "domain": domain,
+            "snapshot": snapshot_id,
+            "previous": previous_id,
+            "added": _rows(added),
+            "removed": _rows(removed)
+        }
+
+    def records(self, domain: str, snapshot: Optional[int] = None) -> List[Dict[str, str]]:
+        """Records of a snapshot (the latest by default)."""
+        domain = domain.strip().lower().rstrip(".")
+        with self._lock:
+            snapshot_id, _ = self._snapshot_ids(domain, snapshot)
+            return _rows(self._alive(domain, snapshot_id))
+
+    def snapshots(self, domain: str) -> List[Dict[str, Any]]:
+        """Every snapshot of a domain, oldest first."""
+        domain = domain.strip().lower().rstrip(".")
+        with self._lock:
+            return [
+                {"snapshot": snapshot_id, "taken_at": taken_at}
+                for snapshot_id, taken_at in self._conn.execute(
+                    "SELECT id, taken_at FROM snapshots WHERE domain = ? ORDER BY id", (domain,)
+                )
+            ]
+
+    def domains_for_ip(self, ip: str) -> List[Dict[str, Any]]:
+        """
+        Every name that ever pointed at an IP, served from the value index.
+
+        Args:
+            ip: IPv4 or IPv6 address
+
+        Returns:
+            List of {"domain", "name", "type", "first_seen", "last_seen"}
+            dictionaries, with snapshot times as Unix timestamps
+        """
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT r.domain, r.name, r.type, MIN(first.taken_at), MAX(last.taken_at)
+                FROM records r
+                JOIN snapshots first ON first.id = r.first_seen
+                JOIN snapshots last ON last.id = r.last_seen
+                WHERE r.value = ? AND r.type IN ('A', 'AAAA')
+                GROUP BY r.domain, r.name, r.type
+                ORDER BY MAX(last.taken_at) DESC
+            """, (ip.strip(),)).fetchall()
+
+        return [
+            {"domain": domain, "name": name, "type": record_type, "first_seen": first_seen, "last_seen": last_seen}
+            for domain, name, record_type, first_seen, last_seen in rows
+        ]
+
+    def close(self) -> None:
+        self._conn.close()
+
+_default_history: Optional[DNSHistory] = None
+_default_lock = threading.Lock()
+
+def get_dns_history() -> DNSHistory:
+    """Get the process-wide DNS history store."""
+    global _default_history
+
+    if _default_history is None:
+        with _default_lock:
+            if _default_history is None:
+                _default_history = DNSHistory()
+    return _default_history
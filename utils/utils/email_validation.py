@@ -0,0 +1,152 @@
+import itertools
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Union
+
+import dns.resolver
+import pandas as pd
+
+from .dns_cache import dns_cache
+
+# Local part, '@', then a dotted domain; the domain is captured
+EMAIL_PATTERN = r"^[^@\s]+@((?:[A-Za-z0-9\-_]+\.)+[A-Za-z0-9\-]+)\.?$"
+_EMAIL_RE = re.compile(EMAIL_PATTERN)
+
+# Number of addresses validated per vectorized pass
+DEFAULT_CHUNK_SIZE = 10000
+
+# Concurrent domain lookups per chunk
+DEFAULT_MAX_WORKERS = 32
+
+# Columns of every result row, in order
+RESULT_FIELDS = ["email", "valid_format", "domain", "domain_exists", "has_mx_records",
+                 "deliverable", "message", "result", "error"]
+
+def email_domain(email: str) -> Optional[str]:
+    """
+    Validate an address's syntax and extract its domain.
+
+    Args:
+        email: Email address
+
+    Returns:
+        Lowercased domain, or None if the address is not syntactically valid
+    """
+    match = _EMAIL_RE.match(email.strip())
+    return match.group(1).lower() if match else None
+
+def lookup_mail_domain(domain: str) -> Dict[str, Any]:
+    """
+    Look up a domain's A and MX records through the shared DNS cache.
+
+    Args:
+        domain: Lowercased email domain
+
+    Returns:
+        Dictionary with domain_exists, has_mx_records and error
+    """
+    info = {"domain_exists": False, "has_mx_records": False, "error": None}
+
+    try:
+        dns_cache.resolve(domain, "A")
+        info["domain_exists"] = True
+    except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+        return info
+    except Exception as e:
+        info["error"] = str(e)
+        return info
+
+    try:
+        info["has_mx_records"] = len(dns_cache.resolve(domain, "MX")) > 0
+    except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.resolver.NoNameservers):
+        pass
+    except Exception as e:
+        info["error"] = str(e)
+
+    return info
+
+def email_result(email: str, domain: Optional[str], info: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build the result row for one address from its domain's lookup result.
+
+    Args:
+        email: Email address as given
+        domain: Domain extracted by the syntax check, or None if invalid
+        info: Lookup result for the domain (ignored when domain is None)
+
+    Returns:
+        Result dictionary with the RESULT_FIELDS keys
+    """
+    result = dict.fromkeys(RESULT_FIELDS)
+    result["email"] = email
+
+    if domain is None:
+        result.update(valid_format=False, deliverable=False, result="Invalid email format")
+        return result
+
+    result.update(valid_format=True, domain=domain, **info)
+    if info["error"]:
+        result["result"] = "Verification error"
+    elif not info["domain_exists"]:
+        result.update(deliverable=False, result="Domain does not exist")
+    elif info["has_mx_records"]:
+        result.update(deliverable=True, result="Email domain has valid MX records")
+    else:
+        result.update(deliverable=False, result="Domain exists but has no mail exchanger")
+    return result
+
+def read_emails(lines: Iterable[Union[str, bytes]]) -> Iterator[str]:
+    """
+    Lazily read email addresses from a text or CSV source, one per line.
+
+    Blank lines and lines starting with '#' are skipped, and only the first
+    comma-separated column of each line is used.
+
+    Args:
+        lines: Iterable of lines (e.g. an open file or uploaded file object)
+
+    Returns:
+        Iterator of stripped addresses
+    """
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        email = line.split(",", 1)[0].strip().strip('"')
+        if email and not email.startswith("#"):
+            yield email
+
+def check_emails_bulk(emails: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      max_workers: int = DEFAULT_MAX_WORKERS) -> Iterator[Dict[str, Any]]:
+    """
+    Validate a large list of email addresses, streaming one result per address.
+
+    Addresses are taken in chunks: syntax is checked for the whole chunk in
+    one vectorized pass, addresses are grouped by domain, and each domain's
+    A and MX records are resolved once (concurrently, and only if they are
+    not already in the shared DNS cache). Results come out in input order.
+
+    Args:
+        emails: Iterable of email addresses (e.g. from read_emails)
+        chunk_size: Number of addresses validated per pass
+        max_workers: Number of concurrent domain lookups
+
+    Returns:
+        Iterator of result dictionaries with the RESULT_FIELDS keys
+    """
+    emails = iter(emails)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        while True:
+            chunk = list(itertools.islice(emails, max(1, chunk_size)))
+            if not chunk:
+                break
+
+            addresses = pd.Series(chunk, dtype="object")
+            domains = addresses.str.strip().str.extract(EMAIL_PATTERN, expand=False).str.lower()
+
+            unique_domains: List[str] = domains.dropna().unique().tolist()
+            lookups = dict(zip(unique_domains, executor.map(lookup_mail_domain, unique_domains)))
+
+            for email, domain in zip(chunk, domains.tolist()):
+                domain = domain if isinstance(domain, str) else None
+                yield email_result(email, domain, lookups.get(domain))
@@ -1,8 +1,9 @@
 import pandas as pd
 import json
 import io
+import csv
 import datetime
-from typing import Dict, Any, List, Union
+from typing import Dict, Any, List, Union, Iterable, IO, Optional
 
 def export_to_csv(data_frame: pd.DataFrame) -> str:
     """
@@ -48,6 +49,51 @@ def export_to_json(data: Union[Dict, List]) -> str:
     # Convert to JSON with pretty formatting and datetime handling
     return json.dumps(data, indent=2, cls=DateTimeEncoder, ensure_ascii=False)
 
+def stream_to_csv(rows: Iterable[Dict[str, Any]], file_obj: IO[str],
+                  fieldnames: Optional[List[str]] = None) -> int:
+    """
+    Write rows to CSV one at a time without collecting them first.
+    
+    Args:
+        rows: Iterable (e.g. generator) of dictionaries to write
+        file_obj: Open text file to write to
+        fieldnames: Column order, or None to use the keys of the first row
+        
+    Returns:
+        Number of rows written
+    """
+    writer = None
+    count = 0
+    
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(file_obj, fieldnames=fieldnames or list(row.keys()), extrasaction="ignore")
+            writer.writeheader()
+        writer.writerow(row)
+        count += 1
+    
+    return count
+
+def stream_to_jsonl(rows: Iterable[Dict[str, Any]], file_obj: IO[str]) -> int:
+    """
+    Write rows as JSON Lines one at a time without collecting them first.
+    
+    Args:
+        rows: Iterable (e.g. generator) of dictionaries to write
+        file_obj: Open text file to write to
+        
+    Returns:
+        Number of rows written
+    """
+    count = 0
+    
+    for row in rows:
+        file_obj.write(json.dumps(row, default=str, ensure_ascii=False))
+        file_obj.write("\n")
+        count += 1
+    
+    return count
+
 def export_to_html(data_frame: pd.DataFrame, title: str = "Exported Data") -> str:
     """
     Export data to HTML format.
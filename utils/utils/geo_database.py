@@ -0,0 +1,440 @@
+import csv
+import hashlib
+import heapq
+import ipaddress
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .cache_dir import cache_path
+from .ip_arrays import parse_ips
+
+# Where compiled databases are kept, one directory per source file version
+DEFAULT_GEODB_CACHE = cache_path("geodb")
+
+# Bumped when compiled arrays change meaning, so older compilations are rebuilt
+COMPILED_FORMAT = 2
+
+# How often the source file is checked for changes, in seconds
+RELOAD_CHECK_INTERVAL = 5.0
+
+# CSV header names understood for each result field
+COLUMN_ALIASES = {
+    "start": ["start", "start_ip", "ip_from", "ip_start", "range_start", "first_ip"],
+    "end": ["end", "end_ip", "ip_to", "ip_end", "range_end", "last_ip"],
+    "network": ["network", "cidr", "prefix"],
+    "country": ["country", "country_name"],
+    "country_code": ["country_code", "countrycode", "country_iso_code", "iso_code", "cc"],
+    "region": ["region", "region_name", "regionname", "subdivision_1_name", "stateprov", "state"],
+    "city": ["city", "city_name"],
+    "zip": ["zip", "zip_code", "postal_code", "postcode"],
+    "lat": ["lat", "latitude"],
+    "lon": ["lon", "lng", "longitude"],
+    "timezone": ["timezone", "time_zone"],
+    "isp": ["isp"],
+    "org": ["org", "organization", "as_organization", "autonomous_system_organization", "as_name"],
+    "as": ["as", "asn", "as_number", "autonomous_system_number"]
+}
+
+# Column layouts of headerless range files (DB-IP lite country, ASN and city), by column count
+HEADERLESS_LAYOUTS = {
+    3: ["start", "end", "country_code"],
+    4: ["start", "end", "as", "org"],
+    8: ["start", "end", None, "country_code", "region", "city", "lat", "lon"]
+}
+
+_FIELDS = ["country", "country_code", "region", "city", "zip", "lat", "lon", "timezone", "isp", "org", "as"]
+
+def _record(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a source row into get_ip_geolocation's result fields."""
+    record = {}
+    for field in _FIELDS:
+        value = values.get(field)
+        if value in (None, ""):
+            continue
+        if field in ("lat", "lon"):
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                continue
+        elif field == "as" and str(value).isdigit():
+            value = f"AS{value}"
+        record[field] = value
+    if "as" in record and "org" in record and " " not in str(record["as"]):
+        record["as"] = f"{record['as']} {record['org']}"
+    return record
+
+def _address(value: str) -> Optional[int]:
+    """A range boundary as an integer: an IP address or a plain decimal number."""
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    try:
+        return int(ipaddress.ip_address(value))
+    except ValueError:
+        return None
+
+def _csv_ranges(path: str) -> Iterator[Tuple[int, int, int, Dict[str, Any]]]:
+    """(version, start, end, record) for each row of a CSV range file."""
+    with open(path, "r", encoding="utf-8", errors="replace", newline="") as f:
+        reader = csv.reader(f)
+        first = next(reader, None)
+        if first is None:
+            return
+
+        if _address(first[0]) is not None:
+            layout = HEADERLESS_LAYOUTS.get(len(first))
+            if layout is None:
+                raise ValueError(f"Unrecognized headerless range file with {len(first)} columns")
+            rows: Iterator[List[str]] = iter([first])
+        else:
+            header = [name.strip().lower() for name in first]
+            layout = [
+                next((field for field, aliases in COLUMN_ALIASES.items() if name in aliases), None)
+                for name in header
+            ]
+            rows = iter([])
+
+        for row in (row for source in (rows, reader) for row in source):
+            values = {field: cell for field, cell in zip(layout, row) if field}
+            if "network" in values:
+                try:
+                    network = ipaddress.ip_network(values["network"].strip(), strict=False)
+                except ValueError:
+                    continue
+                version = network.version
+                start, end = int(network.network_address), int(network.broadcast_address)
+            else:
+                start, end = _address(values.get("start", "")), _address(values.get("end", ""))
+                if start is None or end is None:
+                    continue
+                # Decimal boundaries above the IPv4 space are IPv6
+                version = 6 if ":" in values["start"] or end > 0xFFFFFFFF else 4
+            yield version, start, end, _record(values)
+
+def _mmdb_ranges(path: str) -> Iterator[Tuple[int, int, int, Dict[str, Any]]]:
+    """(version, start, end, record) for each network of a MaxMind DB file."""
+    import maxminddb
+
+    def name(entry: Any) -> Optional[str]:
+        return (entry or {}).get("names", {}).get("en") if isinstance(entry, dict) else None
+
+    with maxminddb.open_database(path) as reader:
+        for network, data in reader:
+            data = data or {}
+            subdivisions = data.get("subdivisions") or [{}]
+            location = data.get("location") or {}
+            values = {
+                "country": name(data.get("country")),
+                "country_code": (data.get("country") or {}).get("iso_code"),
+                "region": name(subdivisions[0]),
+                "city": name(data.get("city")),
+                "zip": (data.get("postal") or {}).get("code"),
+                "lat": location.get("latitude"),
+                "lon": location.get("longitude"),
+                "timezone": location.get("time_zone"),
+                "org": data.get("autonomous_system_organization"),
+                "as": data.get("autonomous_system_number")
+            }
+            yield (network.version, int(network.network_address),
+                   int(network.broadcast_address), _record(values))
+
+def _flatten(rows: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
+    """
+    Resolve overlapping (start, end, record) ranges into disjoint ones.
+
+    Where ranges nest (a /24 inside a /8), the outer range is split around
+    the inner one; wherever ranges overlap, the narrowest range covering
+    that stretch wins (the first listed among identical ones).
+
+    Args:
+        rows: Ranges sorted by start
+
+    Returns:
+        Disjoint ranges sorted by start
+    """
+    if all(rows[i][0] > rows[i - 1][1] for i in range(1, len(rows))):
+        return rows
+
+    # Sweep the points where coverage can change, keeping the open ranges in
+    # a heap by width; expired ranges are dropped once they reach the top
+    boundaries = sorted({row[0] for row in rows} | {row[1] + 1 for row in rows})
+    flat: List[Tuple[int, int, int]] = []
+    active: List[Tuple[int, int, int, int]] = []
+    next_row = 0
+
+    for low, next_low in zip(boundaries, boundaries[1:]):
+        while next_row < len(rows) and rows[next_row][0] <= low:
+            start, end, record_id = rows[next_row]
+            heapq.heappush(active, (end - start, next_row, end, record_id))
+            next_row += 1
+        while active and active[0][2] < low:
+            heapq.heappop(active)
+        if not active:
+            continue
+
+        record_id = active[0][3]
+        if flat and flat[-1][1] == low - 1 and flat[-1][2] == record_id:
+            flat[-1] = (flat[-1][0], next_low - 1, record_id)
+        else:
+            flat.append((low, next_low - 1, record_id))
+
+    return flat
+
+def compile_database(path: str, output_dir: str) -> None:
+    """
+    Compile a CSV range file or MMDB into sorted range arrays on disk.
+
+    IPv4 ranges are stored as uint32 arrays and IPv6 ranges as 16-byte
+    big-endian keys, each with an index into a table of distinct records.
+    Overlapping ranges are split so the most specific one wins.
+
+    Args:
+        path: Source database (.mmdb, or a CSV range file)
+        output_dir: Directory to write the compiled arrays to
+    """
+    ranges = _mmdb_ranges(path) if path.lower().endswith(".mmdb") else _csv_ranges(path)
+
+    records: List[Dict[str, Any]] = []
+    record_ids: Dict[str, int] = {}
+    tables: Dict[int, List[Tuple[int, int, int]]] = {4: [], 6: []}
+
+    for version, start, end, record in ranges:
+        key = json.dumps(record, sort_keys=True)
+        if key not in record_ids:
+            record_ids[key] = len(records)
+            records.append(record)
+        tables[version].append((start, end, record_ids[key]))
+
+    temp_dir = output_dir + ".tmp"
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    os.makedirs(temp_dir)
+
+    for version, rows in tables.items():
+        # Stable on identical ranges, so the first one listed wins
+        rows.sort(key=lambda row: (row[0], row[1]))
+        kept = _flatten(rows)
+
+        if version == 4:
+            starts = np.array([row[0] for row in kept], dtype=np.uint32)
+            ends = np.array([row[1] for row in kept], dtype=np.uint32)
+        else:
+            starts = np.array([row[0].to_bytes(16, "big") for row in kept], dtype="S16")
+            ends = np.array([row[1].to_bytes(16, "big") for row in kept], dtype="S16")
+        np.save(os.path.join(temp_dir, f"v{version}_start.npy"), starts)
+        np.save(os.path.join(temp_dir, f"v{version}_end.npy"), ends)
+        np.save(os.path.join(temp_dir, f"v{version}_record.npy"), np.array([row[2] for row in kept], dtype=np.uint32))
+
+    with open(os.path.join(temp_dir, "records.json"), "w", encoding="utf-8") as f:
+        json.dump(records, f)
+
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.replace(temp_dir, output_dir)
+
+class _Table:
+    """Memory-mapped range arrays of one compiled database"""
+
+    def __init__(self, directory: str):
+        def load(name: str) -> np.ndarray:
+            # A plain ndarray view of the mapping skips np.memmap's per-call overhead
+            return np.asarray(np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r"))
+
+        self.arrays = {
+            version: (load(f"v{version}_start"), load(f"v{version}_end"), load(f"v{version}_record"))
+            for version in (4, 6)
+        }
+        with open(os.path.join(directory, "records.json"), "r", encoding="utf-8") as f:
+            self.records: List[Dict[str, Any]] = json.load(f)
+
+    def find(self, version: int, keys: np.ndarray) -> np.ndarray:
+        """Record index of each key's range, or -1 where no range covers it."""
+        starts, ends, record_ids = self.arrays[version]
+        found = np.full(len(keys), -1, dtype=np.int64)
+        if len(starts) == 0 or len(keys) == 0:
+            return found
+
+        positions = np.searchsorted(starts, keys, side="right") - 1
+        covered = positions >= 0
+        clipped = np.maximum(positions, 0)
+        covered &= keys <= ends[clipped]
+        found[covered] = record_ids[clipped[covered]]
+        return found
+
+    def find_one(self, version: int, key: Any) -> int:
+        """Record index of a single key's range, or -1."""
+        starts, ends, record_ids = self.arrays[version]
+        position = int(starts.searchsorted(key, side="right")) - 1
+        if position < 0 or key > ends[position]:
+            return -1
+        return int(record_ids[position])
+
+class GeoDatabase:
+    """
+    Offline IP geolocation/ASN database with memory-mapped range lookups.
+
+    The source file is compiled once into sorted range arrays under
+    cache_dir and memory-mapped, so loading is instant and the OS shares
+    the pages between processes. Lookups are binary searches; bulk input
+    is parsed and searched with NumPy in one pass. A changed source file
+    is picked up automatically, recompiled in the background while the
+    previous version keeps serving lookups.
+    """
+
+    def __init__(self, path: str, cache_dir: str = DEFAULT_GEODB_CACHE,
+                 reload_interval: float = RELOAD_CHECK_INTERVAL):
+        self.path = path
+        self.cache_dir = cache_dir
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._compile_lock = threading.Lock()
+        self._loader: Optional[threading.Thread] = None
+        self._version: Optional[Tuple[int, int]] = None
+        self._checked = 0.0
+        self._table: Optional[_Table] = None
+        self._directory: Optional[str] = None
+        self.loaded_at: Optional[float] = None
+        self.reload()
+
+    def _compiled_dir(self, version: Tuple[int, int]) -> str:
+        digest = hashlib.sha1(f"{os.path.abspath(self.path)}:{version}:{COMPILED_FORMAT}".encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{os.path.basename(self.path)}-{digest}")
+
+    def _source_version(self) -> Tuple[int, int]:
+        stat = os.stat(self.path)
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def reload(self) -> None:
+        """Load the current version of the source file now, compiling it if needed."""
+        with self._compile_lock:
+            version = self._source_version()
+            if version != self._version:
+                directory = self._compiled_dir(version)
+                if not os.path.exists(os.path.join(directory, "records.json")):
+                    compile_database(self.path, directory)
+                table = _Table(directory)
+
+                with self._lock:
+                    self._table = table
+                    self._version = version
+                    self.loaded_at = time.time()
+
+                # The previous version's arrays are no longer needed
+                if self._directory and self._directory != directory:
+                    shutil.rmtree(self._directory, ignore_errors=True)
+                self._directory = directory
+            self._checked = time.monotonic()
+
+    def _reload_in_background(self) -> None:
+        try:
+            self.reload()
+        except (OSError, ValueError):
+            # Keep serving the last good version while the file is being replaced
+            pass
+        finally:
+            with self._lock:
+                self._loader = None
+
+    def _current(self) -> _Table:
+        """
+        The loaded table.
+
+        A changed source file is compiled on a background thread; lookups
+        keep using the previous version until the new one is swapped in.
+        """
+        if time.monotonic() - self._checked >= self.reload_interval:
+            with self._lock:
+                if self._loader is None and time.monotonic() - self._checked >= self.reload_interval:
+                    self._checked = time.monotonic()
+                    try:
+                        changed = self._source_version() != self._version
+                    except OSError:
+                        changed = False
+                    if changed:
+                        self._loader = threading.Thread(target=self._reload_in_background, daemon=True)
+                        self._loader.start()
+        return self._table
+
+    def lookup(self, ip: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up one IP address.
+
+        Returns:
+            Geolocation fields (as in get_ip_geolocation) plus "ip", or None
+            if the address is invalid or not covered by the database
+        """
+        try:
+            address = ipaddress.ip_address(ip.strip())
+        except ValueError:
+            return None
+
+        table = self._current()
+        key = np.uint32(int(address)) if address.version == 4 else np.bytes_(address.packed)
+        found = table.find_one(address.version, key)
+        return {"ip": str(address), **table.records[found]} if found >= 0 else None
+
+    def lookup_indices(self, ips: Sequence[str]) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+        """
+        Vectorized lookup returning record indices instead of dictionaries.
+
+        Args:
+            ips: IP address strings
+
+        Returns:
+            (indices, records): index into records for each address (-1
+            if invalid or not covered) and the database's record table
+        """
+        table = self._current()
+        found = np.full(len(ips), -1, dtype=np.int64)
+
+        values, is_v4, keys, is_v6 = parse_ips(ips)
+        found[is_v4] = table.find(4, values[is_v4])
+        if is_v6.any():
+            found[is_v6] = table.find(6, keys[is_v6])
+
+        return found, table.records
+
+    def lookup_many(self, ips: Sequence[str]) -> List[Optional[Dict[str, Any]]]:
+        """Look up many IP addresses at once (see lookup)."""
+        found, records = self.lookup_indices(ips)
+        return [
+            {"ip": ip, **records[index]} if index >= 0 else None
+            for ip, index in zip(ips, found.tolist())
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and load time of the current database."""
+        table = self._current()
+        return {
+            "path": self.path,
+            "ipv4_ranges": len(table.arrays[4][0]),
+            "ipv6_ranges": len(table.arrays[6][0]),
+            "records": len(table.records),
+            "loaded_at": self.loaded_at
+        }
+
+_default_database: Optional[GeoDatabase] = None
+_default_lock = threading.Lock()
+
+def configure_geo_database(path: Optional[str]) -> Optional[GeoDatabase]:
+    """
+    Load the process-wide offline database from a file (None to unload it).
+
+    Raises:
+        OSError/ValueError if the file can't be read, ImportError for an
+        MMDB file without the maxminddb package
+    """
+    global _default_database
+
+    database = GeoDatabase(path) if path else None
+    with _default_lock:
+        _default_database = database
+    return database
+
+def get_geo_database() -> Optional[GeoDatabase]:
+    """Get the process-wide offline database, or None if none is configured."""
+    return _default_database
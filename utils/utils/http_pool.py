@@ -0,0 +1,154 @@
+import asyncio
+import atexit
+import threading
+import weakref
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Default pool sizes for each per-host session
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 20
+
+# Defaults for the asyncio sessions used by the bulk engines
+DEFAULT_ASYNC_LIMIT = 500
+DEFAULT_ASYNC_LIMIT_PER_HOST = 8
+
+_sessions: Dict[str, requests.Session] = {}
+_async_sessions: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+_pool_settings = {
+    "pool_connections": DEFAULT_POOL_CONNECTIONS,
+    "pool_maxsize": DEFAULT_POOL_MAXSIZE,
+    "pool_block": False
+}
+
+def configure_pool(pool_connections: Optional[int] = None, pool_maxsize: Optional[int] = None,
+                   pool_block: Optional[bool] = None) -> Dict[str, object]:
+    """
+    Tune the connection pools used by the shared HTTP sessions.
+
+    Existing sessions are closed so that the new sizes take effect on the
+    next request.
+
+    Args:
+        pool_connections: Number of connection pools to cache per session
+        pool_maxsize: Maximum number of connections kept alive per pool
+        pool_block: Whether to block when the pool has no free connections
+
+    Returns:
+        Dictionary with the pool settings now in effect
+    """
+    with _lock:
+        if pool_connections is not None:
+            _pool_settings["pool_connections"] = max(1, int(pool_connections))
+        if pool_maxsize is not None:
+            _pool_settings["pool_maxsize"] = max(1, int(pool_maxsize))
+        if pool_block is not None:
+            _pool_settings["pool_block"] = bool(pool_block)
+
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+        return dict(_pool_settings)
+
+def _host_key(url: str) -> str:
+    """Build the pool key (scheme://host:port) for a URL."""
+    parts = urlsplit(url)
+    scheme = (parts.scheme or "http").lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port or (443 if scheme == "https" else 80)
+    return f"{scheme}://{host}:{port}"
+
+def get_session(url: str) -> requests.Session:
+    """
+    Get the shared keep-alive session for the host of a URL.
+
+    Sessions are created lazily, one per host, and reused across calls and
+    threads so repeated requests skip the TCP/TLS handshake.
+
+    Args:
+        url: Any URL on the target host
+
+    Returns:
+        A requests.Session bound to a pooled HTTPAdapter
+    """
+    key = _host_key(url)
+    session = _sessions.get(key)
+    if session is not None:
+        return session
+
+    with _lock:
+        # Another thread may have created it while we waited
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=_pool_settings["pool_connections"],
+                pool_maxsize=_pool_settings["pool_maxsize"],
+                pool_block=_pool_settings["pool_block"]
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[key] = session
+
+    return session
+
+def close_sessions() -> int:
+    """
+    Close every shared session and drop it from the pool.
+
+    Returns:
+        Number of sessions closed
+    """
+    with _lock:
+        count = len(_sessions)
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+    return count
+
+async def get_async_session(limit: int = DEFAULT_ASYNC_LIMIT,
+                            limit_per_host: int = DEFAULT_ASYNC_LIMIT_PER_HOST):
+    """
+    Get the shared aiohttp session for the running event loop.
+
+    One session (and connection pool) is kept per event loop so keep-alive
+    connections are reused by every coroutine running on that loop. The
+    limits only apply when the session is first created.
+
+    Args:
+        limit: Maximum number of simultaneous connections
+        limit_per_host: Maximum number of simultaneous connections per host
+
+    Returns:
+        An aiohttp.ClientSession bound to the running loop
+    """
+    import aiohttp
+
+    loop = asyncio.get_running_loop()
+    session = _async_sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=limit,
+            limit_per_host=limit_per_host,
+            ttl_dns_cache=300
+        )
+        session = aiohttp.ClientSession(connector=connector)
+        _async_sessions[loop] = session
+    return session
+
+def _close_async_sessions() -> None:
+    """Close aiohttp sessions whose loops are still running at interpreter exit."""
+    for loop, session in list(_async_sessions.items()):
+        if session.closed or not loop.is_running():
+            continue
+        try:
+            asyncio.run_coroutine_threadsafe(session.close(), loop).result(timeout=2)
+        except Exception:
+            pass
+
+atexit.register(_close_async_sessions)
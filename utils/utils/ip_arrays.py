@@ -0,0 +1,227 @@
+import ipaddress
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Longest dotted-quad string ("255.255.255.255")
+_IPV4_WIDTH = 15
+
+# Reserved ranges that can't be geolocated; later entries take precedence
+RESERVED_IPV4 = [
+    (network, "private") for network in (
+        "0.0.0.0/8", "10.0.0.0/8", "172.16.0.0/12", "192.0.0.0/29", "192.0.0.170/31",
+        "192.0.2.0/24", "192.168.0.0/16", "198.18.0.0/15", "198.51.100.0/24",
+        "203.0.113.0/24", "240.0.0.0/4", "255.255.255.255/32"
+    )
+] + [("169.254.0.0/16", "link_local"), ("127.0.0.0/8", "loopback")]
+
+RESERVED_IPV6 = [
+    (network, "private") for network in (
+        "::/128", "100::/64", "2001::/23", "2001:2::/48",
+        "2001:db8::/32", "2001:10::/28", "fc00::/7"
+    )
+] + [("fe80::/10", "link_local"), ("::1/128", "loopback")]
+
+def _bounds(table: List[Tuple[str, str]]) -> List[Tuple[object, object, str]]:
+    """(first, last, kind) of each range, as uint32 or S16 scalars comparable with parsed arrays."""
+    bounds = []
+    for cidr, kind in table:
+        network = ipaddress.ip_network(cidr)
+        if network.version == 4:
+            first, last = np.uint32(int(network.network_address)), np.uint32(int(network.broadcast_address))
+        else:
+            first, last = np.bytes_(network.network_address.packed), np.bytes_(network.broadcast_address.packed)
+        bounds.append((first, last, kind))
+    return bounds
+
+_RESERVED_IPV4_BOUNDS = _bounds(RESERVED_IPV4)
+_RESERVED_IPV6_BOUNDS = _bounds(RESERVED_IPV6)
+
+# IPv4-mapped addresses (::ffff:a.b.c.d) are classified by the IPv4 address they carry
+_IPV4_MAPPED_FIRST, _IPV4_MAPPED_LAST, _ = _bounds([("::ffff:0:0/96", "")])[0]
+
+def parse_ipv4(ips: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse dotted-quad strings into integers with vectorized byte arithmetic.
+
+    The strings are laid out as a fixed-width byte matrix and the octets
+    are accumulated one character position at a time, so a million
+    addresses take a few hundred array operations instead of a million
+    ipaddress objects.
+
+    Args:
+        ips: Address strings (anything that isn't a valid IPv4 address is flagged)
+
+    Returns:
+        (values, valid): uint32 addresses (0 where invalid) and a boolean mask
+    """
+    count = len(ips)
+    if count == 0:
+        return np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=bool)
+
+    try:
+        raw = np.array(ips, dtype=f"S{_IPV4_WIDTH + 1}")
+    except UnicodeEncodeError:
+        raw = np.array([ip.encode("ascii", errors="replace") for ip in ips], dtype=f"S{_IPV4_WIDTH + 1}")
+    chars = raw.view(np.uint8).reshape(count, _IPV4_WIDTH + 1)
+    # Longer strings spill into the last column and are rejected
+    valid = chars[:, _IPV4_WIDTH] == 0
+    # One contiguous row per character position
+    columns = np.ascontiguousarray(chars.T)
+
+    values = np.zeros(count, dtype=np.uint32)
+    octet = np.zeros(count, dtype=np.uint32)
+    digits = np.zeros(count, dtype=np.uint8)
+    dots = np.zeros(count, dtype=np.uint8)
+    ended = np.zeros(count, dtype=bool)
+
+    for column in columns:
+        is_digit = (column >= ord("0")) & (column <= ord("9"))
+        is_dot = column == ord(".")
+        is_end = column == 0
+        valid &= (is_digit | is_dot | is_end) & ~(ended & ~is_end)
+        # Leading zeros are ambiguous (octal to some parsers) and ipaddress rejects them
+        valid &= ~(is_digit & (digits == 1) & (octet == 0))
+
+        # A dot or the end of the string closes the current octet
+        closes = is_dot | (is_end & ~ended)
+        valid &= ~closes | ((digits >= 1) & (digits <= 3) & (octet <= 255))
+        values = np.where(closes, (values << 8) | octet, values)
+        octet = np.where(closes, 0, np.where(is_digit, octet * 10 + (column - ord("0")), octet))
+        digits = np.where(closes, 0, digits + is_digit)
+        dots += is_dot
+        ended |= is_end
+
+    # Full-width strings end without a terminator
+    valid &= ended | ((digits >= 1) & (digits <= 3) & (octet <= 255))
+    values = np.where(ended, values, (values << 8) | octet)
+    valid &= dots == 3
+    values[~valid] = 0
+    return values, valid
+
+def parse_ipv6(ips: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse IPv6 strings into 16-byte big-endian keys.
+
+    Fixed-width byte strings sort in address order, so the keys work with
+    np.searchsorted like integers do. Unlike parse_ipv4 this is a plain
+    per-address loop over ipaddress, so it costs about as much as
+    ipaddress itself; it is only fast when most input is IPv4.
+
+    Args:
+        ips: Address strings (anything that isn't a valid IPv6 address is flagged)
+
+    Returns:
+        (keys, valid): S16 keys (all zero where invalid) and a boolean mask
+    """
+    keys = np.zeros(len(ips), dtype="S16")
+    valid = np.zeros(len(ips), dtype=bool)
+    for i, ip in enumerate(ips):
+        if ":" not in ip:
+            continue
+        try:
+            keys[i] = ipaddress.IPv6Address(ip).packed
+            valid[i] = True
+        except ValueError:
+            pass
+    return keys, valid
+
+def parse_ips(ips: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse a mixed list of IPv4 and IPv6 strings.
+
+    Returns:
+        (v4_values, is_v4, v6_keys, is_v6), each aligned with ips: uint32
+        IPv4 values, 16-byte IPv6 keys, and masks of which parse
+    """
+    values, is_v4 = parse_ipv4(ips)
+    keys = np.zeros(len(ips), dtype="S16")
+    is_v6 = np.zeros(len(ips), dtype=bool)
+
+    rest = np.flatnonzero(~is_v4)
+    if len(rest):
+        rest_keys, rest_valid = parse_ipv6([ips[i] for i in rest])
+        keys[rest] = rest_keys
+        is_v6[rest] = rest_valid
+    return values, is_v4, keys, is_v6
+
+def reserved_kinds(ips: Sequence[str]) -> List[Optional[str]]:
+    """
+    Classify IP addresses against the reserved ranges with vectorized comparisons.
+
+    IPv4-mapped IPv6 addresses (::ffff:10.0.0.1) get the kind of the IPv4
+    address they embed.
+
+    Args:
+        ips: IP address strings
+
+    Returns:
+        "private", "loopback", "link_local" or None (public or invalid) for each address
+    """
+    values, is_v4, keys, is_v6 = parse_ips(ips)
+    kinds = np.full(len(ips), None, dtype=object)
+
+    for first, last, kind in _RESERVED_IPV4_BOUNDS:
+        kinds[is_v4 & (values >= first) & (values <= last)] = kind
+    if is_v6.any():
+        for first, last, kind in _RESERVED_IPV6_BOUNDS:
+            kinds[is_v6 & (keys >= first) & (keys <= last)] = kind
+
+        mapped = is_v6 & (keys >= _IPV4_MAPPED_FIRST) & (keys <= _IPV4_MAPPED_LAST)
+        if mapped.any():
+            # The last four bytes of the key are the embedded IPv4 address
+            embedded = keys.view(np.uint8).reshape(len(keys), 16)[:, 12:].copy()
+            embedded = embedded.view(">u4").reshape(len(keys)).astype(np.uint32)
+            for first, last, kind in _RESERVED_IPV4_BOUNDS:
+                kinds[mapped & (embedded >= first) & (embedded <= last)] = kind
+
+    return kinds.tolist()
+
+def _mask_ipv6(keys: np.ndarray, prefix: int) -> np.ndarray:
+    """Zero every bit of the 16-byte keys past the prefix length."""
+    octets = keys.view(np.uint8).reshape(len(keys), 16).copy()
+    full, bits = divmod(prefix, 8)
+    if full < 16:
+        octets[:, full] &= np.uint8((0xFF << (8 - bits)) & 0xFF)
+        octets[:, full + 1:] = 0
+    return octets.view("S16").reshape(len(keys))
+
+def collapse_prefixes(ips: Sequence[str], ipv4_prefix: int = 24,
+                      ipv6_prefix: int = 48) -> Tuple[List[str], List[str], np.ndarray]:
+    """
+    Group addresses by their covering prefix, so each prefix is looked up once.
+
+    Args:
+        ips: IP address strings
+        ipv4_prefix: Prefix length IPv4 addresses are grouped by
+        ipv6_prefix: Prefix length IPv6 addresses are grouped by
+
+    Returns:
+        (prefixes, representatives, groups): the CIDR of each group, one
+        member address of each group to look up, and each input's group
+        index (-1 for invalid addresses)
+    """
+    values, is_v4, keys, is_v6 = parse_ips(ips)
+    groups = np.full(len(ips), -1, dtype=np.int64)
+    prefixes: List[str] = []
+    representatives: List[str] = []
+
+    for version, valid, masked, prefix in (
+        (4, is_v4, values & np.uint32((0xFFFFFFFF << (32 - ipv4_prefix)) & 0xFFFFFFFF), ipv4_prefix),
+        (6, is_v6, _mask_ipv6(keys, ipv6_prefix), ipv6_prefix)
+    ):
+        members = np.flatnonzero(valid)
+        if not len(members):
+            continue
+        networks, first, inverse = np.unique(masked[members], return_index=True, return_inverse=True)
+        groups[members] = inverse.reshape(-1) + len(prefixes)
+
+        if version == 4:
+            octets = networks.astype(">u4").view(np.uint8).reshape(-1, 4).tolist()
+            prefixes.extend(f"{a}.{b}.{c}.{d}/{prefix}" for a, b, c, d in octets)
+        else:
+            # numpy drops trailing zero bytes from S16 scalars
+            prefixes.extend(f"{ipaddress.IPv6Address(bytes(network).ljust(16, bytes(1)))}/{prefix}" for network in networks)
+        representatives.extend(ips[i] for i in members[first].tolist())
+
+    return prefixes, representatives, groups
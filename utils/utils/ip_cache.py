@@ -0,0 +1,154 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from .cache_dir import cache_path
+from .ttl_cache import TTLCache
+
+# Maximum number of cached lookups kept in memory
+DEFAULT_MAX_ENTRIES = 100000
+
+# Where lookups are persisted when persistence is enabled
+DEFAULT_IP_CACHE_PATH = cache_path("ip_cache.sqlite")
+
+# Lifetimes per kind of lookup: geolocation barely changes, PTR records do
+GEO_TTL = 24 * 60 * 60
+GEO_NEGATIVE_TTL = 60 * 60
+HOSTNAME_TTL = 60 * 60
+HOSTNAME_NEGATIVE_TTL = 15 * 60
+
+# Returned by get() on a miss (None is a valid cached hostname)
+MISSING = object()
+
+class IPCache:
+    """
+    Bounded cache of per-IP lookups (geolocation, reverse DNS) shared by every session.
+
+    Entries live in an in-memory LRU with a TTL per kind of lookup, and
+    can optionally be written through to SQLite so they survive restarts.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, path: Optional[str] = None):
+        """
+        Args:
+            max_entries: Maximum number of lookups kept in memory
+            path: SQLite file to persist lookups to, or None for memory only
+        """
+        self.memory = TTLCache(max_entries)
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.path: Optional[str] = None
+        self.configure_persistence(path)
+
+    def configure_persistence(self, path: Optional[str]) -> None:
+        """Start writing lookups through to a SQLite file, or stop (None)."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self.path = path
+            if not path:
+                return
+
+            directory = os.path.dirname(path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory, exist_ok=True)
+
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS lookups (
+                    kind TEXT NOT NULL,
+                    ip TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (kind, ip)
+                ) WITHOUT ROWID
+            """)
+            self._conn.execute("DELETE FROM lookups WHERE expires_at <= ?", (time.time(),))
+
+    def get(self, kind: str, ip: str) -> Any:
+        """
+        Look up a cached value.
+
+        Args:
+            kind: Kind of lookup ("geo", "hostname")
+            ip: IP address
+
+        Returns:
+            The cached value, or MISSING
+        """
+        value = self.memory.get((kind, ip), MISSING)
+        if value is not MISSING:
+            return value
+
+        # Only a lookup neither tier can answer is a miss
+        with self._lock:
+            if self._conn is None:
+                self.misses += 1
+                return MISSING
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM lookups WHERE kind = ? AND ip = ? AND expires_at > ?",
+                (kind, ip, time.time())
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return MISSING
+            self.disk_hits += 1
+
+        value = json.loads(row[0])
+        self.memory.put((kind, ip), value, row[1] - time.time())
+        return value
+
+    def put(self, kind: str, ip: str, value: Any, ttl: float) -> None:
+        """
+        Store a value for ttl seconds (in memory, and on disk if persistence is on).
+
+        Args:
+            kind: Kind of lookup ("geo", "hostname")
+            ip: IP address
+            value: JSON-serializable value
+            ttl: Lifetime in seconds
+        """
+        self.memory.put((kind, ip), value, ttl)
+        if self._conn is None or ttl <= 0:
+            return
+
+        with self._lock:
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO lookups VALUES (?, ?, ?, ?)",
+                    (kind, ip, json.dumps(value), time.time() + ttl)
+                )
+
+    def clear(self) -> None:
+        """Drop every cached lookup, in memory and on disk."""
+        self.memory.clear()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM lookups")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss/eviction counters, entry counts and the persistence file.
+
+        hits counts lookups answered by either tier (memory_hits plus
+        disk_hits); misses counts lookups neither tier could answer.
+        """
+        stats = self.memory.stats()
+        with self._lock:
+            stats["memory_hits"] = stats["hits"]
+            stats["disk_hits"] = self.disk_hits
+            stats["hits"] = stats["memory_hits"] + self.disk_hits
+            stats["misses"] = self.misses
+        stats["persisted_to"] = self.path
+        return stats
+
+# Process-wide lookup cache shared by every session
+ip_cache = IPCache()
@@ -1,7 +1,44 @@
-import requests
 import socket
 import ipaddress
-from typing import Dict, Any, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, List, Optional
+
+from .dns_cache import dns_cache
+from .geo_database import get_geo_database
+from .http_pool import get_session
+from .ip_arrays import collapse_prefixes, reserved_kinds
+from .ip_cache import GEO_NEGATIVE_TTL, GEO_TTL, HOSTNAME_NEGATIVE_TTL, HOSTNAME_TTL, MISSING, ip_cache
+from .rate_limiter import TokenBucket
+
+# Geolocation provider; point this at a mirror or local stand-in if needed
+IP_API_BASE_URL = "http://ip-api.com"
+
+# Fields requested from ip-api.com
+IP_API_FIELDS = "status,message,country,countryCode,region,regionName,city,zip,lat,lon,timezone,isp,org,as,query"
+
+# The single-IP endpoint allows 45 requests per minute
+single_limiter = TokenBucket(rate=45 / 60, burst=45)
+
+# The batch endpoint takes at most 100 IPs per request, 15 requests per minute
+BATCH_SIZE = 100
+batch_limiter = TokenBucket(rate=15 / 60, burst=15)
+
+# Batch requests and DNS lookups in flight at once
+DEFAULT_MAX_WORKERS = 8
+
+# Prefix lengths sharing one lookup when bulk results are aggregated
+AGGREGATE_IPV4_PREFIX = 24
+AGGREGATE_IPV6_PREFIX = 48
+
+# Offline mode makes no DNS queries, so only IP addresses can be looked up
+OFFLINE_HOSTNAME_ERROR = "Hostnames can't be resolved in offline mode; enter an IP address"
+
+_RESERVED_ERRORS = {
+    "private": "This is a private IP address and cannot be geolocated",
+    "loopback": "This is a loopback address and cannot be geolocated",
+    "link_local": "This is a link-local address and cannot be geolocated"
+}
 
 def is_valid_ip(ip: str) -> bool:
     """
@@ -23,102 +60,272 @@ def get_hostname(ip: str) -> Optional[str]:
     """
     Attempt to get the hostname for an IP address through reverse DNS lookup.
     
+    Answers, including missing PTR records, are kept in the shared IP cache.
+    
     Args:
         ip: IP address to lookup
         
     Returns:
         Hostname if found, None otherwise
     """
+    cached = ip_cache.get("hostname", ip)
+    if cached is not MISSING:
+        return cached
+    
     try:
-        hostname, _, _ = socket.gethostbyaddr(ip)
-        return hostname
+        hostname = dns_cache.gethostbyaddr(ip)
     except (socket.herror, socket.gaierror):
-        return None
+        hostname = None
+    
+    ip_cache.put("hostname", ip, hostname, HOSTNAME_TTL if hostname else HOSTNAME_NEGATIVE_TTL)
+    return hostname
+
+def _format_result(data: Dict[str, Any], ip: str, hostname: Optional[str] = None) -> Dict[str, Any]:
+    """Turn an ip-api.com response record into a geolocation result."""
+    if data.get("status") != "success":
+        return {
+            "ip": ip,
+            "error": data.get("message", "Failed to retrieve geolocation data")
+        }
+    
+    result = {
+        "ip": data.get("query", ip),
+        "country": data.get("country"),
+        "country_code": data.get("countryCode"),
+        "region": data.get("regionName"),
+        "city": data.get("city"),
+        "zip": data.get("zip"),
+        "lat": data.get("lat"),
+        "lon": data.get("lon"),
+        "timezone": data.get("timezone"),
+        "isp": data.get("isp"),
+        "org": data.get("org"),
+        "as": data.get("as")
+    }
+    
+    # Add hostname if available
+    if hostname:
+        result["hostname"] = hostname
+        
+    return result
+
+def _cache_result(ip: str, result: Dict[str, Any]) -> None:
+    """Keep a provider answer (without hostname) in the shared IP cache."""
+    result = {key: value for key, value in result.items() if key != "hostname"}
+    ip_cache.put("geo", ip, result, GEO_NEGATIVE_TTL if "error" in result else GEO_TTL)
 
-def get_ip_geolocation(ip: str) -> Dict[str, Any]:
+def _offline_result(ip: str, record: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Turn an offline database match into a geolocation result."""
+    if record is None:
+        return {"ip": ip, "error": "Not found in the offline geolocation database"}
+    return {**record, "ip": ip, "source": "offline"}
+
+def get_ip_geolocation(ip: str, offline: bool = False) -> Dict[str, Any]:
     """
     Get geolocation data for an IP address.
     
     Args:
         ip: IP address to geolocate
+        offline: Use the local database (see geo_database) instead of
+            ip-api.com; hostnames are rejected rather than resolved, and no
+            reverse DNS lookup is made either
         
     Returns:
         Dictionary containing geolocation information
     """
     # Validate IP address
     if not is_valid_ip(ip):
+        if offline:
+            # Resolving the name would send it to a DNS server
+            return {"error": OFFLINE_HOSTNAME_ERROR}
         try:
             # Try to resolve hostname to IP
-            ip = socket.gethostbyname(ip)
+            ip = dns_cache.gethostbyname(ip)
         except socket.gaierror:
             return {"error": "Invalid IP address or hostname"}
     
-    # Check if IP is in a private range
-    try:
-        ip_obj = ipaddress.ip_address(ip)
-        if ip_obj.is_private:
-            return {
-                "ip": ip,
-                "error": "This is a private IP address and cannot be geolocated",
-                "is_private": True
-            }
-        elif ip_obj.is_loopback:
-            return {
-                "ip": ip,
-                "error": "This is a loopback address and cannot be geolocated",
-                "is_loopback": True
-            }
-        elif ip_obj.is_link_local:
-            return {
-                "ip": ip,
-                "error": "This is a link-local address and cannot be geolocated",
-                "is_link_local": True
-            }
-    except ValueError:
+    # Check if IP is in a private, loopback or link-local range
+    if not is_valid_ip(ip):
         return {"error": "Invalid IP address format"}
+    kind = reserved_kinds([ip])[0]
+    if kind:
+        return {"ip": ip, "error": _RESERVED_ERRORS[kind], f"is_{kind}": True}
+    
+    if offline:
+        database = get_geo_database()
+        if database is None:
+            return {"ip": ip, "error": "No offline geolocation database is loaded"}
+        return _offline_result(ip, database.lookup(ip))
     
     # Try to get hostname
     hostname = get_hostname(ip)
     
+    # Repeat lookups are served from the cache without touching the provider
+    cached = ip_cache.get("geo", ip)
+    if cached is not MISSING:
+        result = dict(cached)
+        if hostname and "error" not in result:
+            result["hostname"] = hostname
+        return result
+    
     # Use ip-api.com for geolocation (free, no API key required for moderate usage)
-    url = f"http://ip-api.com/json/{ip}?fields=status,message,country,countryCode,region,regionName,city,zip,lat,lon,timezone,isp,org,as,query"
+    url = f"{IP_API_BASE_URL}/json/{ip}?fields={IP_API_FIELDS}"
     
     try:
-        response = requests.get(url, timeout=5)
-        data = response.json()
-        
-        if data.get("status") == "success":
-            result = {
-                "ip": data.get("query", ip),
-                "country": data.get("country"),
-                "country_code": data.get("countryCode"),
-                "region": data.get("regionName"),
-                "city": data.get("city"),
-                "zip": data.get("zip"),
-                "lat": data.get("lat"),
-                "lon": data.get("lon"),
-                "timezone": data.get("timezone"),
-                "isp": data.get("isp"),
-                "org": data.get("org"),
-                "as": data.get("as")
-            }
-            
-            # Add hostname if available
-            if hostname:
-                result["hostname"] = hostname
-                
-            return result
-        else:
-            return {
-                "ip": ip,
-                "error": data.get("message", "Failed to retrieve geolocation data")
-            }
+        # Pooled and paced like the batch path, so interactive lookups stay within the provider's limit
+        single_limiter.acquire()
+        response = get_session(url).get(url, timeout=5)
+        response.raise_for_status()
+        result = _format_result(response.json(), ip, hostname)
+        _cache_result(ip, result)
+        return result
     except Exception as e:
         return {
             "ip": ip,
             "error": f"Error retrieving geolocation data: {str(e)}"
         }
 
+def _geolocate_chunk(ips: List[str], base_url: str) -> Dict[str, Dict[str, Any]]:
+    """Geolocate up to BATCH_SIZE public IPs with one batch request."""
+    url = f"{base_url}/batch?fields={IP_API_FIELDS}"
+    
+    for attempt in range(2):
+        batch_limiter.acquire()
+        try:
+            response = get_session(url).post(url, json=ips, timeout=15)
+            if response.status_code == 429 and attempt == 0:
+                # Over the provider's limit; it says how long until the window resets
+                time.sleep(int(response.headers.get("X-Ttl", 60)) + 1)
+                continue
+            response.raise_for_status()
+            # Entries are matched by their "query" field, not position, so a
+            # short or reordered answer can't pin one IP's data on another
+            answered = {}
+            for data in response.json():
+                try:
+                    answered[ipaddress.ip_address(data["query"])] = data
+                except (KeyError, TypeError, ValueError):
+                    continue
+            
+            results = {}
+            for ip in ips:
+                data = answered.get(ipaddress.ip_address(ip))
+                if data is None:
+                    results[ip] = {"ip": ip, "error": "No geolocation data returned for this IP"}
+                    continue
+                results[ip] = _format_result(data, ip)
+                _cache_result(ip, results[ip])
+            return results
+        except Exception as e:
+            error = f"Error retrieving geolocation data: {str(e)}"
+    
+    return {ip: {"ip": ip, "error": error} for ip in ips}
+
+def get_ip_geolocation_batch(targets: Iterable[str], include_hostnames: bool = False,
+                             base_url: Optional[str] = None,
+                             max_workers: int = DEFAULT_MAX_WORKERS,
+                             offline: bool = False, aggregate: bool = False) -> List[Dict[str, Any]]:
+    """
+    Geolocate many IP addresses or hostnames at once.
+    
+    Inputs are deduplicated, hostnames resolved concurrently through the
+    shared DNS cache, and reserved addresses filtered out in one vectorized
+    pass. Public IPs not already in the shared IP cache go to the provider's
+    batch endpoint in chunks of BATCH_SIZE, paced by its rate limit. In
+    offline mode they are looked up in the local database in one vectorized
+    pass instead.
+    
+    With aggregate, addresses are collapsed into /24 (IPv4) and /48 (IPv6)
+    prefixes and only one member of each prefix is sent to the provider;
+    its answer is fanned out to every address in the prefix.
+    
+    Args:
+        targets: IP addresses and/or hostnames
+        include_hostnames: Also resolve the reverse DNS of every public IP
+        base_url: Provider URL (defaults to IP_API_BASE_URL)
+        max_workers: Batch requests and DNS lookups in flight at once
+        offline: Use the local database instead of the provider (hostnames
+            are rejected rather than resolved, and reverse DNS is skipped)
+        aggregate: Geolocate one address per prefix (results gain a "prefix" field)
+        
+    Returns:
+        One result per input, in input order, shaped like get_ip_geolocation's
+        with the original input under "query"
+    """
+    targets = [target.strip() for target in targets]
+    unique = list(dict.fromkeys(target for target in targets if target))
+    base_url = (base_url or IP_API_BASE_URL).rstrip("/")
+    
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        # Resolve hostnames to IPs (never in offline mode, where no query may leave this host)
+        hostnames = [] if offline else [target for target in unique if not is_valid_ip(target)]
+        ip_of = {target: target for target in unique if is_valid_ip(target)}
+        
+        def resolve(host: str) -> Optional[str]:
+            try:
+                return dns_cache.gethostbyname(host)
+            except socket.gaierror:
+                return None
+        
+        for host, ip in zip(hostnames, executor.map(resolve, hostnames)):
+            if ip:
+                ip_of[host] = ip
+        
+        # Filter out reserved addresses in one pass
+        ips = list(dict.fromkeys(ip_of.values()))
+        results: Dict[str, Dict[str, Any]] = {}
+        public = []
+        for ip, kind in zip(ips, reserved_kinds(ips)):
+            if kind:
+                results[ip] = {"ip": ip, "error": _RESERVED_ERRORS[kind], f"is_{kind}": True}
+            else:
+                public.append(ip)
+        
+        if offline:
+            database = get_geo_database()
+            if database is None:
+                results.update({ip: {"ip": ip, "error": "No offline geolocation database is loaded"} for ip in public})
+            else:
+                results.update({ip: _offline_result(ip, record) for ip, record in zip(public, database.lookup_many(public))})
+        else:
+            lookups = public
+            if aggregate:
+                prefixes, lookups, groups = collapse_prefixes(public, AGGREGATE_IPV4_PREFIX, AGGREGATE_IPV6_PREFIX)
+            
+            # Only cache misses are sent to the provider
+            misses = []
+            for ip in lookups:
+                cached = ip_cache.get("geo", ip)
+                if cached is MISSING:
+                    misses.append(ip)
+                else:
+                    results[ip] = dict(cached)
+            
+            chunks = [misses[i:i + BATCH_SIZE] for i in range(0, len(misses), BATCH_SIZE)]
+            for chunk_results in executor.map(lambda chunk: _geolocate_chunk(chunk, base_url), chunks):
+                results.update(chunk_results)
+            
+            if aggregate:
+                # Fan each prefix's answer out to all of its addresses
+                for ip, group in zip(public, groups.tolist()):
+                    results[ip] = {**results[lookups[group]], "ip": ip, "prefix": prefixes[group]}
+        
+        if include_hostnames and not offline:
+            located = [ip for ip in public if "error" not in results[ip]]
+            for ip, hostname in zip(located, executor.map(get_hostname, located)):
+                if hostname:
+                    results[ip]["hostname"] = hostname
+    
+    output = []
+    for target in targets:
+        if target in ip_of:
+            output.append({"query": target, **results[ip_of[target]]})
+        elif offline and target:
+            output.append({"query": target, "error": OFFLINE_HOSTNAME_ERROR})
+        else:
+            output.append({"query": target, "error": "Invalid IP address or hostname"})
+    return output
+
 def get_additional_ip_info(ip: str) -> Dict[str, Any]:
     """
     Get additional information about an IP address, such as threat intelligence data.
@@ -0,0 +1,183 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Any, Optional
+
+# Result error for probes skipped by an open circuit
+SKIPPED_UNHEALTHY = "skipped (unhealthy)"
+
+# Timeout used until a platform has enough latency samples, and the ceiling afterwards
+DEFAULT_TIMEOUT = 5.0
+MIN_TIMEOUT = 1.5
+
+# The adaptive timeout is this multiple of the observed p99 latency
+TIMEOUT_FACTOR = 2.0
+
+# Number of recent probes kept per platform
+DEFAULT_WINDOW = 100
+
+# Minimum samples before percentiles and error rates are trusted
+MIN_SAMPLES = 20
+
+# The circuit opens on this many failures in a row, or this error rate over the window
+CONSECUTIVE_FAILURES = 5
+ERROR_RATE_THRESHOLD = 0.5
+
+# How long an open circuit skips the platform before a trial probe is let through
+DEFAULT_COOLDOWN = 5 * 60
+
+# Statuses that mean the platform is throttling or failing rather than answering
+FAILURE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+def percentile(sorted_values, fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted sequence (None when empty)."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+class _PlatformState:
+    """Rolling probe outcomes and circuit state for one platform"""
+
+    def __init__(self, window: int):
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_started: Optional[float] = None
+        self.p99: Optional[float] = None
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return 1.0 - sum(self.outcomes) / len(self.outcomes)
+
+class PlatformHealth:
+    """
+    Per-platform latency and error tracking with a circuit breaker.
+
+    Each probe's latency (to response headers) and outcome feed a rolling
+    window per platform. The window drives the platform's request timeout
+    (a multiple of the observed p99) and its circuit: after repeated
+    failures the platform is skipped for a cooldown, then a single trial
+    probe decides whether it is healthy again.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW, cooldown: float = DEFAULT_COOLDOWN,
+                 default_timeout: float = DEFAULT_TIMEOUT, min_timeout: float = MIN_TIMEOUT,
+                 timeout_factor: float = TIMEOUT_FACTOR):
+        self.window = window
+        self.cooldown = cooldown
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.timeout_factor = timeout_factor
+        self._states: Dict[str, _PlatformState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, platform: str) -> _PlatformState:
+        state = self._states.get(platform)
+        if state is None:
+            state = self._states.setdefault(platform, _PlatformState(self.window))
+        return state
+
+    def allow(self, platform: str) -> bool:
+        """
+        Check whether a platform may be probed right now.
+
+        Args:
+            platform: Platform name
+
+        Returns:
+            False while the platform's circuit is open; after the cooldown,
+            True for one trial probe at a time
+        """
+        with self._lock:
+            state = self._state(platform)
+            if state.opened_at is None:
+                return True
+
+            now = time.monotonic()
+            if now - state.opened_at < self.cooldown:
+                return False
+
+            # A trial that never reported back (e.g. cancelled) doesn't block forever
+            if state.trial_started is not None and now - state.trial_started < 2 * self.default_timeout:
+                return False
+
+            state.trial_started = now
+            return True
+
+    def timeout(self, platform: str) -> float:
+        """Get the request timeout for a platform from its observed p99 latency."""
+        with self._lock:
+            p99 = self._state(platform).p99
+        if p99 is None:
+            return self.default_timeout
+        return min(self.default_timeout, max(self.min_timeout, p99 * self.timeout_factor))
+
+    def record(self, platform: str, latency: Optional[float], status_code: Optional[int] = None) -> None:
+        """
+        Record a probe's outcome.
+
+        Args:
+            platform: Platform name
+            latency: Seconds until response headers arrived, or None if the request failed
+            status_code: HTTP status of the response, if any
+        """
+        ok = latency is not None and status_code not in FAILURE_STATUSES
+
+        with self._lock:
+            state = self._state(platform)
+            state.outcomes.append(ok)
+
+            if latency is not None:
+                state.latencies.append(latency)
+                if len(state.latencies) >= MIN_SAMPLES:
+                    state.p99 = percentile(sorted(state.latencies), 0.99)
+
+            if ok:
+                state.consecutive_failures = 0
+                if state.opened_at is not None and state.trial_started is not None:
+                    # Trial probe succeeded: close the circuit with a clean slate
+                    state.opened_at = None
+                    state.trial_started = None
+                    state.outcomes.clear()
+                    state.outcomes.append(True)
+                return
+
+            state.consecutive_failures += 1
+            tripped = (
+                state.consecutive_failures >= CONSECUTIVE_FAILURES
+                or (len(state.outcomes) >= MIN_SAMPLES and state.error_rate >= ERROR_RATE_THRESHOLD)
+            )
+            if tripped or state.trial_started is not None:
+                state.opened_at = time.monotonic()
+                state.trial_started = None
+
+    def reset(self, platform: Optional[str] = None) -> None:
+        """Forget the history of one platform (or of every platform)."""
+        with self._lock:
+            if platform is None:
+                self._states.clear()
+            else:
+                self._states.pop(platform, None)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get latency percentiles, error rate and circuit state for every tracked platform."""
+        with self._lock:
+            snapshot = {}
+            for platform, state in self._states.items():
+                latencies = sorted(state.latencies)
+                snapshot[platform] = {
+                    "samples": len(state.outcomes),
+                    "p50": percentile(latencies, 0.5),
+                    "p99": percentile(latencies, 0.99),
+                    "error_rate": state.error_rate,
+                    "open": state.opened_at is not None
+                }
+            return snapshot
+
+# Process-wide health tracker shared by every checker
+platform_health = PlatformHealth()
@@ -0,0 +1,284 @@
+import codecs
+import json
+import os
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Pattern, Tuple, Union
+
+# Bundled platform definitions
+DEFAULT_REGISTRY_PATH = os.path.join(os.path.dirname(__file__), "data", "platforms.json")
+
+# Supported detection methods
+DETECTION_METHODS = ("status_code", "message", "response_url", "json_field")
+
+class StreamingMatcher:
+    """Incrementally search streamed body chunks for any of a platform's error messages
+
+    Bytes patterns are searched in the raw chunks. Text patterns (used when
+    a message isn't ASCII, which bytes matching can't case-fold) are searched
+    in the chunks decoded with the response charset and lowercased.
+    """
+
+    def __init__(self, pattern: Pattern, overlap: int, max_bytes: int, encoding: Optional[str] = None):
+        self.pattern = pattern
+        self.overlap = overlap
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+        self.matched = False
+        self._decoder = None
+        self._tail: Union[bytes, str] = b""
+
+        if isinstance(pattern.pattern, str):
+            try:
+                factory = codecs.getincrementaldecoder(encoding or "utf-8")
+            except LookupError:
+                factory = codecs.getincrementaldecoder("utf-8")
+            self._decoder = factory(errors="replace")
+            self._tail = ""
+
+    def feed(self, chunk: bytes) -> bool:
+        """Scan the next chunk; returns True once a verdict is reached
+
+        A verdict is reached when an error message matches or the byte cap
+        is hit. The tail of each chunk is carried over so messages split
+        across chunk boundaries are still found.
+        """
+        remaining = self.max_bytes - self.bytes_read
+        chunk = chunk[:remaining]
+        self.bytes_read += len(chunk)
+        if self._decoder is not None:
+            chunk = self._decoder.decode(chunk, final=self.bytes_read >= self.max_bytes).lower()
+
+        window = self._tail + chunk
+        if self.pattern.search(window):
+            self.matched = True
+            return True
+
+        self._tail = window[-self.overlap:] if self.overlap else window[:0]
+        return self.bytes_read >= self.max_bytes
+
+class JsonFieldReader:
+    """Collect a (capped) JSON body and look up a dotted field path in it"""
+
+    def __init__(self, path: Tuple[Union[str, int], ...], max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+        self._chunks: List[bytes] = []
+
+    def feed(self, chunk: bytes) -> bool:
+        """Buffer the next chunk; returns True once the byte cap is hit"""
+        chunk = chunk[:self.max_bytes - self.bytes_read]
+        self.bytes_read += len(chunk)
+        self._chunks.append(chunk)
+        return self.bytes_read >= self.max_bytes
+
+    def found(self) -> bool:
+        """Check whether the field path resolves to a non-empty value"""
+        try:
+            value = json.loads(b"".join(self._chunks))
+        except ValueError:
+            return False
+
+        for key in self.path:
+            try:
+                value = value[key]
+            except (KeyError, IndexError, TypeError):
+                return False
+
+        return value not in (None, "", [], {})
+
+class Detector:
+    """Compiled detection rules for one platform"""
+
+    def __init__(self, name: str, definition: Dict[str, Any], default_regex: Optional[str]):
+        self.name = name
+        self.method = definition.get("detection", "message" if definition.get("error_msg") else "status_code")
+        if self.method not in DETECTION_METHODS:
+            raise ValueError(f"Unknown detection method for {name}: {self.method}")
+
+        self.url = definition["url"]
+        self.probe_url = definition.get("probe_url", self.url)
+        self.error_codes = frozenset(definition.get("error_codes", []))
+
+        regex = definition.get("regex", default_regex)
+        self.username_pattern = re.compile(regex) if regex else None
+
+        # Error messages are matched as one case-insensitive alternation: on the
+        # raw bytes when they are all ASCII, otherwise on lowercased decoded text
+        messages = definition.get("error_msg", [])
+        if messages and all(m.isascii() for m in messages):
+            self.message_pattern = re.compile(b"|".join(re.escape(m.encode("ascii")) for m in messages), re.IGNORECASE)
+            self.overlap = max(len(m) for m in messages) - 1
+        elif messages:
+            lowered = [m.lower() for m in messages]
+            self.message_pattern = re.compile("|".join(re.escape(m) for m in lowered))
+            self.overlap = max(len(m) for m in lowered) - 1
+        else:
+            self.message_pattern = None
+            self.overlap = 0
+
+        error_url = definition.get("error_url")
+        self.error_url = re.compile(error_url) if error_url else None
+
+        self.json_path = tuple(
+            int(part) if part.isdigit() else part
+            for part in definition.get("json_field", "").split(".") if part
+        )
+
+    def accepts(self, username: str) -> bool:
+        """Check the username against the platform's username rules."""
+        return self.username_pattern is None or self.username_pattern.fullmatch(username) is not None
+
+    def request_url(self, username: str) -> str:
+        """URL to send the probe to (an API endpoint for some platforms)."""
+        return self.probe_url.format(username=username)
+
+    def body_reader(self, status_code: int, max_bytes: int, encoding: Optional[str] = None):
+        """Get a reader for the response body, or None if the verdict needs no body.
+
+        The encoding (the response charset) is used to decode bodies for
+        messages that can't be matched as bytes.
+        """
+        if status_code != 200:
+            return None
+        if self.method == "message" and self.message_pattern is not None:
+            return StreamingMatcher(self.message_pattern, self.overlap, max_bytes, encoding)
+        if self.method == "json_field":
+            return JsonFieldReader(self.json_path, max_bytes)
+        return None
+
+    def exists(self, status_code: int, final_url: str, reader=None) -> bool:
+        """
+        Decide whether the account exists.
+
+        Args:
+            status_code: HTTP status of the final response
+            final_url: URL after following redirects
+            reader: Body reader returned by body_reader, after feeding it
+
+        Returns:
+            True if the account appears to exist
+        """
+        if self.method == "status_code":
+            return 200 <= status_code < 300 and status_code not in self.error_codes
+
+        if status_code != 200:
+            return False
+
+        if self.method == "response_url":
+            return self.error_url is None or self.error_url.search(final_url) is None
+
+        if self.method == "json_field":
+            return reader is not None and reader.found()
+
+        return reader is None or not reader.matched
+
+class PlatformRegistry:
+    """Platform definitions loaded from a versioned data file"""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.version = data.get("version")
+        defaults = data.get("defaults", {})
+        self.default_regex = defaults.get("regex")
+
+        self.platforms: Dict[str, Dict[str, Any]] = {}
+        for name, definition in data["platforms"].items():
+            entry = {"username_only": True, "error_msg": [], "tags": [], "category": "Other"}
+            entry.update(definition)
+            self.platforms[name] = entry
+
+        # Platforms that can be probed with a bare username, in file order
+        self.names = [name for name, entry in self.platforms.items() if entry.get("username_only", False)]
+
+        self._detectors: Dict[str, Detector] = {}
+        self._tag_index: Optional[Dict[str, List[str]]] = None
+        self._category_index: Optional[Dict[str, List[str]]] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_REGISTRY_PATH) -> "PlatformRegistry":
+        """Load a registry from a JSON data file."""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def detector(self, name: str) -> Detector:
+        """Get the compiled detector for a platform, compiling it on first use."""
+        detector = self._detectors.get(name)
+        if detector is None:
+            detector = Detector(name, self.platforms[name], self.default_regex)
+            self._detectors[name] = detector
+        return detector
+
+    def _build_indexes(self) -> None:
+        with self._lock:
+            if self._tag_index is not None:
+                return
+
+            tag_index: Dict[str, List[str]] = {}
+            category_index: Dict[str, List[str]] = {}
+            for name in self.names:
+                entry = self.platforms[name]
+                for tag in entry.get("tags", []):
+                    tag_index.setdefault(tag.lower(), []).append(name)
+                category_index.setdefault(entry.get("category", "Other").lower(), []).append(name)
+
+            self._category_index = category_index
+            self._tag_index = tag_index
+
+    def tags(self) -> List[str]:
+        """All tags used by the registry."""
+        self._build_indexes()
+        return sorted(self._tag_index)
+
+    def categories(self) -> List[str]:
+        """All categories used by the registry."""
+        self._build_indexes()
+        return sorted({self.platforms[name].get("category", "Other") for name in self.names})
+
+    def select(self, names: Optional[List[str]] = None, tags: Optional[List[str]] = None,
+               categories: Optional[List[str]] = None) -> List[str]:
+        """
+        Select platforms by name, tag and/or category.
+
+        Explicit names are combined with the platforms matching any of the
+        given tags or categories. With no filters, every platform is selected.
+
+        Args:
+            names: Platform names
+            tags: Platform tags (e.g. "fediverse", "coding")
+            categories: Platform categories (e.g. "Gaming")
+
+        Returns:
+            List of platform names without duplicates
+        """
+        if not names and not tags and not categories:
+            return list(self.names)
+
+        selected: Dict[str, None] = {}
+        for name in names or []:
+            if name in self.platforms and self.platforms[name].get("username_only", False):
+                selected[name] = None
+
+        if tags or categories:
+            self._build_indexes()
+            for tag in tags or []:
+                selected.update(dict.fromkeys(self._tag_index.get(tag.lower(), [])))
+            for category in categories or []:
+                selected.update(dict.fromkeys(self._category_index.get(category.lower(), [])))
+
+        return list(selected)
+
+@lru_cache(maxsize=None)
+def get_registry(path: str = DEFAULT_REGISTRY_PATH) -> PlatformRegistry:
+    """
+    Get the process-wide registry for a data file, loading it once.
+
+    Args:
+        path: Platform definitions file
+
+    Returns:
+        The loaded PlatformRegistry
+    """
+    return PlatformRegistry.load(path)
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+# Default pacing per host: sustained requests per second and burst size
+DEFAULT_RATE = 1.0
+DEFAULT_BURST = 3
+
+class TokenBucket:
+    """Thread-safe token bucket that hands out delays instead of blocking"""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        self.rate = max(float(rate), 1e-6)
+        self.burst = max(int(burst), 1)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens from the bucket, going into debt if it is empty.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Number of seconds the caller must wait before proceeding
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= tokens
+
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block the calling thread until the tokens are available."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """Wait on the event loop until the tokens are available."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+class HostRateLimiter:
+    """Token buckets keyed by host, with optional per-host rate overrides"""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST,
+                 overrides: Optional[Dict[str, Tuple[float, int]]] = None):
+        self.rate = rate
+        self.burst = burst
+        self.overrides = {host.lower(): limits for host, limits in (overrides or {}).items()}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, host: Optional[str] = None, rate: Optional[float] = None,
+                  burst: Optional[int] = None) -> None:
+        """
+        Change the pacing for one host, or the defaults when no host is given.
+
+        Args:
+            host: Host to configure, or None for the default rate and burst
+            rate: Sustained requests per second
+            burst: Number of requests allowed back to back
+        """
+        with self._lock:
+            if host is None:
+                self.rate = rate if rate is not None else self.rate
+                self.burst = burst if burst is not None else self.burst
+                # Drop buckets so they pick up the new defaults
+                self._buckets = {h: b for h, b in self._buckets.items() if h in self.overrides}
+            else:
+                host = host.lower()
+                current = self.overrides.get(host, (self.rate, self.burst))
+                self.overrides[host] = (
+                    rate if rate is not None else current[0],
+                    burst if burst is not None else current[1]
+                )
+                self._buckets.pop(host, None)
+
+    def bucket(self, host: str) -> TokenBucket:
+        """Get (or create) the token bucket for a host."""
+        host = (host or "").lower()
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(host)
+                if bucket is None:
+                    rate, burst = self.overrides.get(host, (self.rate, self.burst))
+                    bucket = TokenBucket(rate, burst)
+                    self._buckets[host] = bucket
+        return bucket
+
+    def acquire(self, host: str) -> float:
+        """Block until a request to host is allowed; returns the time waited."""
+        return self.bucket(host).acquire()
+
+    async def acquire_async(self, host: str) -> float:
+        """Await until a request to host is allowed; returns the time waited."""
+        return await self.bucket(host).acquire_async()
+
+# Shared limiter for requests to username platforms
+platform_limiter = HostRateLimiter()
@@ -0,0 +1,278 @@
+import random
+import string
+import threading
+import time
+from typing import Dict, Any, List, Optional, Set, Union
+
+import dns.asyncresolver
+import dns.exception
+import dns.name
+import dns.resolver
+
+from .rate_limiter import HostRateLimiter
+
+# Used when the system resolver configuration can't be read
+FALLBACK_NAMESERVERS = ["1.1.1.1", "8.8.8.8", "9.9.9.9"]
+
+# Per-query timeout (seconds) for one upstream
+DEFAULT_TIMEOUT = 2.0
+
+# Upstreams tried per query before giving up
+DEFAULT_ATTEMPTS = 3
+
+# Weight of the newest sample in the latency average
+LATENCY_ALPHA = 0.2
+
+# Failures in a row that demote an upstream, and for how long
+FAILURE_LIMIT = 3
+FAILURE_COOLDOWN = 60.0
+
+# How long an upstream that answers for nonexistent names is shunned
+LIAR_COOLDOWN = 60 * 60.0
+
+# How often upstreams are re-checked for NXDOMAIN hijacking
+VERIFY_INTERVAL = 60 * 60.0
+
+# Outcomes that are a valid answer from the upstream, even if negative
+_ANSWERED = (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.resolver.YXDOMAIN)
+
+def system_nameservers() -> List[str]:
+    """Nameservers from the system resolver configuration (or public fallbacks)."""
+    try:
+        return list(dns.resolver.Resolver().nameservers) or FALLBACK_NAMESERVERS
+    except Exception:
+        return FALLBACK_NAMESERVERS
+
+class Upstream:
+    """One upstream resolver and its health score"""
+
+    def __init__(self, nameserver, timeout: float):
+        self.key = str(nameserver)
+        self.resolver = dns.resolver.Resolver(configure=False)
+        self.async_resolver = dns.asyncresolver.Resolver(configure=False)
+        for resolver in (self.resolver, self.async_resolver):
+            resolver.nameservers = [nameserver]
+            resolver.timeout = timeout
+            resolver.lifetime = timeout
+
+        self.queries = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.latency: Optional[float] = None
+        self.demoted_until = 0.0
+        self.lied = False
+
+    @property
+    def demoted(self) -> bool:
+        return time.monotonic() < self.demoted_until
+
+    @property
+    def weight(self) -> float:
+        """Selection weight: success rate over average latency."""
+        success_rate = (self.queries - self.failures + 1) / (self.queries + 2)
+        return success_rate / max(self.latency if self.latency is not None else 0.05, 0.005)
+
+    def record(self, ok: bool, latency: Optional[float] = None) -> None:
+        self.queries += 1
+        if ok:
+            self.consecutive_failures = 0
+            if latency is not None:
+                self.latency = latency if self.latency is None else (
+                    LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * self.latency
+                )
+            return
+
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= FAILURE_LIMIT:
+            self.demoted_until = time.monotonic() + FAILURE_COOLDOWN
+            self.consecutive_failures = 0
+
+class ResolverPool:
+    """
+    Pool of upstream DNS resolvers with health scoring and weighted load balancing.
+
+    Each query goes to an upstream picked at random, weighted by its
+    success rate and average latency. A timed-out query is retried on a
+    different upstream. Upstreams that keep failing are demoted for a
+    cooldown, and upstreams caught answering for names that can't exist
+    (NXDOMAIN hijacking) are shunned for much longer.
+    """
+
+    def __init__(self, nameservers: Optional[List[Union[str, Any]]] = None,
+                 timeout: float = DEFAULT_TIMEOUT, attempts: int = DEFAULT_ATTEMPTS):
+        self.upstreams = [Upstream(ns, timeout) for ns in (nameservers or system_nameservers())]
+        self.attempts = max(1, attempts)
+        self._verified_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def nameservers(self) -> List[str]:
+        return [upstream.key for upstream in self.upstreams]
+
+    def choose(self, exclude: Set[str]) -> Optional[Upstream]:
+        """
+        Pick an upstream, weighted by health, skipping ones already tried.
+
+        Demoted upstreams are only used when nothing else is left.
+        """
+        with self._lock:
+            candidates = [u for u in self.upstreams if u.key not in exclude]
+            if not candidates:
+                return None
+
+            healthy = [u for u in candidates if not u.demoted]
+            if not healthy:
+                return min(candidates, key=lambda u: u.demoted_until)
+            return random.choices(healthy, weights=[u.weight for u in healthy])[0]
+
+    def _record(self, upstream: Upstream, ok: bool, latency: Optional[float] = None) -> None:
+        with self._lock:
+            upstream.record(ok, latency)
+
+    def resolve(self, name: Union[str, dns.name.Name], rdtype: str = "A",
+                limiter: Optional[HostRateLimiter] = None) -> dns.resolver.Answer:
+        """
+        Resolve a name on the pool, retrying on a different upstream after a timeout.
+
+        Args:
+            name: Name to resolve
+            rdtype: Record type
+            limiter: Per-upstream rate limiter, if queries are paced
+
+        Returns:
+            The dnspython Answer
+
+        Raises:
+            NXDOMAIN/NoAnswer/NoNameservers as answered by an upstream,
+            or the last timeout once every attempt timed out
+        """
+        tried: Set[str] = set()
+        error: Optional[Exception] = None
+
+        for _ in range(self.attempts):
+            upstream = self.choose(tried)
+            if upstream is None:
+                break
+            tried.add(upstream.key)
+
+            if limiter is not None:
+                limiter.acquire(upstream.key)
+            started = time.monotonic()
+            try:
+                answer = upstream.resolver.resolve(name, rdtype)
+            except _ANSWERED:
+                self._record(upstream, True, time.monotonic() - started)
+                raise
+            except dns.exception.Timeout as e:
+                # Only timeouts count against the upstream; SERVFAIL/REFUSED
+                # (NoNameservers) is usually the zone's fault and is raised as is
+                self._record(upstream, False)
+                error = e
+                continue
+
+            self._record(upstream, True, time.monotonic() - started)
+            return answer
+
+        raise error or dns.resolver.NoNameservers()
+
+    async def resolve_async(self, name: Union[str, dns.name.Name], rdtype: str = "A",
+                            limiter: Optional[HostRateLimiter] = None) -> dns.resolver.Answer:
+        """Async variant of resolve."""
+        tried: Set[str] = set()
+        error: Optional[Exception] = None
+
+        for _ in range(self.attempts):
+            upstream = self.choose(tried)
+            if upstream is None:
+                break
+            tried.add(upstream.key)
+
+            if limiter is not None:
+                await limiter.acquire_async(upstream.key)
+            started = time.monotonic()
+            try:
+                answer = await upstream.async_resolver.resolve(name, rdtype)
+            except _ANSWERED:
+                self._record(upstream, True, time.monotonic() - started)
+                raise
+            except dns.exception.Timeout as e:
+                self._record(upstream, False)
+                error = e
+                continue
+
+            self._record(upstream, True, time.monotonic() - started)
+            return answer
+
+        raise error or dns.resolver.NoNameservers()
+
+    async def verify_async(self, force: bool = False) -> None:
+        """
+        Check every upstream for NXDOMAIN hijacking, at most once per VERIFY_INTERVAL.
+
+        A random name under a TLD can't exist; an upstream that answers it
+        with addresses is lying and is shunned for LIAR_COOLDOWN.
+        """
+        now = time.monotonic()
+        if not force and self._verified_at is not None and now - self._verified_at < VERIFY_INTERVAL:
+            return
+        self._verified_at = now
+
+        label = "".join(random.choices(string.ascii_lowercase + string.digits, k=24))
+        for upstream in self.upstreams:
+            try:
+                await upstream.async_resolver.resolve(f"{label}.com", "A")
+            except Exception:
+                # NXDOMAIN is the honest answer; failures are scored by real queries
+                continue
+            with self._lock:
+                upstream.lied = True
+                upstream.demoted_until = time.monotonic() + LIAR_COOLDOWN
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Get the health of every upstream."""
+        with self._lock:
+            return [
+                {
+                    "nameserver": upstream.key,
+                    "queries": upstream.queries,
+                    "error_rate": upstream.failures / upstream.queries if upstream.queries else 0.0,
+                    "latency_ms": round(upstream.latency * 1000, 1) if upstream.latency is not None else None,
+                    "demoted": upstream.demoted,
+                    "lied": upstream.lied
+                }
+                for upstream in self.upstreams
+            ]
+
+_default_pool: Optional[ResolverPool] = None
+_default_lock = threading.Lock()
+
+def get_resolver_pool() -> ResolverPool:
+    """Get the process-wide resolver pool, built from the system nameservers on first use."""
+    global _default_pool
+
+    if _default_pool is None:
+        with _default_lock:
+            if _default_pool is None:
+                _default_pool = ResolverPool()
+    return _default_pool
+
+def configure_resolver_pool(nameservers: Optional[List[str]] = None,
+                            timeout: float = DEFAULT_TIMEOUT,
+                            attempts: int = DEFAULT_ATTEMPTS) -> ResolverPool:
+    """
+    Replace the process-wide resolver pool.
+
+    Args:
+        nameservers: Upstream resolver IPs, or None for the system's
+        timeout: Per-query timeout for one upstream
+        attempts: Upstreams tried per query
+
+    Returns:
+        The new pool
+    """
+    global _default_pool
+
+    with _default_lock:
+        _default_pool = ResolverPool(nameservers, timeout=timeout, attempts=attempts)
+    return _default_pool
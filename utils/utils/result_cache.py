@@ -0,0 +1,196 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+from .cache_dir import cache_path
+from .platform_health import FAILURE_STATUSES
+
+# Default location of the on-disk cache
+DEFAULT_CACHE_PATH = cache_path("username_results.sqlite")
+
+# Default lifetimes (seconds) for found and not-found results
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_NEGATIVE_TTL = 6 * 60 * 60
+
+def normalize_username(username: str) -> str:
+    """
+    Normalize a username for use as a cache key.
+
+    Args:
+        username: Raw username as entered
+
+    Returns:
+        Lowercased username without surrounding whitespace or leading '@'
+    """
+    return username.strip().lstrip("@").lower()
+
+def cacheable(result: Dict[str, Any]) -> bool:
+    """
+    Check whether a probe result is a real answer worth caching.
+
+    Results that ended in an error are not, and neither are throttled or
+    failing responses (429/5xx): those come back as "not found" without an
+    error, and caching them would hide real accounts for the negative TTL.
+    """
+    return not result.get("error") and result.get("status_code") not in FAILURE_STATUSES
+
+class ResultCache:
+    """SQLite-backed TTL cache for username/platform existence results"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: int = DEFAULT_TTL,
+                 negative_ttl: int = DEFAULT_NEGATIVE_TTL,
+                 platform_ttls: Optional[Dict[str, Dict[str, int]]] = None):
+        """
+        Args:
+            path: SQLite database file
+            ttl: Default lifetime of positive (account found) results
+            negative_ttl: Default lifetime of negative (not found) results
+            platform_ttls: Per-platform overrides, e.g. {"GitHub": {"ttl": 3600, "negative_ttl": 600}}
+        """
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.platform_ttls = platform_ttls or {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                platform TEXT NOT NULL,
+                username TEXT NOT NULL,
+                exists_flag INTEGER NOT NULL,
+                status_code INTEGER,
+                url TEXT,
+                checked_at REAL NOT NULL,
+                PRIMARY KEY (platform, username)
+            ) WITHOUT ROWID
+        """)
+
+    def get_ttl(self, platform: str, exists: bool) -> int:
+        """Get the lifetime for a result on a platform."""
+        overrides = self.platform_ttls.get(platform, {})
+        if exists:
+            return overrides.get("ttl", self.ttl)
+        return overrides.get("negative_ttl", self.negative_ttl)
+
+    def get(self, platform: str, username: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result.
+
+        Args:
+            platform: Platform name
+            username: Username (normalized before lookup)
+
+        Returns:
+            Cached result dictionary, or None if missing or expired
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT exists_flag, status_code, url, checked_at FROM results WHERE platform = ? AND username = ?",
+                (platform, normalize_username(username))
+            ).fetchone()
+
+            if row is not None:
+                exists = bool(row[0])
+                if time.time() - row[3] <= self.get_ttl(platform, exists):
+                    self.hits += 1
+                    return {
+                        "platform": platform,
+                        "url": row[2],
+                        "exists": exists,
+                        "status_code": row[1],
+                        "error": None,
+                        "checked_at": row[3]
+                    }
+
+            self.misses += 1
+            return None
+
+    def put(self, result: Dict[str, Any], username: str) -> None:
+        """
+        Store a probe result. Errors and throttled or failing responses are not cached (see cacheable).
+
+        Args:
+            result: Result dictionary from check_platform
+            username: Username that was checked
+        """
+        self.put_many([(result, username)])
+
+    def put_many(self, items: Iterable[Tuple[Dict[str, Any], str]]) -> None:
+        """
+        Store several probe results in one transaction, skipping any that aren't cacheable.
+
+        Args:
+            items: (result, username) pairs
+        """
+        now = time.time()
+        rows = [
+            (
+                result["platform"],
+                normalize_username(username),
+                1 if result["exists"] else 0,
+                result.get("status_code"),
+                result.get("url"),
+                now
+            )
+            for result, username in items if cacheable(result)
+        ]
+        if not rows:
+            return
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)", rows)
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def invalidate(self, username: Optional[str] = None, platform: Optional[str] = None) -> int:
+        """
+        Remove cached results for a username and/or platform (everything if neither is given).
+
+        Returns:
+            Number of rows removed
+        """
+        clauses, params = [], []
+        if username is not None:
+            clauses.append("username = ?")
+            params.append(normalize_username(username))
+        if platform is not None:
+            clauses.append("platform = ?")
+            params.append(platform)
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            return self._conn.execute(f"DELETE FROM results{where}", params).rowcount
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss counters and the number of stored results."""
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": size}
+
+_default_cache: Optional[ResultCache] = None
+_default_lock = threading.Lock()
+
+def get_result_cache() -> ResultCache:
+    """Get the process-wide result cache, opening it on first use."""
+    global _default_cache
+
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = ResultCache()
+    return _default_cache
@@ -0,0 +1,211 @@
+import asyncio
+import concurrent.futures
+import mmap
+import os
+import random
+import string
+from typing import Dict, Any, AsyncIterator, Iterable, Iterator, List, Optional, Set, Union
+
+import dns.exception
+
+from .async_runner import get_loop, iterate_async
+from .rate_limiter import HostRateLimiter
+from .resolver_pool import DEFAULT_ATTEMPTS, DEFAULT_TIMEOUT, ResolverPool, get_resolver_pool
+
+# Names tried when no wordlist is given
+COMMON_SUBDOMAINS = [
+    "www", "mail", "ftp", "webmail", "admin", "blog",
+    "dev", "test", "staging", "api", "vpn", "ns1", "ns2",
+    "smtp", "pop", "imap", "cloud", "mobile", "app",
+    "support", "shop", "portal", "cdn", "secure"
+]
+
+# Queries in flight at once across the whole resolver pool
+DEFAULT_CONCURRENCY = 500
+
+# Random labels resolved to fingerprint wildcard DNS
+WILDCARD_PROBES = 3
+
+def read_wordlist(source: Union[str, Iterable[Union[str, bytes]]]) -> Iterator[str]:
+    """
+    Lazily read subdomain labels from a wordlist.
+
+    A path is memory-mapped and scanned line by line, so wordlists of any
+    size are streamed without being loaded. Blank lines, '#' comments and
+    duplicate labels are skipped.
+
+    Args:
+        source: Path to a wordlist file, or an iterable of lines
+
+    Returns:
+        Iterator of lowercase labels
+    """
+    seen: Set[str] = set()
+
+    def labels(lines: Iterable[Union[str, bytes]]) -> Iterator[str]:
+        for line in lines:
+            if isinstance(line, bytes):
+                line = line.decode("utf-8", errors="replace")
+            label = line.strip().lower().strip(".")
+            if label and not label.startswith("#") and label not in seen:
+                seen.add(label)
+                yield label
+
+    if not isinstance(source, str):
+        yield from labels(source)
+        return
+
+    if os.path.getsize(source) == 0:
+        return
+
+    with open(source, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield from labels(iter(mapped.readline, b""))
+
+async def _resolve_a(pool: ResolverPool, name: str,
+                     limiter: Optional[HostRateLimiter] = None) -> Optional[Dict[str, Any]]:
+    """
+    Resolve a name's A records on the pool.
+
+    Returns:
+        {"ips": [...], "ttl": ...}, or None if the name does not resolve
+    """
+    try:
+        answers = await pool.resolve_async(name, "A", limiter)
+    except dns.exception.DNSException:
+        return None
+    return {"ips": sorted(rdata.address for rdata in answers), "ttl": answers.rrset.ttl}
+
+async def detect_wildcard(pool: ResolverPool, domain: str, probes: int = WILDCARD_PROBES,
+                          limiter: Optional[HostRateLimiter] = None) -> Set[str]:
+    """
+    Probe random labels under a domain to fingerprint wildcard DNS.
+
+    Args:
+        pool: Resolver pool to resolve with
+        domain: Parent domain
+        probes: Number of random labels to resolve
+        limiter: Per-upstream rate limiter, if queries are paced
+
+    Returns:
+        Set of IPs that wildcard records answer with (empty if there is no wildcard)
+    """
+    labels = ["".join(random.choices(string.ascii_lowercase + string.digits, k=20)) for _ in range(probes)]
+    answers = await asyncio.gather(*(_resolve_a(pool, f"{label}.{domain}", limiter) for label in labels))
+    return {ip for answer in answers if answer for ip in answer["ips"]}
+
+async def bruteforce_subdomains_async(domain: str, wordlist: Union[str, Iterable[str], None] = None,
+                                      nameservers: Optional[List[str]] = None,
+                                      concurrency: int = DEFAULT_CONCURRENCY,
+                                      timeout: float = DEFAULT_TIMEOUT,
+                                      attempts: int = DEFAULT_ATTEMPTS,
+                                      limiter: Optional[HostRateLimiter] = None,
+                                      semaphore: Optional[asyncio.Semaphore] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Resolve wordlist candidates under a domain, yielding subdomains as they are found.
+
+    Queries are load-balanced over a health-scored resolver pool, with
+    retries on a different upstream. Wildcard DNS is detected first by
+    resolving random labels; candidates whose answers only contain
+    wildcard IPs are dropped.
+
+    Args:
+        domain: Parent domain
+        wordlist: Wordlist path, iterable of labels, or None for COMMON_SUBDOMAINS
+        nameservers: Upstream resolver IPs for a dedicated pool (None for the process-wide pool)
+        concurrency: Maximum number of queries in flight at once
+        timeout: Per-query timeout of a dedicated pool, in seconds
+        attempts: Upstreams a dedicated pool tries per candidate before giving up
+        limiter: Per-upstream rate limiter (None for unpaced queries)
+        semaphore: Concurrency limit shared with other brute forces running at the same time
+
+    Returns:
+        Async iterator of {"subdomain", "ips", "ttl"} dictionaries, in completion order
+    """
+    domain = domain.strip().lower().rstrip(".")
+    pool = ResolverPool(nameservers, timeout=timeout, attempts=attempts) if nameservers else get_resolver_pool()
+    await pool.verify_async()
+    wildcard_ips = await detect_wildcard(pool, domain, limiter=limiter)
+
+    labels = read_wordlist(wordlist) if wordlist is not None else iter(COMMON_SUBDOMAINS)
+    window = max(1, concurrency)
+    pending = {}
+
+    async def probe(label: str) -> Optional[Dict[str, Any]]:
+        name = f"{label}.{domain}"
+        if semaphore is not None:
+            async with semaphore:
+                answer = await _resolve_a(pool, name, limiter)
+        else:
+            answer = await _resolve_a(pool, name, limiter)
+        if answer is None or (wildcard_ips and set(answer["ips"]) <= wildcard_ips):
+            return None
+        return {"subdomain": name, **answer}
+
+    try:
+        while True:
+            # Top up the window from the lazy wordlist
+            for label in labels:
+                pending[asyncio.ensure_future(probe(label))] = None
+                if len(pending) >= window:
+                    break
+
+            if not pending:
+                break
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                del pending[task]
+                found = task.result()
+                if found is not None:
+                    yield found
+    finally:
+        for task in pending:
+            task.cancel()
+
+def bruteforce_subdomains(domain: str, wordlist: Union[str, Iterable[str], None] = None,
+                          nameservers: Optional[List[str]] = None,
+                          concurrency: int = DEFAULT_CONCURRENCY,
+                          timeout: float = DEFAULT_TIMEOUT,
+                          attempts: int = DEFAULT_ATTEMPTS) -> Iterator[Dict[str, Any]]:
+    """
+    Synchronous wrapper around bruteforce_subdomains_async.
+
+    Resolution runs on the shared background event loop; found subdomains
+    are yielded as soon as they resolve.
+
+    Args:
+        domain: Parent domain
+        wordlist: Wordlist path, iterable of labels, or None for COMMON_SUBDOMAINS
+        nameservers: Upstream resolver IPs for a dedicated pool (None for the process-wide pool)
+        concurrency: Maximum number of queries in flight at once
+        timeout: Per-query timeout of a dedicated pool, in seconds
+        attempts: Upstreams a dedicated pool tries per candidate before giving up
+
+    Returns:
+        Iterator of {"subdomain", "ips", "ttl"} dictionaries, in completion order
+    """
+    return iterate_async(bruteforce_subdomains_async(
+        domain, wordlist, nameservers=nameservers, concurrency=concurrency,
+        timeout=timeout, attempts=attempts
+    ))
+
+def collect_subdomains(domain: str, wordlist: Union[str, Iterable[str], None] = None,
+                       **options) -> "concurrent.futures.Future[List[Dict[str, Any]]]":
+    """
+    Start a brute force on the background loop and collect everything it finds.
+
+    Unlike bruteforce_subdomains, no thread is tied up while it runs, so
+    the caller can do other work and pick up the result later.
+
+    Args:
+        domain: Parent domain
+        wordlist: Wordlist path, iterable of labels, or None for COMMON_SUBDOMAINS
+        **options: Passed to bruteforce_subdomains_async
+
+    Returns:
+        Future resolving to the list of found subdomains
+    """
+    async def collect() -> List[Dict[str, Any]]:
+        return [found async for found in bruteforce_subdomains_async(domain, wordlist, **options)]
+
+    return asyncio.run_coroutine_threadsafe(collect(), get_loop())
@@ -0,0 +1,240 @@
+import asyncio
+import re
+from typing import Dict, Any, AsyncIterator, Iterable, Iterator, List, Optional, Set
+
+import dns.exception
+import dns.resolver
+
+from .async_runner import iterate_async
+from .rate_limiter import HostRateLimiter
+from .resolver_pool import get_resolver_pool
+from .whois_lookup import is_valid_domain
+
+# Look-alike characters, ASCII first; Unicode ones produce IDN (xn--) candidates
+HOMOGLYPHS = {
+    "a": ["4", "q", "à", "á", "ä", "å", "ą", "а"],
+    "b": ["d", "lb", "6", "ḃ", "ь"],
+    "c": ["e", "ç", "ć", "с"],
+    "d": ["b", "cl", "dl", "ď", "ԁ"],
+    "e": ["c", "3", "é", "è", "ë", "ę", "е"],
+    "g": ["q", "9", "ġ", "ğ", "ɡ"],
+    "h": ["lh", "ĥ", "һ"],
+    "i": ["1", "l", "í", "ì", "ï", "і"],
+    "j": ["ĵ", "ј"],
+    "k": ["lk", "ik", "lc", "ķ", "κ"],
+    "l": ["1", "i", "ĺ", "ļ", "ӏ"],
+    "m": ["n", "nn", "rn", "rr", "ṃ", "м"],
+    "n": ["m", "r", "ń", "ñ", "ո"],
+    "o": ["0", "ó", "ò", "ö", "ø", "о"],
+    "p": ["ρ", "р"],
+    "q": ["g", "զ"],
+    "r": ["ŕ", "ř", "г"],
+    "s": ["5", "ś", "š", "ѕ"],
+    "t": ["7", "ţ", "ť", "т"],
+    "u": ["v", "ü", "ú", "ù", "υ"],
+    "v": ["u", "ѵ"],
+    "w": ["vv", "ŵ", "ԝ"],
+    "x": ["х"],
+    "y": ["ý", "ÿ", "у"],
+    "z": ["ź", "ż", "ž"],
+    "rn": ["m"],
+    "cl": ["d"],
+    "vv": ["w"]
+}
+
+# Top-level domains tried as swaps, most abused first
+TLD_SWAPS = [
+    "com", "net", "org", "co", "io", "info", "biz", "xyz", "online", "site",
+    "app", "dev", "shop", "store", "us", "uk", "de", "ru", "cn", "me", "cc", "tv"
+]
+
+# Every technique, in generation order
+TECHNIQUES = ["homoglyph", "bitflip", "omission", "transposition", "tld_swap", "hyphenation"]
+
+# Record types resolved for every candidate
+RESOLVED_TYPES = ["A", "MX", "NS"]
+
+# Candidates being resolved at once
+DEFAULT_CONCURRENCY = 300
+
+_LABEL = re.compile(r"^(xn--)?[a-z0-9]([a-z0-9\-]{0,61}[a-z0-9])?$")
+_LABEL_CHARS = set("abcdefghijklmnopqrstuvwxyz0123456789-")
+
+def _homoglyphs(name: str) -> Iterator[str]:
+    """Replace one character (or character pair) with each of its look-alikes."""
+    for i in range(len(name)):
+        for length in (2, 1):
+            original = name[i:i + length]
+            if len(original) != length:
+                continue
+            for glyph in HOMOGLYPHS.get(original, []):
+                yield name[:i] + glyph + name[i + length:]
+
+def _bitflips(name: str) -> Iterator[str]:
+    """Flip each bit of each character, keeping results that are hostname characters."""
+    for i, char in enumerate(name):
+        for bit in range(8):
+            flipped = chr(ord(char) ^ (1 << bit))
+            if flipped in _LABEL_CHARS:
+                yield name[:i] + flipped + name[i + 1:]
+
+def _omissions(name: str) -> Iterator[str]:
+    for i in range(len(name)):
+        yield name[:i] + name[i + 1:]
+
+def _transpositions(name: str) -> Iterator[str]:
+    for i in range(len(name) - 1):
+        if name[i] != name[i + 1]:
+            yield name[:i] + name[i + 1] + name[i] + name[i + 2:]
+
+def _hyphenations(name: str) -> Iterator[str]:
+    for i in range(1, len(name)):
+        if name[i - 1] != "-" and name[i] != "-":
+            yield name[:i] + "-" + name[i:]
+
+_LABEL_TECHNIQUES = {
+    "homoglyph": _homoglyphs,
+    "bitflip": _bitflips,
+    "omission": _omissions,
+    "transposition": _transpositions,
+    "hyphenation": _hyphenations
+}
+
+def _to_ascii(label: str) -> Optional[str]:
+    """ASCII (punycode) form of a label, or None if it isn't a valid hostname label."""
+    try:
+        label = label.encode("idna").decode("ascii").lower()
+    except UnicodeError:
+        return None
+    return label if _LABEL.match(label) else None
+
+def _is_hostname(domain: str) -> bool:
+    """Check that a candidate is a resolvable ASCII hostname (of any TLD)."""
+    labels = domain.split(".")
+    return len(labels) > 1 and len(domain) <= 253 and all(_LABEL.match(label) for label in labels)
+
+def generate_typosquats(domain: str, techniques: Optional[List[str]] = None,
+                        tlds: Optional[List[str]] = None) -> Iterator[Dict[str, str]]:
+    """
+    Lazily generate deduplicated look-alike domains for a seed domain.
+
+    The first label is permuted and the rest of the domain kept (so
+    "example.co.uk" yields "examp1e.co.uk"); tld_swap replaces everything
+    after the first label instead. Unicode homoglyphs come out in their
+    punycode (xn--) form, ready to resolve.
+
+    Args:
+        domain: Seed domain
+        techniques: Techniques to apply (defaults to all of TECHNIQUES)
+        tlds: TLDs used by tld_swap (defaults to TLD_SWAPS)
+
+    Returns:
+        Iterator of {"domain", "technique"} dictionaries, never repeating a domain
+    """
+    domain = domain.strip().lower().rstrip(".")
+    if not is_valid_domain(domain):
+        return
+
+    name, suffix = domain.split(".", 1)
+    seen: Set[str] = {domain}
+
+    for technique in techniques or TECHNIQUES:
+        if technique == "tld_swap":
+            candidates: Iterable[str] = (f"{name}.{tld}" for tld in (tlds or TLD_SWAPS))
+        elif technique in _LABEL_TECHNIQUES:
+            candidates = (
+                f"{label}.{suffix}"
+                for label in map(_to_ascii, _LABEL_TECHNIQUES[technique](name))
+                if label
+            )
+        else:
+            raise ValueError(f"Unknown typosquat technique: {technique}")
+
+        for candidate in candidates:
+            # Not is_valid_domain: its TLD list would drop swaps like .online and .store
+            if candidate not in seen and _is_hostname(candidate):
+                seen.add(candidate)
+                yield {"domain": candidate, "technique": technique}
+
+async def _resolve_candidate(candidate: Dict[str, str], record_types: List[str],
+                             limiter: Optional[HostRateLimiter]) -> Optional[Dict[str, Any]]:
+    """Resolve a candidate's record types at once; None unless the name exists."""
+    pool = get_resolver_pool()
+    answers = await asyncio.gather(
+        *(pool.resolve_async(candidate["domain"], record_type, limiter) for record_type in record_types),
+        return_exceptions=True
+    )
+
+    records = {}
+    exists = False
+    for record_type, answer in zip(record_types, answers):
+        if isinstance(answer, dns.resolver.NoAnswer):
+            # The name exists, it just has no records of this type
+            exists = True
+        elif not isinstance(answer, BaseException):
+            exists = True
+            records[record_type] = sorted(str(rdata).rstrip(".") for rdata in answer)
+
+    if not exists:
+        return None
+    return {**candidate, **{record_type: ", ".join(records.get(record_type, [])) for record_type in record_types}}
+
+async def find_registered_async(candidates: Iterable[Dict[str, str]],
+                                record_types: Optional[List[str]] = None,
+                                concurrency: int = DEFAULT_CONCURRENCY,
+                                limiter: Optional[HostRateLimiter] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Resolve candidates concurrently, yielding only those that exist in DNS.
+
+    Args:
+        candidates: Iterable of {"domain", "technique"} (e.g. from generate_typosquats)
+        record_types: Record types to resolve (defaults to RESOLVED_TYPES)
+        concurrency: Maximum number of candidates being resolved at once
+        limiter: Per-upstream rate limiter (None for unpaced queries)
+
+    Returns:
+        Async iterator of {"domain", "technique", <record type>: answers...}
+        dictionaries, in completion order
+    """
+    record_types = record_types or RESOLVED_TYPES
+    await get_resolver_pool().verify_async()
+
+    candidates = iter(candidates)
+    window = max(1, concurrency)
+    pending = set()
+
+    try:
+        while True:
+            # Top up the window from the lazy candidate stream
+            for candidate in candidates:
+                pending.add(asyncio.ensure_future(_resolve_candidate(candidate, record_types, limiter)))
+                if len(pending) >= window:
+                    break
+
+            if not pending:
+                break
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                found = task.result()
+                if found is not None:
+                    yield found
+    finally:
+        for task in pending:
+            task.cancel()
+
+def find_typosquats(domain: str, techniques: Optional[List[str]] = None,
+                    tlds: Optional[List[str]] = None, **options) -> Iterator[Dict[str, Any]]:
+    """
+    Generate look-alikes of a domain and stream back the registered ones.
+
+    Args:
+        domain: Seed domain
+        techniques: Techniques to apply (defaults to all of TECHNIQUES)
+        tlds: TLDs used by tld_swap (defaults to TLD_SWAPS)
+        **options: Passed to find_registered_async (record_types, concurrency, limiter)
+
+    Returns:
+        Iterator of registered look-alikes with their A/MX/NS answers
+    """
+    return iterate_async(find_registered_async(generate_typosquats(domain, techniques, tlds), **options))
@@ -1,76 +1,158 @@
-import requests
 import pandas as pd
+import asyncio
+import requests
+import threading
 import time
-import random
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Union, Optional
+from typing import List, Dict, Union, Optional, Iterable, Iterator, AsyncIterator, Tuple
+from urllib.parse import urlsplit
+
+from .async_runner import run_coroutine, iterate_async
+from .calibration import (CALIBRATED_METHODS, PREFIX_BYTES, buckets_compatible, classify, fingerprint,
+                          get_calibrator, length_bucket, prefix_matches, random_username)
+from .email_validation import email_domain, email_result, lookup_mail_domain
+from .http_pool import get_session, get_async_session
+from .platform_health import SKIPPED_UNHEALTHY, platform_health
+from .platform_registry import Detector, PlatformRegistry, get_registry
+from .rate_limiter import platform_limiter
+from .result_cache import ResultCache, get_result_cache
+
+# Concurrency limits for the async engine
+DEFAULT_MAX_CONCURRENCY = 200
+DEFAULT_PER_HOST_LIMIT = 4
+
+# Number of probes the bulk engine keeps scheduled per unit of concurrency
+BULK_WINDOW_FACTOR = 2
+
+# Response bodies are streamed in chunks and never read past the byte cap
+BODY_CHUNK_SIZE = 16 * 1024
+DEFAULT_MAX_BODY_BYTES = 512 * 1024
+
+# New results buffered before being written to the result cache in one transaction
+CACHE_WRITE_BATCH = 100
+
+# Bodies up to this size are read to the end after a verdict, so the pooled
+# keep-alive connection can be reused; larger or unbounded ones are closed
+DRAIN_MAX_BYTES = 32 * 1024
+
+def _drain(response) -> None:
+    """Read the rest of a small streamed requests body so its connection returns to the pool"""
+    content_length = response.headers.get("Content-Length")
+    if content_length and content_length.isdigit() and int(content_length) > DRAIN_MAX_BYTES:
+        return
+    
+    drained = 0
+    try:
+        for chunk in response.iter_content(BODY_CHUNK_SIZE):
+            drained += len(chunk)
+            if drained > DRAIN_MAX_BYTES:
+                # Bigger than it looked; closing is cheaper than reading on
+                return
+    except requests.exceptions.StreamConsumedError:
+        # The body was already read to the end
+        pass
+    except requests.exceptions.RequestException:
+        # The verdict stands; the connection is just not reused
+        pass
+
+async def _drain_async(response) -> None:
+    """Async variant of _drain for aiohttp responses"""
+    import aiohttp
+    
+    if response.content_length is not None and response.content_length > DRAIN_MAX_BYTES:
+        return
+    
+    drained = 0
+    try:
+        while not response.content.at_eof():
+            chunk = await response.content.read(BODY_CHUNK_SIZE)
+            if not chunk:
+                break
+            drained += len(chunk)
+            if drained > DRAIN_MAX_BYTES:
+                return
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        # The verdict stands; the connection is just not reused
+        pass
+
+class _ProbeEvaluator:
+    """Decide a probe's verdict from as little of the response body as possible
+    
+    With a soft-404 calibration, a status or final URL that differs from the
+    platform's not-found page settles the probe without reading the body.
+    Otherwise the detector decides, and the hash of the body prefix only
+    breaks the tie when the detector can't tell: a status-code check on a
+    platform whose not-found page also answers 200 at the same URL.
+    """
+    
+    def __init__(self, detector: Detector, username: str, status_code: int, final_url: str,
+                 content_length: Optional[int], max_bytes: int, calibrated: Optional[Dict] = None,
+                 encoding: Optional[str] = None):
+        self.detector = detector
+        self.username = username
+        self.status_code = status_code
+        self.final_url = final_url
+        self.content_length = content_length
+        self.calibrated = calibrated
+        self.reader = detector.body_reader(status_code, max_bytes, encoding)
+        self.verdict: Optional[bool] = None
+        self.drifted = False
+        self._prefix = b""
+        self._collect = False
+        
+        if calibrated is not None:
+            # Status and redirect target alone often settle it
+            self.verdict = classify(calibrated, fingerprint(status_code, final_url, username, content_length))
+            self._collect = self.verdict is None and buckets_compatible(
+                length_bucket(content_length), calibrated["length_bucket"]
+            )
+    
+    @property
+    def done(self) -> bool:
+        return self.verdict is not None or (not self._collect and self.reader is None)
+    
+    def feed(self, chunk: bytes) -> bool:
+        """Consume the next body chunk; returns True once no more body is needed"""
+        if self._collect:
+            self._prefix += chunk[:PREFIX_BYTES - len(self._prefix)]
+        
+        reader_done = self.reader.feed(chunk) if self.reader is not None else True
+        return reader_done and (not self._collect or len(self._prefix) >= PREFIX_BYTES)
+    
+    def finish(self) -> bool:
+        """Return whether the account exists once the body has been read"""
+        if self.verdict is not None:
+            return self.verdict
+        
+        exists = self.detector.exists(self.status_code, self.final_url, self.reader)
+        if not self._prefix:
+            return exists
+        
+        same_page = prefix_matches(self.calibrated, fingerprint(
+            self.status_code, self.final_url, self.username, self.content_length, self._prefix
+        ))
+        if self.reader is None:
+            # A bare status check can't tell this 200 from the not-found page
+            return exists and not same_page
+        if getattr(self.reader, "matched", False) and not same_page:
+            # The not-found page no longer matches its recorded fingerprint
+            self.drifted = True
+        return exists
 
 class UsernameChecker:
     """Class to check username/email across different platforms"""
     
-    def __init__(self):
-        # Platform URLs - these are the URLs we'll check for usernames
-        self.platforms = {
-            "Twitter": {
-                "url": "https://twitter.com/{username}",
-                "error_msg": ["page doesn't exist"],
-                "username_only": True
-            },
-            "Instagram": {
-                "url": "https://www.instagram.com/{username}/",
-                "error_msg": ["page not found", "page isn't available"],
-                "username_only": True
-            },
-            "GitHub": {
-                "url": "https://github.com/{username}",
-                "error_msg": ["not found", "404"],
-                "username_only": True
-            },
-            "Reddit": {
-                "url": "https://www.reddit.com/user/{username}",
-                "error_msg": ["page not found", "Sorry, nobody on Reddit"],
-                "username_only": True
-            },
-            "LinkedIn": {
-                "url": "https://www.linkedin.com/in/{username}",
-                "error_msg": ["page not found", "this page doesn't exist"],
-                "username_only": True
-            },
-            "TikTok": {
-                "url": "https://www.tiktok.com/@{username}",
-                "error_msg": ["couldn't find this account"],
-                "username_only": True
-            },
-            "Pinterest": {
-                "url": "https://www.pinterest.com/{username}/",
-                "error_msg": ["user not found", "404"],
-                "username_only": True
-            },
-            "Telegram": {
-                "url": "https://t.me/{username}",
-                "error_msg": ["Sorry, this user doesn't seem to exist"],
-                "username_only": True
-            },
-            "Medium": {
-                "url": "https://medium.com/@{username}",
-                "error_msg": ["page not found", "404"],
-                "username_only": True
-            },
-            "DeviantArt": {
-                "url": "https://www.deviantart.com/{username}",
-                "error_msg": ["page not found", "is not a deviantart"],
-                "username_only": True
-            }
-            # Email platforms cannot be easily checked with this method
-            # they would require API access or authentication
-        }
+    def __init__(self, registry: Optional[PlatformRegistry] = None, use_calibration: bool = True):
+        # Platform definitions come from the shared, lazily compiled registry
+        self.registry = registry or get_registry()
+        self.platforms = self.registry.platforms
         
         # Common headers to avoid being blocked
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate, br",
+            # No "br": neither HTTP client can decode Brotli without the optional brotli package
+            "Accept-Encoding": "gzip, deflate",
             "Connection": "keep-alive",
             "Upgrade-Insecure-Requests": "1",
             "Pragma": "no-cache",
@@ -80,16 +162,17 @@ class UsernameChecker:
         # Service for email verification
         self.email_verification_url = "https://api.hunter.io/v2/email-verifier"
         
-    def check_platform(self, platform: str, username: str) -> Dict[str, Union[str, bool]]:
-        """Check if username exists on a specific platform
+        # Maximum number of body bytes read per probe
+        self.max_body_bytes = DEFAULT_MAX_BODY_BYTES
         
-        Args:
-            platform: The platform to check (e.g., "Twitter")
-            username: The username to check
-            
-        Returns:
-            Dict containing platform, URL, and existence status
-        """
+        # Soft-404 fingerprints for platforms that answer 200 for missing users
+        self.use_calibration = use_calibration
+        # One lock per platform, so a slow calibration only holds up its own platform
+        self._calibration_thread_locks: Dict[str, threading.Lock] = {}
+        self._calibration_locks: Dict[str, asyncio.Lock] = {}
+        
+    def _new_result(self, platform: str, username: str) -> Dict[str, Union[str, bool]]:
+        """Build the empty result for a probe, rejecting usernames the platform can't have"""
         result = {
             "platform": platform,
             "url": self.platforms[platform]["url"].format(username=username),
@@ -98,34 +181,188 @@ class UsernameChecker:
             "error": None
         }
         
+        if not self.registry.detector(platform).accepts(username):
+            result["error"] = "Username not valid on this platform"
+        
+        return result
+    
+    def _request(self, platform: str, request_url: str):
+        """Send a paced, streamed GET through the pooled session for the URL's host
+        
+        The timeout adapts to the platform's observed latency, and the
+        outcome is recorded in the platform's health.
+        """
+        # Wait only if this host's request budget is used up
+        platform_limiter.acquire(urlsplit(request_url).hostname or platform)
+        
+        # Set up request
+        headers = self.headers.copy()
+        headers["Referer"] = f"https://www.google.com/search?q={platform}"
+        
+        # Reuse the pooled keep-alive session for this host
+        started = time.monotonic()
         try:
-            # Add a small random delay to avoid rate limiting
-            time.sleep(random.uniform(0.5, 1.5))
-            
-            # Set up request
-            headers = self.headers.copy()
-            headers["Referer"] = f"https://www.google.com/search?q={platform}"
-            
-            response = requests.get(
-                result["url"], 
+            response = get_session(request_url).get(
+                request_url,
                 headers=headers,
-                timeout=5,
-                allow_redirects=True
+                timeout=platform_health.timeout(platform),
+                allow_redirects=True,
+                stream=True
             )
+        except Exception:
+            platform_health.record(platform, None)
+            raise
+        
+        platform_health.record(platform, time.monotonic() - started, response.status_code)
+        return response
+    
+    async def _request_async(self, session, platform: str, request_url: str, paced: bool = False):
+        """Async variant of _request; use the returned response as an async context manager
+        
+        With paced set, the caller has already taken the host's rate-limit token.
+        """
+        import aiohttp
+        
+        # Wait only if this host's request budget is used up
+        if not paced:
+            await platform_limiter.acquire_async(urlsplit(request_url).hostname or platform)
+        
+        # Set up request
+        headers = self.headers.copy()
+        headers["Referer"] = f"https://www.google.com/search?q={platform}"
+        
+        # The adaptive budget comes from time-to-headers, so it bounds getting the
+        # headers and each socket read; slow but steady bodies aren't cut off
+        budget = platform_health.timeout(platform)
+        started = time.monotonic()
+        try:
+            response = await asyncio.wait_for(session.get(
+                request_url,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=budget, sock_read=budget),
+                allow_redirects=True
+            ), budget)
+        except Exception:
+            platform_health.record(platform, None)
+            raise
+        
+        platform_health.record(platform, time.monotonic() - started, response.status)
+        return response
+    
+    def _calibration_for(self, platform: str) -> Optional[Dict]:
+        """Get the platform's not-found fingerprint, calibrating it first if needed"""
+        detector = self.registry.detector(platform)
+        if not self.use_calibration or detector.method not in CALIBRATED_METHODS:
+            return None
+        
+        calibrator = get_calibrator()
+        calibrated = calibrator.get(platform)
+        if calibrated is not None:
+            return calibrated
+        
+        lock = self._calibration_thread_locks.setdefault(platform, threading.Lock())
+        with lock:
+            calibrated = calibrator.get(platform)
+            if calibrated is None:
+                username = random_username(detector)
+                if username is None:
+                    return None
+                try:
+                    with self._request(platform, detector.request_url(username)) as response:
+                        prefix = b""
+                        for chunk in response.iter_content(BODY_CHUNK_SIZE):
+                            prefix += chunk
+                            if len(prefix) >= PREFIX_BYTES:
+                                break
+                        _drain(response)
+                        content_length = response.headers.get("Content-Length")
+                        calibrated = calibrator.record(platform, fingerprint(
+                            response.status_code, response.url, username,
+                            int(content_length) if content_length else None, prefix
+                        ))
+                except Exception:
+                    return None
+        
+        return calibrated
+    
+    async def _calibration_for_async(self, session, platform: str) -> Optional[Dict]:
+        """Async variant of _calibration_for; concurrent probes share one calibration run"""
+        detector = self.registry.detector(platform)
+        if not self.use_calibration or detector.method not in CALIBRATED_METHODS:
+            return None
+        
+        calibrator = get_calibrator()
+        calibrated = calibrator.get(platform)
+        if calibrated is not None:
+            return calibrated
+        
+        lock = self._calibration_locks.setdefault(platform, asyncio.Lock())
+        async with lock:
+            calibrated = calibrator.get(platform)
+            if calibrated is None:
+                username = random_username(detector)
+                if username is None:
+                    return None
+                try:
+                    async with await self._request_async(session, platform, detector.request_url(username)) as response:
+                        prefix = b""
+                        async for chunk in response.content.iter_chunked(BODY_CHUNK_SIZE):
+                            prefix += chunk
+                            if len(prefix) >= PREFIX_BYTES:
+                                break
+                        await _drain_async(response)
+                        calibrated = calibrator.record(platform, fingerprint(
+                            response.status, str(response.url), username, response.content_length, prefix
+                        ))
+                except Exception:
+                    return None
+        
+        return calibrated
+    
+    def check_platform(self, platform: str, username: str) -> Dict[str, Union[str, bool]]:
+        """Check if username exists on a specific platform
+        
+        Args:
+            platform: The platform to check (e.g., "Twitter")
+            username: The username to check
             
-            result["status_code"] = response.status_code
+        Returns:
+            Dict containing platform, URL, and existence status
+        """
+        result = self._new_result(platform, username)
+        if result["error"]:
+            return result
+        
+        # Platforms that keep failing are skipped until their cooldown ends
+        if not platform_health.allow(platform):
+            result["error"] = SKIPPED_UNHEALTHY
+            return result
+        
+        detector = self.registry.detector(platform)
+        
+        try:
+            calibrated = self._calibration_for(platform)
             
-            # Check if user exists based on status code and error messages
-            if response.status_code == 200:
-                error_found = False
-                for error_msg in self.platforms[platform]["error_msg"]:
-                    if error_msg.lower() in response.text.lower():
-                        error_found = True
-                        break
+            with self._request(platform, detector.request_url(username)) as response:
+                result["status_code"] = response.status_code
+                content_length = response.headers.get("Content-Length")
                 
-                result["exists"] = not error_found
-            else:
-                result["exists"] = False
+                # Only read as much of the body as the verdict needs; a small
+                # remainder is drained to keep the connection, a large one is closed
+                evaluator = _ProbeEvaluator(
+                    detector, username, response.status_code, response.url,
+                    int(content_length) if content_length else None, self.max_body_bytes, calibrated,
+                    response.encoding
+                )
+                if not evaluator.done:
+                    for chunk in response.iter_content(BODY_CHUNK_SIZE):
+                        if evaluator.feed(chunk):
+                            break
+                _drain(response)
+                
+                result["exists"] = evaluator.finish()
+                if evaluator.drifted:
+                    get_calibrator().invalidate(platform)
                 
         except Exception as e:
             result["error"] = str(e)
@@ -133,94 +370,200 @@ class UsernameChecker:
             
         return result
     
-    def check_email(self, email: str) -> Dict[str, Union[str, bool]]:
-        """Check if an email address is valid and potentially exists
+    async def check_platform_async(self, session, platform: str, username: str,
+                                   paced: bool = False) -> Dict[str, Union[str, bool]]:
+        """Async variant of check_platform running on an aiohttp session
         
         Args:
-            email: The email to verify
+            session: The aiohttp.ClientSession to send the request with
+            platform: The platform to check (e.g., "Twitter")
+            username: The username to check
+            paced: The caller already took the probe's rate-limit token
             
         Returns:
-            Dict containing verification results
+            Dict containing platform, URL, and existence status
         """
-        # Basic email format validation
-        if "@" not in email or "." not in email.split("@")[1]:
-            return {
-                "email": email,
-                "valid_format": False,
-                "deliverable": False,
-                "result": "Invalid email format"
-            }
+        result = self._new_result(platform, username)
+        if result["error"]:
+            return result
         
-        # Extract domain for MX record check
-        domain = email.split("@")[1]
+        # Platforms that keep failing are skipped until their cooldown ends
+        if not platform_health.allow(platform):
+            result["error"] = SKIPPED_UNHEALTHY
+            return result
         
-        result = {
-            "email": email,
-            "valid_format": True,
-            "domain": domain,
-            "deliverable": None,
-            "message": None,
-            "result": None
-        }
+        detector = self.registry.detector(platform)
         
         try:
-            # This is a basic implementation
-            # In a real app, you'd use a proper email verification service API
-            # or check MX records and perform SMTP validation
-            
-            import socket
-            from dns import resolver
-            
-            # Check if domain exists (DNS resolution)
-            try:
-                socket.gethostbyname(domain)
-                result["domain_exists"] = True
-            except socket.gaierror:
-                result["domain_exists"] = False
-                result["deliverable"] = False
-                result["result"] = "Domain does not exist"
-                return result
+            calibrated = await self._calibration_for_async(session, platform)
             
-            # Check for MX records
-            try:
-                mx_records = resolver.resolve(domain, 'MX')
-                if mx_records:
-                    result["has_mx_records"] = True
-                    result["deliverable"] = True
-                    result["result"] = "Email domain has valid MX records"
-                else:
-                    result["has_mx_records"] = False
-                    result["deliverable"] = False
-                    result["result"] = "Domain exists but has no mail exchanger"
-            except (resolver.NoAnswer, resolver.NXDOMAIN, resolver.NoNameservers):
-                result["has_mx_records"] = False
-                result["deliverable"] = False
-                result["result"] = "Domain exists but has no mail exchanger"
+            async with await self._request_async(session, platform, detector.request_url(username), paced) as response:
+                result["status_code"] = response.status
                 
+                # Only read as much of the body as the verdict needs; a small
+                # remainder is drained to keep the connection, a large one is closed
+                evaluator = _ProbeEvaluator(
+                    detector, username, response.status, str(response.url),
+                    response.content_length, self.max_body_bytes, calibrated, response.charset
+                )
+                if not evaluator.done:
+                    async for chunk in response.content.iter_chunked(BODY_CHUNK_SIZE):
+                        if evaluator.feed(chunk):
+                            break
+                await _drain_async(response)
+                
+                result["exists"] = evaluator.finish()
+                if evaluator.drifted:
+                    get_calibrator().invalidate(platform)
+                    
         except Exception as e:
-            result["error"] = str(e)
-            result["result"] = "Verification error"
+            result["error"] = str(e) or type(e).__name__
+            result["exists"] = False
             
         return result
+    
+    def check_email(self, email: str) -> Dict[str, Union[str, bool]]:
+        """Check if an email address is valid and potentially exists
+        
+        Args:
+            email: The email to verify
+            
+        Returns:
+            Dict containing verification results
+        """
+        # Domain lookups are shared with bulk validation and cached per DNS TTL
+        domain = email_domain(email)
+        if domain is None:
+            return email_result(email, None, None)
+        
+        return email_result(email, domain, lookup_mail_domain(domain))
 
-def check_username(query: str, query_type: str = "Username", platforms: Optional[List[str]] = None) -> List[Dict]:
-    """Check if a username or email exists across different platforms
+def _select_platforms(checker: UsernameChecker, platforms: Optional[List[str]],
+                      tags: Optional[List[str]] = None, categories: Optional[List[str]] = None) -> List[str]:
+    """Resolve the requested platform names, tags and categories against the registry"""
+    return checker.registry.select(platforms, tags=tags, categories=categories)
+
+class _ProbeLimits:
+    """Global and per-host concurrency limits shared by a batch of probes"""
+    
+    def __init__(self, max_concurrency: int, per_host_limit: int):
+        self.global_limit = asyncio.Semaphore(max(1, max_concurrency))
+        self.per_host_limit = max(1, per_host_limit)
+        self.host_limits: Dict[str, asyncio.Semaphore] = {}
+    
+    def host(self, host: str) -> asyncio.Semaphore:
+        if host not in self.host_limits:
+            self.host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return self.host_limits[host]
+
+class _ProbeCache:
+    """Result-cache access for a batch of probes, kept off the event loop
+    
+    Lookups run in a worker thread, and new results are buffered and
+    written in one transaction per CACHE_WRITE_BATCH results.
+    """
+    
+    def __init__(self, cache: ResultCache):
+        self.cache = cache
+        self.pending: List[Tuple[Dict, str]] = []
+    
+    async def get(self, platform: str, username: str) -> Optional[Dict]:
+        return await asyncio.to_thread(self.cache.get, platform, username)
+    
+    async def put(self, result: Dict, username: str) -> None:
+        self.pending.append((result, username))
+        if len(self.pending) >= CACHE_WRITE_BATCH:
+            await self.flush()
+    
+    async def flush(self) -> None:
+        """Write every buffered result"""
+        if self.pending:
+            pending, self.pending = self.pending, []
+            await asyncio.to_thread(self.cache.put_many, pending)
+
+async def _run_probe(checker: UsernameChecker, session, limits: _ProbeLimits,
+                     platform: str, username: str, cache: Optional[_ProbeCache] = None,
+                     force_refresh: bool = False) -> Dict:
+    """Run one platform probe under the batch limits and normalise its result
+    
+    When a cache is given, fresh cached results are returned without a
+    request (unless force_refresh is set) and new results are stored.
+    """
+    if cache is not None and not force_refresh:
+        cached = await cache.get(platform, username)
+        if cached is not None:
+            return {
+                "platform": cached["platform"],
+                "url": cached["url"],
+                "exists": cached["exists"],
+                "status_code": cached["status_code"],
+                "error": None,
+                "cached": True
+            }
+    
+    url = checker.platforms[platform]["url"].format(username=username)
+    host = urlsplit(url).hostname or platform
+    
+    # Wait out the host's rate limit before taking concurrency slots, so
+    # probes held back by a slow host don't sit on global capacity
+    detector = checker.registry.detector(platform)
+    if detector.accepts(username):
+        await platform_limiter.acquire_async(urlsplit(detector.request_url(username)).hostname or platform)
+    
+    async with limits.global_limit, limits.host(host):
+        try:
+            result = await checker.check_platform_async(session, platform, username, paced=True)
+        except Exception as exc:
+            result = {
+                "platform": platform,
+                "url": url,
+                "exists": False,
+                "status_code": None,
+                "error": str(exc)
+            }
+    
+    if cache is not None:
+        await cache.put(result, username)
+    
+    return {
+        "platform": result["platform"],
+        "url": result["url"],
+        "exists": result["exists"],
+        "status_code": result["status_code"],
+        "error": result["error"],
+        "cached": False
+    }
+
+async def check_username_async(query: str, query_type: str = "Username", platforms: Optional[List[str]] = None,
+                               tags: Optional[List[str]] = None, categories: Optional[List[str]] = None,
+                               max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                               per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+                               session=None, use_cache: bool = True,
+                               force_refresh: bool = False) -> List[Dict]:
+    """Check if a username or email exists across different platforms on one event loop
     
     Args:
         query: The username or email to check
         query_type: Type of query ("Username" or "Email")
         platforms: List of platforms to check, or None for all platforms
+        tags: Also check every platform carrying one of these tags
+        categories: Also check every platform in one of these categories
+        max_concurrency: Maximum number of probes in flight at once
+        per_host_limit: Maximum number of probes in flight per platform host
+        session: aiohttp.ClientSession to use, or None for the shared session
+        use_cache: Serve and store results through the on-disk result cache
+        force_refresh: Ignore cached results and probe every platform again
         
     Returns:
-        List of dictionaries with results
+        List of dictionaries with results; "cached" marks results served from cache
     """
     checker = UsernameChecker()
     results = []
     
     # For email checks
     if query_type.lower() == "email":
-        # Perform email validation
-        email_result = checker.check_email(query)
+        # Email validation does blocking DNS lookups, keep them off the loop
+        email_result = await asyncio.to_thread(checker.check_email, query)
         results.append({
             "platform": "Email Validation",
             "url": f"mailto:{query}",
@@ -232,43 +575,175 @@ def check_username(query: str, query_type: str = "Username", platforms: Optional
         # So we'll just return the email validation result
         return results
     
-    # For username checks
-    available_platforms = list(checker.platforms.keys())
+    if session is None:
+        session = await get_async_session()
     
-    # Filter platforms based on input
-    if platforms and len(platforms) > 0:
-        check_platforms = [p for p in platforms if p in available_platforms]
-    else:
-        check_platforms = available_platforms
+    limits = _ProbeLimits(max_concurrency, per_host_limit)
+    cache = _ProbeCache(get_result_cache()) if use_cache else None
+    try:
+        results = await asyncio.gather(*(
+            _run_probe(checker, session, limits, platform, query, cache, force_refresh)
+            for platform in _select_platforms(checker, platforms, tags, categories)
+        ))
+    finally:
+        if cache is not None:
+            await cache.flush()
     
-    # Use ThreadPoolExecutor for parallel checks
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        future_to_platform = {
-            executor.submit(checker.check_platform, platform, query): platform
-            for platform in check_platforms if checker.platforms[platform].get("username_only", False)
-        }
+    # Sort results by existence (True first)
+    return sorted(results, key=lambda x: (not x["exists"], x["platform"]))
+
+def check_username(query: str, query_type: str = "Username", platforms: Optional[List[str]] = None,
+                   use_cache: bool = True, force_refresh: bool = False,
+                   tags: Optional[List[str]] = None, categories: Optional[List[str]] = None) -> List[Dict]:
+    """Check if a username or email exists across different platforms
+    
+    Thin synchronous wrapper around check_username_async, run on the shared
+    background event loop so connections are reused between calls.
+    
+    Args:
+        query: The username or email to check
+        query_type: Type of query ("Username" or "Email")
+        platforms: List of platforms to check, or None for all platforms
+        use_cache: Serve and store results through the on-disk result cache
+        force_refresh: Ignore cached results and probe every platform again
+        tags: Also check every platform carrying one of these tags
+        categories: Also check every platform in one of these categories
+        
+    Returns:
+        List of dictionaries with results; "cached" marks results served from cache
+    """
+    return run_coroutine(check_username_async(
+        query, query_type, platforms, tags=tags, categories=categories,
+        use_cache=use_cache, force_refresh=force_refresh
+    ))
+
+def read_usernames(lines: Iterable[Union[str, bytes]]) -> Iterator[str]:
+    """Lazily read usernames from a text or CSV source, one per line
+    
+    Blank lines and lines starting with '#' are skipped, and only the first
+    comma-separated column of each line is used.
+    
+    Args:
+        lines: Iterable of lines (e.g. an open file or uploaded file object)
         
-        for future in as_completed(future_to_platform):
-            platform = future_to_platform[future]
-            try:
-                result = future.result()
-                results.append({
-                    "platform": result["platform"],
-                    "url": result["url"],
-                    "exists": result["exists"],
-                    "status_code": result["status_code"],
-                    "error": result["error"]
-                })
-            except Exception as exc:
-                results.append({
-                    "platform": platform,
-                    "url": checker.platforms[platform]["url"].format(username=query),
-                    "exists": False,
-                    "status_code": None,
-                    "error": str(exc)
-                })
+    Returns:
+        Iterator of stripped usernames
+    """
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        username = line.split(",", 1)[0].strip().strip('"').lstrip("@")
+        if username and not username.startswith("#"):
+            yield username
+
+def _interleave_jobs(usernames: Iterable[str], check_platforms: List[str],
+                     registry: Optional[PlatformRegistry] = None) -> Iterator[Tuple[str, str]]:
+    """Lazily yield (username, platform) pairs, rotating the platform order per username
     
-    # Sort results by existence (True first)
-    results = sorted(results, key=lambda x: (not x["exists"], x["platform"]))
+    Consecutive jobs hit different hosts, and no platform is always probed
+    first for every username. When a registry is given, pairs whose username
+    breaks the platform's username rules are dropped.
+    """
+    count = len(check_platforms)
+    for index, username in enumerate(usernames):
+        offset = index % count
+        for platform in check_platforms[offset:] + check_platforms[:offset]:
+            if registry is None or registry.detector(platform).accepts(username):
+                yield username, platform
+
+async def check_usernames_bulk_async(usernames: Iterable[str], platforms: Optional[List[str]] = None,
+                                     tags: Optional[List[str]] = None, categories: Optional[List[str]] = None,
+                                     max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                                     per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+                                     session=None, use_cache: bool = True,
+                                     force_refresh: bool = False,
+                                     skip_invalid: bool = False) -> AsyncIterator[Dict]:
+    """Check every username against every platform, yielding results as they finish
+    
+    Usernames are consumed lazily and only a bounded window of probes is
+    scheduled at a time, so memory stays flat regardless of input size.
+    
+    Args:
+        usernames: Iterable of usernames (e.g. read_usernames(open_file))
+        platforms: List of platforms to check, or None for all platforms
+        tags: Also check every platform carrying one of these tags
+        categories: Also check every platform in one of these categories
+        max_concurrency: Maximum number of probes in flight at once
+        per_host_limit: Maximum number of probes in flight per platform host
+        session: aiohttp.ClientSession to use, or None for the shared session
+        use_cache: Serve and store results through the on-disk result cache
+        force_refresh: Ignore cached results and probe every platform again
+        skip_invalid: Drop username/platform pairs that break the platform's username rules
+        
+    Returns:
+        Async iterator of result dictionaries including the username
+    """
+    checker = UsernameChecker()
+    check_platforms = _select_platforms(checker, platforms, tags, categories)
+    if not check_platforms:
+        return
+    
+    if session is None:
+        session = await get_async_session()
+    
+    limits = _ProbeLimits(max_concurrency, per_host_limit)
+    cache = _ProbeCache(get_result_cache()) if use_cache else None
+    window = max(1, max_concurrency) * BULK_WINDOW_FACTOR
+    jobs = _interleave_jobs(usernames, check_platforms, checker.registry if skip_invalid else None)
+    pending = {}
     
-    return results
+    async def probe(username: str, platform: str) -> Dict:
+        result = await _run_probe(checker, session, limits, platform, username, cache, force_refresh)
+        return {"username": username, **result}
+    
+    try:
+        while True:
+            # Top up the window from the lazy job stream
+            for username, platform in jobs:
+                task = asyncio.ensure_future(probe(username, platform))
+                pending[task] = None
+                if len(pending) >= window:
+                    break
+            
+            if not pending:
+                break
+            
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                del pending[task]
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if cache is not None:
+            await cache.flush()
+
+def check_usernames_bulk(usernames: Iterable[str], platforms: Optional[List[str]] = None,
+                         tags: Optional[List[str]] = None, categories: Optional[List[str]] = None,
+                         max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                         per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+                         use_cache: bool = True, force_refresh: bool = False,
+                         skip_invalid: bool = False) -> Iterator[Dict]:
+    """Synchronous generator over check_usernames_bulk_async
+    
+    Results are streamed as they complete, so they can be written straight
+    to CSV or JSONL (see export.stream_to_csv / export.stream_to_jsonl).
+    
+    Args:
+        usernames: Iterable of usernames
+        platforms: List of platforms to check, or None for all platforms
+        tags: Also check every platform carrying one of these tags
+        categories: Also check every platform in one of these categories
+        max_concurrency: Maximum number of probes in flight at once
+        per_host_limit: Maximum number of probes in flight per platform host
+        use_cache: Serve and store results through the on-disk result cache
+        force_refresh: Ignore cached results and probe every platform again
+        skip_invalid: Drop username/platform pairs that break the platform's username rules
+        
+    Returns:
+        Iterator of result dictionaries including the username
+    """
+    return iterate_async(check_usernames_bulk_async(
+        usernames, platforms, tags=tags, categories=categories, max_concurrency=max_concurrency, per_host_limit=per_host_limit,
+        use_cache=use_cache, force_refresh=force_refresh, skip_invalid=skip_invalid
+    ))
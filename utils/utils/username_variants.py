@@ -0,0 +1,149 @@
+import datetime
+import itertools
+import re
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .username_checker import check_usernames_bulk
+
+# Separators used to join name parts
+SEPARATORS = ["", ".", "_", "-"]
+
+# Single-character leetspeak substitutions
+LEET_MAP = {"a": "4", "e": "3", "i": "1", "o": "0", "s": "5", "t": "7"}
+
+# Suffixes people commonly append to taken handles, most common first
+COMMON_SUFFIXES = ["1", "123", "01", "2", "007", "69", "99", "12", "11", "13", "22", "88", "x", "_", "official", "real"]
+
+_SPLIT = re.compile(r"[\s._\-]+")
+_CAMEL = re.compile(r"(?<=[a-z])(?=[A-Z])")
+
+def split_name(seed: str) -> List[str]:
+    """
+    Split a handle or real name into lowercase parts.
+
+    Args:
+        seed: Handle ("john_doe", "JohnDoe") or real name ("John Doe")
+
+    Returns:
+        List of name parts, e.g. ["john", "doe"]
+    """
+    parts = []
+    for chunk in _SPLIT.split(seed.strip()):
+        parts.extend(p.lower() for p in _CAMEL.split(chunk) if p)
+    return parts
+
+def _joined(parts: List[str]) -> Iterator[str]:
+    """Parts joined with each separator, in both orders."""
+    orders = [parts] if len(parts) < 2 else [parts, parts[::-1]]
+    for order in orders:
+        for separator in SEPARATORS:
+            yield separator.join(order)
+
+def _initials(parts: List[str]) -> Iterator[str]:
+    """Combinations of initials and full first/last names."""
+    if len(parts) < 2:
+        return
+    first, last = parts[0], parts[-1]
+    for separator in SEPARATORS:
+        yield f"{first[0]}{separator}{last}"
+        yield f"{first}{separator}{last[0]}"
+        yield f"{last}{separator}{first[0]}"
+        yield f"{last[0]}{separator}{first}"
+    yield first
+    yield last
+    yield "".join(part[0] for part in parts)
+
+def _leet(base: str) -> Iterator[str]:
+    """Leetspeak forms of a base: each single substitution, then the full one."""
+    positions = [i for i, char in enumerate(base) if char in LEET_MAP]
+    for i in positions:
+        yield base[:i] + LEET_MAP[base[i]] + base[i + 1:]
+    if len(positions) > 1:
+        yield "".join(LEET_MAP.get(char, char) for char in base)
+
+def _suffixes(max_number: int, years: range) -> Iterator[str]:
+    yield from COMMON_SUFFIXES
+    for year in reversed(years):
+        yield str(year)
+        yield str(year)[2:]
+    for number in range(max_number + 1):
+        yield str(number)
+
+def generate_variants(seed: str, leetspeak: bool = True, numeric_suffixes: bool = True,
+                      max_number: int = 99, first_year: int = 1960) -> Iterator[str]:
+    """
+    Lazily generate ranked, deduplicated username candidates for a handle or name.
+
+    Candidates come out in rank order: the seed and its separator/order
+    variants, then initials, then leetspeak forms, then numeric suffixes
+    (common suffixes, birth years, 0..max_number) on every earlier base.
+
+    Args:
+        seed: Handle or real name to permute
+        leetspeak: Include leetspeak substitutions
+        numeric_suffixes: Include numeric and common suffixes
+        max_number: Largest plain number appended as a suffix
+        first_year: Earliest birth year appended as a suffix
+
+    Returns:
+        Iterator of unique, lowercase candidate usernames
+    """
+    parts = split_name(seed)
+    if not parts:
+        return
+
+    years = range(first_year, datetime.date.today().year + 1)
+    seen = set()
+
+    # A seed that is already a handle ranks first; a real name does not
+    handle = seed.strip().lower().lstrip("@")
+    leading = [] if re.search(r"\s", handle) else [handle]
+
+    def unique(candidates: Iterable[str]) -> Iterator[str]:
+        for candidate in candidates:
+            if candidate and candidate not in seen:
+                seen.add(candidate)
+                yield candidate
+
+    # Bases are small (a few dozen), so they are materialized for re-use
+    bases = list(unique(itertools.chain(leading, _joined(parts), _initials(parts))))
+    yield from bases
+
+    if leetspeak:
+        yield from unique(variant for base in bases for variant in _leet(base))
+
+    if numeric_suffixes:
+        # Suffix rank outranks base rank: every base gets "1" before any base gets "123"
+        yield from unique(
+            f"{base}{separator}{suffix}"
+            for suffix in _suffixes(max_number, years)
+            for base in bases
+            for separator in ("", "_")
+            if not (separator and suffix.startswith("_"))
+        )
+
+def check_username_variants(seed: str, platforms: Optional[List[str]] = None,
+                            tags: Optional[List[str]] = None, categories: Optional[List[str]] = None,
+                            limit: Optional[int] = 500, **options) -> Iterator[Dict]:
+    """
+    Generate variants of a handle or name and check them as one bulk batch.
+
+    Variants that break a platform's username rules are dropped before any
+    request is made; results stream back as they complete.
+
+    Args:
+        seed: Handle or real name to permute
+        platforms: List of platforms to check, or None for all platforms
+        tags: Also check every platform carrying one of these tags
+        categories: Also check every platform in one of these categories
+        limit: Maximum number of variants to check (None for no limit)
+        **options: Passed to generate_variants (leetspeak, numeric_suffixes, ...)
+
+    Returns:
+        Iterator of result dictionaries including the username variant
+    """
+    variants = generate_variants(seed, **options)
+    if limit is not None:
+        variants = itertools.islice(variants, limit)
+
+    return check_usernames_bulk(variants, platforms, tags=tags, categories=categories, skip_invalid=True)
@@ -0,0 +1,175 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+import dns.exception
+import dns.query
+import dns.rdatatype
+
+from .cache_dir import cache_path
+
+# Overall time allowed for getting a transfer going on any nameserver
+DEFAULT_DEADLINE = 8.0
+
+# Time a transfer that has started may take to stream the whole zone
+TRANSFER_LIFETIME = 120.0
+
+# Directory holding one SQLite store per transferred zone
+DEFAULT_ZONE_DIR = cache_path("zones")
+
+# Records buffered before each write to the store
+STORE_BATCH_SIZE = 1000
+
+class ZoneStore:
+    """Compact on-disk store for the records of one transferred zone"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("DROP TABLE IF EXISTS records")
+        self._conn.execute("""
+            CREATE TABLE records (
+                name TEXT NOT NULL,
+                type TEXT NOT NULL,
+                ttl INTEGER,
+                value TEXT NOT NULL
+            )
+        """)
+        self._pending: List[Tuple[str, str, int, str]] = []
+
+    def add(self, name: str, record_type: str, ttl: int, value: str) -> None:
+        """Buffer a record, writing the buffer out once it is full."""
+        self._pending.append((name, record_type, ttl, value))
+        self.count += 1
+        if len(self._pending) >= STORE_BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered records to disk."""
+        if self._pending:
+            with self._conn:
+                self._conn.executemany("INSERT INTO records VALUES (?, ?, ?, ?)", self._pending)
+            self._pending = []
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+def zone_store_path(domain: str, directory: str = DEFAULT_ZONE_DIR) -> str:
+    """Store file for a domain's zone."""
+    return os.path.join(directory, re.sub(r"[^a-z0-9.\-]", "_", domain.lower()) + ".sqlite")
+
+def read_zone_records(path: str, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream a stored zone's records back in transfer order.
+
+    Args:
+        path: ZoneStore file
+        limit: Maximum number of records, or None for all
+
+    Returns:
+        Iterator of {"name", "type", "ttl", "value"} dictionaries
+    """
+    query = "SELECT name, type, ttl, value FROM records ORDER BY rowid"
+    params: Tuple = ()
+    if limit is not None:
+        query += " LIMIT ?"
+        params = (limit,)
+
+    conn = sqlite3.connect(path)
+    try:
+        for name, record_type, ttl, value in conn.execute(query, params):
+            yield {"name": name, "type": record_type, "ttl": ttl, "value": value}
+    finally:
+        conn.close()
+
+def transfer_zone(domain: str, nameservers: List[Tuple[str, str]],
+                  deadline: float = DEFAULT_DEADLINE,
+                  directory: str = DEFAULT_ZONE_DIR) -> Optional[Dict[str, Any]]:
+    """
+    Attempt AXFR against every nameserver at once and keep the first that succeeds.
+
+    All attempts share one deadline: a nameserver that hasn't started
+    sending the zone by then is abandoned. The first transfer to start
+    wins, the others stop, and the winner streams its records straight
+    into a ZoneStore instead of building the zone in memory.
+
+    Args:
+        domain: Zone to transfer
+        nameservers: (nameserver name, IP address) pairs
+        deadline: Seconds allowed for any transfer to start
+        directory: Where zone stores are kept
+
+    Returns:
+        {"nameserver", "ip", "records", "store"} for the successful
+        transfer, or None if every nameserver refused or timed out
+    """
+    if not nameservers:
+        return None
+
+    started = time.monotonic()
+    lock = threading.Lock()
+    winner: Dict[str, Any] = {}
+
+    def attempt(nameserver: str, ip: str) -> bool:
+        remaining = max(0.1, deadline - (time.monotonic() - started))
+        store = None
+        soa_seen = False
+        try:
+            for message in dns.query.xfr(ip, domain, timeout=remaining, lifetime=TRANSFER_LIFETIME):
+                if store is None:
+                    # The first message claims the transfer; everyone else gives up
+                    with lock:
+                        if winner:
+                            return False
+                        winner.update(nameserver=nameserver, ip=ip)
+                    store = ZoneStore(zone_store_path(domain, directory))
+
+                for rrset in message.answer:
+                    record_type = dns.rdatatype.to_text(rrset.rdtype)
+                    if rrset.rdtype == dns.rdatatype.SOA:
+                        # The zone's SOA opens and closes the transfer; keep the first
+                        if soa_seen:
+                            continue
+                        soa_seen = True
+                    for rdata in rrset:
+                        store.add(str(rrset.name), record_type, rrset.ttl, str(rdata))
+            return store is not None
+        except (dns.exception.DNSException, OSError, EOFError):
+            # Refused, timed out, or cut off mid-transfer (a partial zone is kept)
+            return store is not None
+        finally:
+            if store is not None:
+                winner["records"] = store.count
+                winner["store"] = store.path
+                store.close()
+
+    executor = ThreadPoolExecutor(max_workers=len(nameservers))
+    try:
+        pending = {executor.submit(attempt, nameserver, ip) for nameserver, ip in nameservers}
+        while pending:
+            with lock:
+                won = bool(winner)
+            # Once a transfer is streaming it may run past the deadline
+            remaining = None if won else deadline - (time.monotonic() - started)
+            if remaining is not None and remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if any(future.result() for future in done):
+                break
+    finally:
+        # Losing attempts end on their own timeout; don't wait for them
+        executor.shutdown(wait=False)
+
+    return dict(winner) if "store" in winner else None